@@ -0,0 +1,6 @@
+"""Benchmarks for gRPCAlchemy.
+
+Run a benchmark from the root of the repository, e.g.::
+
+    $ python -m benchmarks.message_memory
+"""
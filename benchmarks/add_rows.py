@@ -0,0 +1,68 @@
+"""Time of building a large ``Repeated[Message]`` from database rows.
+
+Compares wrapping every row in a :class:`grpcalchemy.orm.Message` with
+:meth:`~grpcalchemy.orm.Message.add_rows` and
+:meth:`~grpcalchemy.orm.Message.add_columns`, which fill the gRPC messages
+directly::
+
+    $ python -m benchmarks.add_rows
+"""
+import timeit
+
+from grpcalchemy.orm import Int64Field, Message
+from grpcalchemy.types import Repeated
+from grpcalchemy.utils import generate_proto_file
+
+COUNT = 50_000
+NUMBER = 5
+
+
+class BenchmarkRow(Message):
+    __filename__ = "benchmark_rows"
+    title: str
+    score: int
+    views = Int64Field()
+
+
+class BenchmarkRowList(Message):
+    __filename__ = "benchmark_rows"
+    rows: Repeated[BenchmarkRow]
+
+
+def main():
+    generate_proto_file(template_path="benchmarks/protos")
+    rows = [(str(i), i, i * 10) for i in range(COUNT)]
+    columns = {
+        "title": [title for title, _, _ in rows],
+        "score": [score for _, score, _ in rows],
+        "views": [views for _, _, views in rows],
+    }
+
+    def wrappers():
+        return BenchmarkRowList(
+            rows=[
+                BenchmarkRow(title=title, score=score, views=views)
+                for title, score, views in rows
+            ]
+        )
+
+    def add_rows():
+        row_list = BenchmarkRowList()
+        row_list.add_rows("rows", rows)
+        return row_list
+
+    def add_columns():
+        row_list = BenchmarkRowList()
+        row_list.add_columns("rows", columns)
+        return row_list
+
+    assert wrappers().__message__ == add_rows().__message__
+    assert wrappers().__message__ == add_columns().__message__
+    print(f"building Repeated[BenchmarkRow] of {COUNT} rows")
+    for build in [wrappers, add_rows, add_columns]:
+        seconds = timeit.timeit(build, number=NUMBER)
+        print(f"{build.__name__ + ':':13} {seconds * 1000 / NUMBER:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
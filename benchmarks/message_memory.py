@@ -0,0 +1,62 @@
+"""Memory footprint of wrapping every element of a large ``Repeated[Message]``.
+
+Compares the slot-based layout of :class:`grpcalchemy.orm.Message` with the
+previous layout which stored ``__message__`` in a per-instance ``__dict__``::
+
+    $ python -m benchmarks.message_memory
+"""
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from grpcalchemy.orm import Message
+from grpcalchemy.types import Repeated
+from grpcalchemy.utils import generate_proto_file
+
+COUNT = 100_000
+
+
+class BenchmarkPost(Message):
+    __filename__ = "benchmark_memory"
+    title: str
+    score: int
+
+
+class BenchmarkPostList(Message):
+    __filename__ = "benchmark_memory"
+    posts: Repeated[BenchmarkPost]
+
+
+class DictLayoutPost:
+    """Wrapper with the layout of ``Message`` before ``__slots__`` were used."""
+
+    def __init__(self, grpc_message):
+        self.__message__ = grpc_message
+
+
+def measure(wrap: Callable, grpc_messages) -> int:
+    gc.collect()
+    tracemalloc.start()
+    wrapped: List = [wrap(m) for m in grpc_messages]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del wrapped
+    return size
+
+
+def main():
+    generate_proto_file(template_path="benchmarks/protos")
+    post_list = BenchmarkPostList(
+        posts=[BenchmarkPost(title=str(i), score=i) for i in range(COUNT)]
+    )
+    grpc_messages = list(post_list.__message__.posts)
+
+    dict_layout = measure(DictLayoutPost, grpc_messages)
+    slot_layout = measure(BenchmarkPost.from_grpc_message, grpc_messages)
+    print(f"wrapping {COUNT} messages of Repeated[BenchmarkPost]")
+    print(f"__dict__ layout: {dict_layout / COUNT:8.1f} bytes per wrapper")
+    print(f"__slots__ layout: {slot_layout / COUNT:7.1f} bytes per wrapper")
+
+
+if __name__ == "__main__":
+    main()
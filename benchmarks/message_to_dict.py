@@ -0,0 +1,83 @@
+"""Time of converting a message with nested and repeated fields to a dict.
+
+Compares :meth:`grpcalchemy.orm.Message.message_to_dict`, which uses a
+function generated for each message class, with ``json_format.MessageToDict``::
+
+    $ python -m benchmarks.message_to_dict
+"""
+import timeit
+
+from google.protobuf.json_format import MessageToDict
+
+from grpcalchemy.orm import Int64Field, Message
+from grpcalchemy.types import Map, Repeated
+from grpcalchemy.utils import generate_proto_file
+
+NUMBER = 1000
+
+
+class BenchmarkAuthor(Message):
+    __filename__ = "benchmark_to_dict"
+    name: str
+    karma = Int64Field()
+
+
+class BenchmarkComment(Message):
+    __filename__ = "benchmark_to_dict"
+    author: BenchmarkAuthor
+    content: str
+    score: float
+
+
+class BenchmarkPost(Message):
+    __filename__ = "benchmark_to_dict"
+    title: str
+    author: BenchmarkAuthor
+    tags: Repeated[str]
+    comments: Repeated[BenchmarkComment]
+    metadata: Map[str, str]
+    published: bool
+
+
+def main():
+    generate_proto_file(template_path="benchmarks/protos")
+    post = BenchmarkPost(
+        title="title",
+        author=BenchmarkAuthor(name="author", karma=2**40),
+        tags=["a", "b", "c"],
+        comments=[
+            BenchmarkComment(
+                author=BenchmarkAuthor(name=str(i)), content="content", score=i / 3
+            )
+            for i in range(20)
+        ],
+        metadata={"source": "benchmark"},
+    )
+    assert post.message_to_dict() == MessageToDict(
+        post.__message__,
+        including_default_value_fields=True,
+        preserving_proto_field_name=True,
+    )
+    print(f"converting a post with 20 comments to a dict, {NUMBER} times")
+    for including_default_value_fields in [True, False]:
+        json_format = timeit.timeit(
+            lambda: MessageToDict(
+                post.__message__,
+                including_default_value_fields=including_default_value_fields,
+                preserving_proto_field_name=True,
+            ),
+            number=NUMBER,
+        )
+        generated = timeit.timeit(
+            lambda: post.message_to_dict(
+                including_default_value_fields=including_default_value_fields
+            ),
+            number=NUMBER,
+        )
+        print(f"including_default_value_fields={including_default_value_fields}")
+        print(f"MessageToDict:   {json_format * 1000 / NUMBER:7.3f} ms")
+        print(f"message_to_dict: {generated * 1000 / NUMBER:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
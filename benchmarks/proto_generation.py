@@ -0,0 +1,95 @@
+"""Time of compiling the proto files of many synthetic messages.
+
+Half of the messages live in a shared proto file, every other message lives
+in its own proto file and references one of the shared messages, so the
+shared file is imported by all the other files. Compares compiling each file
+in its own protoc invocation, as ``generate_proto_file`` did before, with
+compiling all of them in a single invocation::
+
+    $ python -m benchmarks.proto_generation
+"""
+import time
+from os import walk
+from os.path import join
+from shutil import rmtree
+from typing import Callable, List
+
+import grpc_tools.protoc
+import pkg_resources
+
+from grpcalchemy.meta import __meta__
+from grpcalchemy.orm import Message
+from grpcalchemy.utils import generate_proto_file
+
+SIZES = (10, 100, 500)
+TEMPLATE_PATH = "benchmarks/protos"
+
+
+def declare_messages(count: int) -> None:
+    __meta__.clear()
+    shared = [
+        type(
+            f"Generation{count}Shared{i}",
+            (Message,),
+            {
+                "__filename__": f"generation_{count}_shared",
+                "__annotations__": {"value": str},
+            },
+        )
+        for i in range(count // 2)
+    ]
+    for i in range(count - len(shared)):
+        type(
+            f"Generation{count}Message{i}",
+            (Message,),
+            {
+                "__filename__": f"generation_{count}_{i}",
+                "__annotations__": {"value": str, "shared": shared[i]},
+            },
+        )
+
+
+def protoc(*proto_paths: str) -> None:
+    grpc_tools.protoc.main(
+        [
+            pkg_resources.resource_filename("grpc_tools", "protoc.py"),
+            "-I.",
+            "--python_out=.",
+            "--grpc_python_out=.",
+            *proto_paths,
+            "-I{}".format(pkg_resources.resource_filename("grpc_tools", "_proto")),
+        ]
+    )
+
+
+def list_proto_files(template_path: str) -> List[str]:
+    return [
+        join(template_path, file)
+        for _, _, files in walk(template_path)
+        for file in files
+        if file.endswith(".proto")
+    ]
+
+
+def measure(func: Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    rmtree(TEMPLATE_PATH, ignore_errors=True)
+    print(f"{'messages':>8} {'file by file':>14} {'single invocation':>19}")
+    for count in SIZES:
+        template_path = f"{TEMPLATE_PATH}/generation{count}"
+        declare_messages(count)
+        generate_proto_file(template_path=template_path)
+        proto_paths = list_proto_files(template_path)
+        file_by_file = measure(lambda: [protoc(p) for p in proto_paths])
+        single = measure(lambda: protoc(*proto_paths))
+        print(f"{count:>8} {file_by_file:>13.2f}s {single:>18.2f}s")
+    __meta__.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,16 @@ __author__ = """GuangTian Li"""
 __email__ = "guangtian_li@qq.com"
 __version__ = "0.7.3"
 
-__all__ = ["Blueprint", "Context", "grpcmethod", "DefaultConfig", "Server", "Streaming"]
+__all__ = [
+    "AsyncServer",
+    "Blueprint",
+    "Context",
+    "grpcmethod",
+    "DefaultConfig",
+    "Server",
+    "Streaming",
+]
 
 from .blueprint import Blueprint, Context, grpcmethod, Streaming
 from .config import DefaultConfig
-from .server import Server
+from .server import AsyncServer, Server
@@ -0,0 +1,223 @@
+import asyncio
+from threading import TIMEOUT_MAX, Condition
+from typing import Any, Awaitable, Callable, List, Optional, Set
+
+from grpc import StatusCode
+
+BatchHandlerType = Callable[[List[Any], List[Any]], List[Any]]
+AsyncBatchHandlerType = Callable[[List[Any], List[Any]], Awaitable[List[Any]]]
+
+
+class _Slot:
+    __slots__ = ("request", "context", "response", "done", "abandoned", "future")
+
+    def __init__(self, request: Any, context: Any, future: Any = None):
+        self.request = request
+        self.context = context
+        self.response: Any = None
+        self.done = False
+        #: the call stopped waiting for the batch, on its deadline or
+        #: cancellation.
+        self.abandoned = False
+        self.future = future
+
+    def expired(self) -> bool:
+        if self.abandoned:
+            return True
+        time_remaining = self.context.time_remaining()
+        return time_remaining is not None and time_remaining <= 0
+
+    def result(self) -> Any:
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class _Batch:
+    __slots__ = ("slots", "full")
+
+    def __init__(self, full: Optional[asyncio.Event] = None):
+        self.slots: List[_Slot] = []
+        #: set once the batch is full, only in :class:`AsyncServer`.
+        self.full = full
+
+
+class Batcher:
+    """Group the concurrent calls of a batch gRPC method, and call it once with
+    the list of their requests.
+
+    A batch is sent to the gRPC method once it has ``max_batch_size`` requests
+    or ``max_wait_us`` microseconds after its first request arrived. The
+    requests whose deadline passed or which were cancelled while waiting are
+    left out of the batch.
+
+    The gRPC method takes the list of the requests and the list of their
+    contexts, and returns the list of the responses in the same order. An
+    exception in place of a response is raised in the call of its request, so
+    that it goes through :meth:`Server.handle_exception`::
+
+        class EmbeddingService(Blueprint):
+            @grpcmethod(batch=Batcher(max_batch_size=64, max_wait_us=2000))
+            def Embed(
+                self, requests: List[EmbedRequest], contexts: List[Context]
+            ) -> List[Embedding]:
+                ...
+
+    In :class:`Server`, the calls wait for their batch in the threads of the
+    server, so ``max_batch_size`` should not exceed the number of workers.
+    Each gRPC method should have its own batcher.
+
+    :param max_batch_size: max number of requests in a batch.
+    :param max_wait_us: max microseconds the first request of a batch waits
+        for the others.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_us: int = 1000):
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+        #: number of batches sent to the gRPC method.
+        self.batches = 0
+        #: number of requests in the batches.
+        self.batched = 0
+        #: number of requests left out of the batches for their deadline or
+        #: cancellation.
+        self.expired = 0
+        self._batch: Optional[_Batch] = None
+        self._condition = Condition()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def max_wait(self) -> float:
+        return self.max_wait_us / 1_000_000
+
+    def _join(self, slot: _Slot, batch: _Batch) -> bool:
+        """Add ``slot`` to ``batch``, return whether it became full."""
+        batch.slots.append(slot)
+        if len(batch.slots) >= self.max_batch_size:
+            self._batch = None
+            return True
+        return False
+
+    def _take(self, batch: _Batch) -> List[_Slot]:
+        """Close ``batch`` and return the slots still waiting for it."""
+        if self._batch is batch:
+            self._batch = None
+        slots = [slot for slot in batch.slots if not slot.expired()]
+        self.expired += len(batch.slots) - len(slots)
+        if slots:
+            self.batches += 1
+            self.batched += len(slots)
+        return slots
+
+    @staticmethod
+    def _deliver(slots: List[_Slot], responses: Any) -> None:
+        if not isinstance(responses, Exception) and len(responses) != len(slots):
+            responses = ValueError(
+                f"{len(responses)} responses are returned for {len(slots)} requests."
+            )
+        if isinstance(responses, Exception):
+            responses = [responses] * len(slots)
+        for slot, response in zip(slots, responses):
+            slot.response = response
+            slot.done = True
+            if slot.future is not None and not slot.future.done():
+                slot.future.set_result(None)
+
+    def submit(self, request: Any, context: Any, handler: BatchHandlerType) -> Any:
+        """Add ``request`` to the open batch and wait for its response, the
+        first call of a batch sends it to ``handler`` in its own thread.
+        """
+        slot = _Slot(request, context)
+        condition = self._condition
+        slots: List[_Slot] = []
+        with condition:
+            batch = self._batch
+            if batch is not None:
+                if self._join(slot, batch):
+                    condition.notify_all()
+            else:
+                batch = self._batch = _Batch()
+                self._join(slot, batch)
+                condition.wait_for(lambda: self._batch is not batch, self.max_wait)
+                slots = self._take(batch)
+
+        if slots:
+            responses: Any
+            try:
+                responses = handler(
+                    [slot.request for slot in slots], [slot.context for slot in slots]
+                )
+            except Exception as e:
+                responses = e
+            with condition:
+                self._deliver(slots, responses)
+                condition.notify_all()
+        if slot.done:
+            return slot.result()
+
+        def wake() -> None:
+            with condition:
+                condition.notify_all()
+
+        context.add_callback(wake)
+        time_remaining = context.time_remaining()
+        with condition:
+            condition.wait_for(
+                lambda: slot.done or not context.is_active(),
+                time_remaining if time_remaining < TIMEOUT_MAX else None,
+            )
+            if not slot.done:
+                slot.abandoned = True
+        if slot.done:
+            return slot.result()
+        if context.is_active():
+            context.abort(StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+        # cancelled, nobody waits for the response
+        return None
+
+    async def async_submit(
+        self, request: Any, context: Any, handler: AsyncBatchHandlerType
+    ) -> Any:
+        """Add ``request`` to the open batch and wait for its response, the
+        batch is sent to ``handler`` in its own task.
+        """
+        loop = asyncio.get_running_loop()
+        slot = _Slot(request, context, loop.create_future())
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = _Batch(asyncio.Event())
+            task = loop.create_task(self._flush(batch, handler))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if self._join(slot, batch):
+            batch.full.set()  # type: ignore
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(slot.future), context.time_remaining()
+            )
+        except asyncio.TimeoutError:
+            slot.abandoned = True
+            await context.abort(StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+        except asyncio.CancelledError:
+            slot.abandoned = True
+            raise
+        return slot.result()
+
+    async def _flush(self, batch: _Batch, handler: AsyncBatchHandlerType) -> None:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.max_wait)  # type: ignore
+        except asyncio.TimeoutError:
+            pass
+        slots = self._take(batch)
+        if not slots:
+            return
+        responses: Any
+        try:
+            responses = await handler(
+                [slot.request for slot in slots], [slot.context for slot in slots]
+            )
+        except Exception as e:
+            responses = e
+        self._deliver(slots, responses)
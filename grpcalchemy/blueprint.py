@@ -1,26 +1,47 @@
+import asyncio
 from abc import ABC, abstractmethod
-from functools import wraps
-from inspect import signature
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from inspect import isasyncgenfunction, isawaitable, iscoroutinefunction, signature
 from operator import attrgetter
+from threading import TIMEOUT_MAX, Condition
+from time import perf_counter
 from typing import (
+    AsyncIterator,
     Callable,
+    Dict,
     List,
     Type,
     TYPE_CHECKING,
     TypeVar,
     cast,
+    overload,
     Iterable,
     Any,
     Iterator,
+    Optional,
+    Tuple,
     Union,
 )
 
 from google.protobuf.message import Message as GeneratedProtocolMessageType
-from grpc import ServicerContext
+from grpc import ServicerContext, StatusCode
 from grpc._server import _Context as Context
 
+from .batch import Batcher
+from .cache import ResponseCache, SingleFlight, serialize_or_pass
+from .executor import BoundedThreadPoolExecutor, LimitedExecutor
+from .limiter import (
+    DEADLINE_SHED_DETAILS,
+    LIMIT_EXCEEDED_DETAILS,
+    AdaptiveLimiter,
+    DeadlineShedder,
+    is_overload,
+)
 from .meta import ServiceMeta, __meta__
+from .metrics import MethodMetrics, status_code_name, to_status_code
 from .orm import Message
+from .stream import Prefetcher
 from .types import Streaming
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -32,8 +53,383 @@ class _Context(ServicerContext):
     ...
 
 
+HandlerType = Callable[[Any, Context], Any]
+_HookT = TypeVar("_HookT", bound=Callable)
+
+_get_message = attrgetter("__message__")
+
+
+def _identity(message: Any) -> Any:
+    return message
+
+
+def _raw_response(response: Any) -> Any:
+    if response.__class__ is bytes:
+        return response
+    if isinstance(response, Message):
+        return response.__message__
+    # bytearray or memoryview
+    return bytes(response)
+
+
+def default_hook(funcobj: _HookT) -> _HookT:
+    """Mark the no-op implementation of a hook, which is skipped by the handlers
+    built by :meth:`AbstractRpcMethod.build_handler` unless it is overridden.
+
+    .. versionadded:: 0.8.0
+    """
+    funcobj.__default_hook__ = True  # type: ignore
+    return funcobj
+
+
+def is_default_hook(hook: Callable) -> bool:
+    return getattr(hook, "__default_hook__", False)
+
+
+def _uses_default_app_context(app: "Server") -> bool:
+    return is_default_hook(app.app_context) and all(
+        is_default_hook(getattr(app, name))
+        for name in ("__enter__", "__exit__", "__aenter__", "__aexit__")
+        if hasattr(app, name)
+    )
+
+
+def _request_hooks(bp: "Blueprint") -> List[Callable]:
+    return [
+        hook
+        for hook in (bp.current_app.process_request, bp.before_request)
+        if not is_default_hook(hook)
+    ]
+
+
+def _response_hooks(bp: "Blueprint") -> List[Callable]:
+    return [
+        hook
+        for hook in (bp.after_request, bp.current_app.process_response)
+        if not is_default_hook(hook)
+    ]
+
+
+def _unary_response_with_exception_handler(
+    handler: HandlerType, bp: "Blueprint"
+) -> HandlerType:
+    handle_exception = bp.current_app.handle_exception
+
+    def handle_call(message: Any, context: Context) -> Any:
+        try:
+            return handler(message, context)
+        except Exception as e:
+            response: Message = handle_exception(e, context)
+            if response:
+                return response.__message__
+
+    return handle_call
+
+
+def _unary_response_with_app_context(
+    handler: HandlerType, bp: "Blueprint", funcobj: Callable
+) -> HandlerType:
+    app_context = bp.current_app.app_context
+
+    def handle_call(message: Any, context: Context) -> Any:
+        # TODO: using cygrpc.install_context_from_request_call_event to prepare context
+        with app_context(bp, funcobj, context):
+            return handler(message, context)
+
+    return handle_call
+
+
+def _stream_response_with_exception_handler(
+    handler: HandlerType, bp: "Blueprint"
+) -> HandlerType:
+    handle_exception = bp.current_app.handle_exception
+
+    def handle_call(message: Any, context: Context) -> Any:
+        try:
+            yield from handler(message, context)
+        except Exception as e:
+            yield from map(_get_message, handle_exception(e, context))
+
+    return handle_call
+
+
+def _stream_response_with_app_context(
+    handler: HandlerType, bp: "Blueprint", funcobj: Callable
+) -> HandlerType:
+    app_context = bp.current_app.app_context
+
+    def handle_call(message: Any, context: Context) -> Any:
+        # TODO: using cygrpc.install_context_from_request_call_event to prepare context
+        with app_context(bp, funcobj, context):
+            yield from handler(message, context)
+
+    return handle_call
+
+
+def _stream_response_with_prefetch(
+    handler: HandlerType, prefetcher: Prefetcher
+) -> HandlerType:
+    iterate = prefetcher.iterate
+
+    def handle_call(message: Any, context: Context) -> Any:
+        return iterate(handler(message, context))
+
+    return handle_call
+
+
+class _CountingIterator:
+    __slots__ = ("iterator", "count")
+
+    def __init__(self, iterator: Any):
+        self.iterator = iterator
+        self.count = 0
+
+    def __iter__(self) -> "_CountingIterator":
+        return self
+
+    def __next__(self) -> Any:
+        message = next(self.iterator)
+        self.count += 1
+        return message
+
+    def __aiter__(self) -> "_CountingIterator":
+        return self
+
+    async def __anext__(self) -> Any:
+        message = await self.iterator.__anext__()
+        self.count += 1
+        return message
+
+
+def _observe(
+    metrics: MethodMetrics,
+    context: Context,
+    code: str,
+    start: float,
+    message: Any,
+    messages_sent: int,
+) -> None:
+    context_code = context.code()
+    if context_code is not None:
+        code = status_code_name(context_code)
+    metrics.observe(
+        code,
+        perf_counter() - start,
+        message.count if isinstance(message, _CountingIterator) else 1,
+        messages_sent,
+    )
+
+
+def _unary_response_with_metrics(
+    handler: HandlerType, metrics: MethodMetrics, request_streaming: bool
+) -> HandlerType:
+    def handle_call(message: Any, context: Context) -> Any:
+        metrics.start()
+        if request_streaming:
+            message = _CountingIterator(message)
+        start = perf_counter()
+        code = "UNKNOWN"
+        try:
+            response = handler(message, context)
+            code = "OK"
+            return response
+        finally:
+            _observe(metrics, context, code, start, message, 1 if code == "OK" else 0)
+
+    return handle_call
+
+
+def _stream_response_with_metrics(
+    handler: HandlerType, metrics: MethodMetrics, request_streaming: bool
+) -> HandlerType:
+    def handle_call(message: Any, context: Context) -> Any:
+        metrics.start()
+        if request_streaming:
+            message = _CountingIterator(message)
+        start = perf_counter()
+        code = "UNKNOWN"
+        messages_sent = 0
+        try:
+            for response in handler(message, context):
+                messages_sent += 1
+                yield response
+            code = "OK"
+        except GeneratorExit:
+            code = "CANCELLED"
+            raise
+        finally:
+            _observe(metrics, context, code, start, message, messages_sent)
+
+    return handle_call
+
+
+def _is_overloaded(context: Context) -> bool:
+    return is_overload(context.code())
+
+
+def _unary_response_with_limiter(
+    handler: HandlerType, limiter: AdaptiveLimiter
+) -> HandlerType:
+    def handle_call(message: Any, context: Context) -> Any:
+        if not limiter.acquire():
+            context.set_trailing_metadata(limiter.pushback_metadata())
+            context.abort(StatusCode.RESOURCE_EXHAUSTED, LIMIT_EXCEEDED_DETAILS)
+        start = perf_counter()
+        dropped = False
+        try:
+            return handler(message, context)
+        except Exception:
+            dropped = _is_overloaded(context)
+            raise
+        finally:
+            limiter.release(perf_counter() - start, dropped)
+
+    return handle_call
+
+
+def _unary_response_with_shedder(
+    handler: HandlerType, shedder: DeadlineShedder
+) -> HandlerType:
+    def handle_call(message: Any, context: Context) -> Any:
+        if shedder.should_shed(context.time_remaining()):
+            context.abort(StatusCode.DEADLINE_EXCEEDED, DEADLINE_SHED_DETAILS)
+        start = perf_counter()
+        try:
+            return handler(message, context)
+        finally:
+            shedder.observe(perf_counter() - start)
+
+    return handle_call
+
+
+def _succeeded(context: Context) -> bool:
+    code = context.code()
+    return code is None or status_code_name(code) == "OK"
+
+
+def _serialize(response: Any) -> Any:
+    if response is None or response.__class__ is bytes:
+        return response
+    return response.SerializeToString()
+
+
+def _failure(context: Context, exception: Exception) -> Tuple[None, Any, Any]:
+    code = context.code()
+    if code is None or status_code_name(code) == "OK":
+        return None, StatusCode.UNKNOWN, f"Exception calling application: {exception}"
+    return None, code, context.details()
+
+
+class _Flight:
+    __slots__ = ("condition", "result")
+
+    def __init__(self) -> None:
+        self.condition = Condition()
+        self.result: Optional[Tuple[Any, Any, Any]] = None
+
+
+def _unary_response_with_single_flight(
+    handler: HandlerType, single_flight: SingleFlight
+) -> HandlerType:
+    with_metadata = bool(single_flight.key_metadata)
+
+    def handle_call(message: Any, context: Context) -> Any:
+        key = single_flight.make_key(
+            message, context.invocation_metadata() if with_metadata else None
+        )
+        flight, leader = single_flight.join(key, _Flight)
+        if leader:
+            result: Tuple[Any, Any, Any] = (None, StatusCode.UNKNOWN, "")
+            try:
+                response = _serialize(handler(message, context))
+                result = (response, context.code(), context.details())
+                return response
+            except Exception as e:
+                result = _failure(context, e)
+                raise
+            finally:
+                single_flight.leave(key)
+                with flight.condition:
+                    flight.result = result
+                    flight.condition.notify_all()
+
+        def wake() -> None:
+            with flight.condition:
+                flight.condition.notify_all()
+
+        context.add_callback(wake)
+        timeout = context.time_remaining()
+        with flight.condition:
+            flight.condition.wait_for(
+                lambda: flight.result is not None or not context.is_active(),
+                timeout if timeout < TIMEOUT_MAX else None,
+            )
+        if flight.result is None:
+            if context.is_active():
+                context.abort(StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+            # cancelled, nobody waits for the response
+            return None
+        response, code, details = flight.result
+        if code is not None and status_code_name(code) != "OK":
+            context.abort(to_status_code(code), details)
+        return response
+
+    return handle_call
+
+
+def _unary_response_with_cache(
+    handler: HandlerType, cache: ResponseCache
+) -> HandlerType:
+    with_metadata = bool(cache.key_metadata)
+
+    def handle_call(message: Any, context: Context) -> Any:
+        key = cache.make_key(
+            message, context.invocation_metadata() if with_metadata else None
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = _serialize(handler(message, context))
+        if response is not None and _succeeded(context):
+            cache.put(key, response)
+        return response
+
+    return handle_call
+
+
 class AbstractRpcMethod(ABC):
-    __slots__ = ("name", "request_cls", "response_cls", "funcobj")
+    __slots__ = (
+        "name",
+        "request_cls",
+        "response_cls",
+        "funcobj",
+        "max_workers",
+        "max_queue_size",
+        "cache",
+        "single_flight",
+        "batch",
+        "raw",
+        "lazy",
+        "prefetch",
+    )
+
+    request_streaming = False
+    response_streaming = False
+
+    with_exception_handler = staticmethod(_unary_response_with_exception_handler)
+    with_app_context = staticmethod(_unary_response_with_app_context)
+    with_metrics = staticmethod(_unary_response_with_metrics)
+    #: the adaptive limiter is only applied to unary gRPC methods, whose
+    #: latency reflects the load of the server.
+    with_limiter: Optional[Callable[[HandlerType, AdaptiveLimiter], HandlerType]] = None
+    with_shedder: Optional[Callable[[HandlerType, DeadlineShedder], HandlerType]] = None
+    #: the response cache is only applied to unary gRPC methods.
+    with_cache: Optional[Callable[[HandlerType, ResponseCache], HandlerType]] = None
+    with_single_flight: Optional[
+        Callable[[HandlerType, SingleFlight], HandlerType]
+    ] = None
+    #: the prefetcher is only applied to response-streaming gRPC methods.
+    with_prefetch: Optional[Callable[[HandlerType, Prefetcher], HandlerType]] = None
 
     def __init__(
         self,
@@ -42,35 +438,231 @@ class AbstractRpcMethod(ABC):
         funcobj: Callable,
         request_cls: Type[Message],
         response_cls: Type[Message],
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        batch: Optional[Batcher] = None,
+        raw: bool = False,
+        lazy: bool = False,
+        prefetch: Optional[Prefetcher] = None,
     ):
+        if raw and lazy:
+            raise InvalidRPCMethod(
+                f"{name}: the requests of a gRPC method in raw mode are never parsed."
+            )
+        if cache is not None and self.with_cache is None:
+            raise InvalidRPCMethod(
+                f"{name}: the response cache only supports unary gRPC methods."
+            )
+        if single_flight is not None and self.with_single_flight is None:
+            raise InvalidRPCMethod(
+                f"{name}: the single flight only supports unary gRPC methods."
+            )
+        if prefetch is not None and self.with_prefetch is None:
+            raise InvalidRPCMethod(
+                f"{name}: the prefetcher only supports response-streaming gRPC methods."
+            )
         self.name = name
         self.funcobj = funcobj
         self.request_cls = request_cls
         self.response_cls = response_cls
+        #: size of the thread pool dedicated to this gRPC method.
+        self.max_workers = max_workers
+        #: max number of RPCs of this gRPC method waiting for a thread.
+        self.max_queue_size = max_queue_size
+        #: the cache of the serialized responses.
+        self.cache = cache
+        #: coalesce the concurrent calls with identical requests.
+        self.single_flight = single_flight
+        #: group the concurrent calls into batches of a batch gRPC method.
+        self.batch = batch
+        #: the gRPC method handles the serialized requests and responses.
+        self.raw = raw
+        #: the requests are only parsed once the gRPC method reads them.
+        self.lazy = lazy
+        #: produce the streaming responses ahead of sending them.
+        self.prefetch = prefetch
 
     @abstractmethod
     def to_rpc_method(self) -> str:  # pragma: no cover
         pass
 
     @abstractmethod
-    def handle_call(
-        self, bp: "Blueprint", message: Any, context: Context
-    ) -> Any:  # pragma: no cover
+    def build_call(self, bp: "Blueprint") -> HandlerType:  # pragma: no cover
+        """Build the call of the gRPC method, which is bound with the overridden
+        middleware hooks of ``bp``.
+        """
         pass
 
+    def limited_on_submit(self, bp: "Blueprint") -> bool:
+        """Whether the adaptive limit of this gRPC method is taken once its RPCs
+        are submitted to the thread pool, before they wait for a thread, rather
+        than in the handler. Only the synchronous gRPC methods of a server with
+        :attr:`Server.dedicated_thread_pools` are submitted by gRPCAlchemy.
+
+        .. versionadded:: 0.8.0
+        """
+        return (
+            self.with_limiter is not None
+            and bp.current_app.config.GRPC_SERVER_ADAPTIVE_LIMIT_ENABLE
+            and bp.current_app.dedicated_thread_pools
+            and not isinstance(self, AsyncRpcMethodMixin)
+        )
+
+    def build_handler(self, bp: "Blueprint") -> HandlerType:
+        """Build the handler of this gRPC method specialized for ``bp``.
+
+        Middleware hooks, app context and exception handler are resolved once
+        here, and the ones which are not overridden are skipped. If the adaptive
+        limit is enabled, the RPCs exceeding it are rejected before all of them.
+        If deadline shedding is enabled, the RPCs which would not complete
+        before their deadline are shed even before the limit. The concurrent
+        calls with identical requests wait for the single flight of the first
+        one after them, and the cached responses are returned before all of them.
+        The streaming responses are prefetched with all the layers above.
+        If the metrics of the application are enabled, the handler is measured
+        as a whole.
+
+        :raise InvalidRPCMethod: if the cache or the single flight is bound to
+            another gRPC method.
+
+        .. versionadded:: 0.8.0
+        """
+        method = f"/{bp.access_service_name()}/{self.name}"
+        for feature, keyed in (
+            ("response cache", self.cache),
+            ("single flight", self.single_flight),
+        ):
+            if keyed is None:
+                continue
+            # the keys only consist of the requests and the metadata
+            if keyed.method not in (None, method):
+                raise InvalidRPCMethod(
+                    f"{method}: the {feature} is already used by "
+                    f"{keyed.method}, each gRPC method needs its own one."
+                )
+            keyed.method = method
+        handler = self.build_call(bp)
+        if not is_default_hook(bp.current_app.handle_exception):
+            handler = self.with_exception_handler(handler, bp)
+        if not _uses_default_app_context(bp.current_app):
+            handler = self.with_app_context(handler, bp, self.funcobj)
+        if (
+            self.with_limiter is not None
+            and bp.current_app.config.GRPC_SERVER_ADAPTIVE_LIMIT_ENABLE
+            and not self.limited_on_submit(bp)
+        ):
+            handler = self.with_limiter(
+                handler,
+                bp.current_app.get_limiter(bp.access_service_name(), self.name),
+            )
+        if (
+            self.with_shedder is not None
+            and bp.current_app.config.GRPC_SERVER_DEADLINE_SHEDDING_ENABLE
+        ):
+            handler = self.with_shedder(
+                handler,
+                bp.current_app.get_shedder(bp.access_service_name(), self.name),
+            )
+        if self.single_flight is not None:
+            handler = self.with_single_flight(  # type: ignore
+                handler, self.single_flight
+            )
+        if self.cache is not None:
+            handler = self.with_cache(handler, self.cache)  # type: ignore
+        if self.prefetch is not None:
+            handler = self.with_prefetch(handler, self.prefetch)  # type: ignore
+        registry = getattr(bp.current_app, "metrics", None)
+        if registry is not None:
+            handler = self.with_metrics(
+                handler,
+                registry.register(
+                    bp.access_service_name(),
+                    self.name,
+                    self.request_streaming,
+                    self.response_streaming,
+                ),
+                self.request_streaming,
+            )
+            if self.cache is not None:
+                registry.register_cache(bp.access_service_name(), self.name, self.cache)
+            if self.single_flight is not None:
+                registry.register_single_flight(
+                    bp.access_service_name(), self.name, self.single_flight
+                )
+            if self.prefetch is not None:
+                registry.register_prefetcher(
+                    bp.access_service_name(), self.name, self.prefetch
+                )
+            if self.batch is not None:
+                registry.register_batcher(
+                    bp.access_service_name(), self.name, self.batch
+                )
+        return handler
+
+    def request_deserializer(self) -> Optional[Callable[[bytes], Any]]:
+        """Deserializer of the requests of this gRPC method, ``None`` if it
+        handles the serialized requests or parses them lazily.
+
+        .. versionadded:: 0.8.0
+        """
+        if self.raw or self.lazy:
+            return None
+        return self.request_cls.gRPCMessageClass.FromString
+
+    def response_serializer(self) -> Callable[[Any], bytes]:
+        """Serializer of the responses of this gRPC method, which passes the
+        responses already serialized by the cache, the single flight or the
+        gRPC method in raw mode through.
+
+        .. versionadded:: 0.8.0
+        """
+        serialize = self.response_cls.gRPCMessageClass.SerializeToString
+        if self.cache is None and self.single_flight is None and not self.raw:
+            return serialize
+        return partial(serialize_or_pass, serialize)
+
+    def wrap_request(self) -> Callable[[Any], Any]:
+        """Wrap the deserialized requests into :attr:`request_cls`, or pass
+        the serialized requests through in raw mode, or wrap them to be parsed
+        on demand in lazy mode.
+
+        .. versionadded:: 0.8.0
+        """
+        if self.raw:
+            return _identity
+        if self.lazy:
+            return self.request_cls.from_lazy_bytes
+        return self.request_cls.from_grpc_message
+
+    def unwrap_response(self) -> Callable[[Any], Any]:
+        """Unwrap the gRPC messages of the responses, or take the serialized
+        responses as ``bytes`` in raw mode.
+
+        .. versionadded:: 0.8.0
+        """
+        if self.raw:
+            return _raw_response
+        return _get_message
+
+    def handle_call(self, bp: "Blueprint", message: Any, context: Context) -> Any:
+        return self.build_handler(bp)(message, context)
+
     def request_iterator(
         self, message: Iterable[GeneratedProtocolMessageType]
     ) -> Iterator[Message]:
-        for m in message:
-            current_request = self.request_cls()
-            current_request.init_grpc_message(grpc_message=m)
-            yield current_request
+        return map(self.wrap_request(), message)
 
 
 gRPCMethodsType = List[AbstractRpcMethod]
 
 
 class UnaryUnaryRpcMethod(AbstractRpcMethod):
+    with_limiter = staticmethod(_unary_response_with_limiter)
+    with_shedder = staticmethod(_unary_response_with_shedder)
+    with_cache = staticmethod(_unary_response_with_cache)
+    with_single_flight = staticmethod(_unary_response_with_single_flight)
 
     if TYPE_CHECKING:  # pragma: no cover
 
@@ -81,29 +673,81 @@ class UnaryUnaryRpcMethod(AbstractRpcMethod):
     def to_rpc_method(self) -> str:
         return f"rpc {self.name} ({self.request_cls.__name__}) returns ({self.response_cls.__name__}) {{}}"
 
-    def handle_call(
-        self, bp: "Blueprint", message: GeneratedProtocolMessageType, context: Context
-    ) -> GeneratedProtocolMessageType:
-        current_request = self.request_cls()
-        current_request.init_grpc_message(grpc_message=message)
-        with bp.current_app.app_context(bp, self.funcobj, context):
-            # TODO: using cygrpc.install_context_from_request_call_event to prepare context
-            try:
-                current_request = bp.current_app.process_request(
-                    current_request, context
-                )
-                current_request = bp.before_request(current_request, context)
-                response = self.funcobj(bp, current_request, context)
-                bp_response = bp.after_request(response, context)
-                app_response = bp.current_app.process_response(bp_response, context)
-                return app_response.__message__
-            except Exception as e:
-                response = bp.current_app.handle_exception(e, context)
-                if response:
-                    return response.__message__
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        from_grpc_message = self.wrap_request()
+        request_hooks = _request_hooks(bp)
+        response_hooks = _response_hooks(bp)
+
+        def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> GeneratedProtocolMessageType:
+            current_request = from_grpc_message(message)
+            for hook in request_hooks:
+                current_request = hook(current_request, context)
+            response = funcobj(bp, current_request, context)
+            for hook in response_hooks:
+                response = hook(response, context)
+            return unwrap_response(response)
+
+        return call
+
+
+class BatchUnaryUnaryRpcMethod(UnaryUnaryRpcMethod):
+    """Unary gRPC method whose concurrent calls are grouped into batches by its
+    :class:`~grpcalchemy.batch.Batcher`. The middleware hooks are still called
+    for each request and response.
+
+    .. versionadded:: 0.8.0
+    """
+
+    if TYPE_CHECKING:  # pragma: no cover
+        batch: Batcher
+
+        @staticmethod
+        def funcobj(  # type: ignore
+            bp: "Blueprint", requests: List[Message], contexts: List[Context]
+        ) -> List[Message]:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        submit = self.batch.submit
+        from_grpc_message = self.wrap_request()
+        request_hooks = _request_hooks(bp)
+        response_hooks = _response_hooks(bp)
+
+        def handle_batch(
+            requests: List[Message], contexts: List[Context]
+        ) -> List[Message]:
+            return funcobj(bp, requests, contexts)
+
+        def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> GeneratedProtocolMessageType:
+            current_request = from_grpc_message(message)
+            for hook in request_hooks:
+                current_request = hook(current_request, context)
+            response = submit(current_request, context, handle_batch)
+            if response is None:
+                return response
+            for hook in response_hooks:
+                response = hook(response, context)
+            return unwrap_response(response)
+
+        return call
 
 
 class UnaryStreamRpcMethod(AbstractRpcMethod):
+    response_streaming = True
+
+    with_exception_handler = staticmethod(_stream_response_with_exception_handler)
+    with_app_context = staticmethod(_stream_response_with_app_context)
+    with_metrics = staticmethod(_stream_response_with_metrics)
+    with_prefetch = staticmethod(_stream_response_with_prefetch)
+
     if TYPE_CHECKING:  # pragma: no cover
 
         @staticmethod
@@ -115,28 +759,26 @@ class UnaryStreamRpcMethod(AbstractRpcMethod):
     def to_rpc_method(self) -> str:
         return f"rpc {self.name} ({self.request_cls.__name__}) returns (stream {self.response_cls.__name__}) {{}}"
 
-    def handle_call(
-        self, bp: "Blueprint", message: GeneratedProtocolMessageType, context: Context
-    ) -> Iterable[GeneratedProtocolMessageType]:
-        current_request = self.request_cls()
-        current_request.init_grpc_message(grpc_message=message)
-        with bp.current_app.app_context(bp, self.funcobj, context):
-            # TODO: using cygrpc.install_context_from_request_call_event to prepare context
-            try:
-                current_request = bp.current_app.process_request(
-                    current_request, context
-                )
-                current_request = bp.before_request(current_request, context)
-                for response in self.funcobj(bp, current_request, context):
-                    yield response.__message__
-            except Exception as e:
-                yield from map(
-                    attrgetter("__message__"),
-                    bp.current_app.handle_exception(e, context),
-                )
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        from_grpc_message = self.wrap_request()
+        request_hooks = _request_hooks(bp)
+
+        def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> Iterable[GeneratedProtocolMessageType]:
+            current_request = from_grpc_message(message)
+            for hook in request_hooks:
+                current_request = hook(current_request, context)
+            yield from map(unwrap_response, funcobj(bp, current_request, context))
+
+        return call
 
 
 class StreamUnaryRpcMethod(AbstractRpcMethod):
+    request_streaming = True
+
     if TYPE_CHECKING:  # pragma: no cover
 
         @staticmethod
@@ -148,27 +790,32 @@ class StreamUnaryRpcMethod(AbstractRpcMethod):
     def to_rpc_method(self) -> str:
         return f"rpc {self.name} (stream {self.request_cls.__name__}) returns ({self.response_cls.__name__}) {{}}"
 
-    def handle_call(
-        self,
-        bp: "Blueprint",
-        message: Iterable[GeneratedProtocolMessageType],
-        context: Context,
-    ) -> GeneratedProtocolMessageType:
-        request_iterator = self.request_iterator(message)
-        with bp.current_app.app_context(bp, self.funcobj, context):
-            # TODO: using cygrpc.install_context_from_request_call_event to prepare context
-            try:
-                response = self.funcobj(bp, request_iterator, context)
-                bp_response = bp.after_request(response, context)
-                app_response = bp.current_app.process_response(bp_response, context)
-                return app_response.__message__
-            except Exception as e:
-                response = bp.current_app.handle_exception(e, context)
-                if response:
-                    return response.__message__
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        request_iterator = self.request_iterator
+        response_hooks = _response_hooks(bp)
+
+        def call(
+            message: Iterable[GeneratedProtocolMessageType], context: Context
+        ) -> GeneratedProtocolMessageType:
+            response = funcobj(bp, request_iterator(message), context)
+            for hook in response_hooks:
+                response = hook(response, context)
+            return unwrap_response(response)
+
+        return call
 
 
 class StreamStreamRpcMethod(AbstractRpcMethod):
+    request_streaming = True
+    response_streaming = True
+
+    with_exception_handler = staticmethod(_stream_response_with_exception_handler)
+    with_app_context = staticmethod(_stream_response_with_app_context)
+    with_metrics = staticmethod(_stream_response_with_metrics)
+    with_prefetch = staticmethod(_stream_response_with_prefetch)
+
     if TYPE_CHECKING:  # pragma: no cover
 
         @staticmethod
@@ -180,23 +827,467 @@ class StreamStreamRpcMethod(AbstractRpcMethod):
     def to_rpc_method(self) -> str:
         return f"rpc {self.name} (stream {self.request_cls.__name__}) returns (stream {self.response_cls.__name__}) {{}}"
 
-    def handle_call(
-        self,
-        bp: "Blueprint",
-        message: Iterable[GeneratedProtocolMessageType],
-        context: Context,
-    ) -> Iterable[GeneratedProtocolMessageType]:
-        request_iterator = self.request_iterator(message)
-        with bp.current_app.app_context(bp, self.funcobj, context):
-            # TODO: using cygrpc.install_context_from_request_call_event to prepare context
-            try:
-                for response in self.funcobj(bp, request_iterator, context):
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        request_iterator = self.request_iterator
+
+        def call(
+            message: Iterable[GeneratedProtocolMessageType], context: Context
+        ) -> Iterable[GeneratedProtocolMessageType]:
+            yield from map(
+                unwrap_response, funcobj(bp, request_iterator(message), context)
+            )
+
+        return call
+
+
+async def _maybe_await(value: Any) -> Any:
+    if isawaitable(value):
+        return await value
+    return value
+
+
+def _async_hooks(hooks: List[Callable]) -> List[Tuple[Callable, bool]]:
+    return [(hook, iscoroutinefunction(hook)) for hook in hooks]
+
+
+class _AsyncAppContext:
+    """Enter the app context returned by :meth:`Server.app_context`, which may be
+    either an asynchronous or a synchronous context manager.
+    """
+
+    __slots__ = ("manager",)
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+
+    async def __aenter__(self):
+        if hasattr(self.manager, "__aenter__"):
+            return await self.manager.__aenter__()
+        return self.manager.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if hasattr(self.manager, "__aexit__"):
+            return await self.manager.__aexit__(exc_type, exc_val, exc_tb)
+        return self.manager.__exit__(exc_type, exc_val, exc_tb)
+
+
+def _async_unary_response_with_exception_handler(
+    handler: HandlerType, bp: "Blueprint"
+) -> HandlerType:
+    handle_exception = bp.current_app.handle_exception
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        try:
+            return await handler(message, context)
+        except Exception as e:
+            response = await _maybe_await(handle_exception(e, context))
+            if response:
+                return response.__message__
+
+    return handle_call
+
+
+def _async_unary_response_with_app_context(
+    handler: HandlerType, bp: "Blueprint", funcobj: Callable
+) -> HandlerType:
+    app_context = bp.current_app.app_context
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        async with _AsyncAppContext(app_context(bp, funcobj, context)):
+            return await handler(message, context)
+
+    return handle_call
+
+
+def _async_stream_response_with_exception_handler(
+    handler: HandlerType, bp: "Blueprint"
+) -> HandlerType:
+    handle_exception = bp.current_app.handle_exception
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        try:
+            async for response in handler(message, context):
+                yield response
+        except Exception as e:
+            responses = await _maybe_await(handle_exception(e, context))
+            if hasattr(responses, "__aiter__"):
+                async for response in responses:
                     yield response.__message__
-            except Exception as e:
-                yield from map(
-                    attrgetter("__message__"),
-                    bp.current_app.handle_exception(e, context),
+            else:
+                for response in responses:
+                    yield response.__message__
+
+    return handle_call
+
+
+def _async_stream_response_with_app_context(
+    handler: HandlerType, bp: "Blueprint", funcobj: Callable
+) -> HandlerType:
+    app_context = bp.current_app.app_context
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        async with _AsyncAppContext(app_context(bp, funcobj, context)):
+            async for response in handler(message, context):
+                yield response
+
+    return handle_call
+
+
+def _async_stream_response_with_prefetch(
+    handler: HandlerType, prefetcher: Prefetcher
+) -> HandlerType:
+    iterate = prefetcher.async_iterate
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        async for response in iterate(handler(message, context)):
+            yield response
+
+    return handle_call
+
+
+def _async_unary_response_with_metrics(
+    handler: HandlerType, metrics: MethodMetrics, request_streaming: bool
+) -> HandlerType:
+    async def handle_call(message: Any, context: Context) -> Any:
+        metrics.start()
+        if request_streaming:
+            message = _CountingIterator(message)
+        start = perf_counter()
+        code = "UNKNOWN"
+        try:
+            response = await handler(message, context)
+            code = "OK"
+            return response
+        except asyncio.CancelledError:
+            code = "CANCELLED"
+            raise
+        finally:
+            _observe(metrics, context, code, start, message, 1 if code == "OK" else 0)
+
+    return handle_call
+
+
+def _async_stream_response_with_metrics(
+    handler: HandlerType, metrics: MethodMetrics, request_streaming: bool
+) -> HandlerType:
+    async def handle_call(message: Any, context: Context) -> Any:
+        metrics.start()
+        if request_streaming:
+            message = _CountingIterator(message)
+        start = perf_counter()
+        code = "UNKNOWN"
+        messages_sent = 0
+        try:
+            async for response in handler(message, context):
+                messages_sent += 1
+                yield response
+            code = "OK"
+        except (asyncio.CancelledError, GeneratorExit):
+            code = "CANCELLED"
+            raise
+        finally:
+            _observe(metrics, context, code, start, message, messages_sent)
+
+    return handle_call
+
+
+def _async_unary_response_with_limiter(
+    handler: HandlerType, limiter: AdaptiveLimiter
+) -> HandlerType:
+    async def handle_call(message: Any, context: Context) -> Any:
+        if not limiter.acquire():
+            context.set_trailing_metadata(limiter.pushback_metadata())
+            await context.abort(StatusCode.RESOURCE_EXHAUSTED, LIMIT_EXCEEDED_DETAILS)
+        start = perf_counter()
+        dropped = False
+        try:
+            return await handler(message, context)
+        except Exception:
+            dropped = _is_overloaded(context)
+            raise
+        finally:
+            limiter.release(perf_counter() - start, dropped)
+
+    return handle_call
+
+
+def _async_unary_response_with_shedder(
+    handler: HandlerType, shedder: DeadlineShedder
+) -> HandlerType:
+    async def handle_call(message: Any, context: Context) -> Any:
+        if shedder.should_shed(context.time_remaining()):
+            await context.abort(StatusCode.DEADLINE_EXCEEDED, DEADLINE_SHED_DETAILS)
+        start = perf_counter()
+        try:
+            return await handler(message, context)
+        finally:
+            shedder.observe(perf_counter() - start)
+
+    return handle_call
+
+
+def _async_unary_response_with_single_flight(
+    handler: HandlerType, single_flight: SingleFlight
+) -> HandlerType:
+    with_metadata = bool(single_flight.key_metadata)
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        key = single_flight.make_key(
+            message, context.invocation_metadata() if with_metadata else None
+        )
+        create_future = asyncio.get_running_loop().create_future
+        while True:
+            flight, leader = single_flight.join(key, create_future)
+            if leader:
+                break
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(flight), context.time_remaining()
                 )
+            except asyncio.TimeoutError:
+                await context.abort(StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+            if result is not None:
+                response, code, details = result
+                if code is not None and status_code_name(code) != "OK":
+                    await context.abort(to_status_code(code), details)
+                return response
+            # the leader is cancelled, elect a new one
+
+        result = None
+        try:
+            response = _serialize(await handler(message, context))
+            result = (response, context.code(), context.details())
+            return response
+        except Exception as e:
+            result = _failure(context, e)
+            raise
+        finally:
+            single_flight.leave(key)
+            flight.set_result(result)
+
+    return handle_call
+
+
+def _async_unary_response_with_cache(
+    handler: HandlerType, cache: ResponseCache
+) -> HandlerType:
+    with_metadata = bool(cache.key_metadata)
+
+    async def handle_call(message: Any, context: Context) -> Any:
+        key = cache.make_key(
+            message, context.invocation_metadata() if with_metadata else None
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = _serialize(await handler(message, context))
+        if response is not None and _succeeded(context):
+            cache.put(key, response)
+        return response
+
+    return handle_call
+
+
+class AsyncRpcMethodMixin:
+    """Shared helpers of the RPC methods defined with ``async def``.
+
+    Middleware hooks, :meth:`Server.app_context` and :meth:`Server.handle_exception`
+    may be plain functions or coroutine functions.
+    """
+
+    __slots__ = ()
+
+    if TYPE_CHECKING:  # pragma: no cover
+        request_cls: Type[Message]
+
+        def wrap_request(self) -> Callable[[Any], Any]:
+            pass
+
+    async def request_iterator(  # type: ignore
+        self, message: AsyncIterator[GeneratedProtocolMessageType]
+    ) -> AsyncIterator[Message]:
+        from_grpc_message = self.wrap_request()
+        async for m in message:
+            yield from_grpc_message(m)
+
+
+class AsyncUnaryUnaryRpcMethod(AsyncRpcMethodMixin, UnaryUnaryRpcMethod):  # type: ignore
+    with_exception_handler = staticmethod(_async_unary_response_with_exception_handler)
+    with_app_context = staticmethod(_async_unary_response_with_app_context)
+    with_metrics = staticmethod(_async_unary_response_with_metrics)
+    with_limiter = staticmethod(_async_unary_response_with_limiter)
+    with_shedder = staticmethod(_async_unary_response_with_shedder)
+    with_cache = staticmethod(_async_unary_response_with_cache)
+    with_single_flight = staticmethod(_async_unary_response_with_single_flight)
+
+    if TYPE_CHECKING:  # pragma: no cover
+
+        @staticmethod
+        async def funcobj(  # type: ignore
+            bp: "Blueprint", request: Message, contest: Context
+        ) -> Message:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        from_grpc_message = self.wrap_request()
+        request_hooks = _async_hooks(_request_hooks(bp))
+        response_hooks = _async_hooks(_response_hooks(bp))
+
+        async def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> GeneratedProtocolMessageType:
+            current_request = from_grpc_message(message)
+            for hook, is_coroutine in request_hooks:
+                current_request = hook(current_request, context)
+                if is_coroutine:
+                    current_request = await current_request
+            response = await funcobj(bp, current_request, context)
+            for hook, is_coroutine in response_hooks:
+                response = hook(response, context)
+                if is_coroutine:
+                    response = await response
+            return unwrap_response(response)
+
+        return call
+
+
+class AsyncBatchUnaryUnaryRpcMethod(AsyncUnaryUnaryRpcMethod):  # type: ignore
+    if TYPE_CHECKING:  # pragma: no cover
+        batch: Batcher
+
+        @staticmethod
+        async def funcobj(  # type: ignore
+            bp: "Blueprint", requests: List[Message], contexts: List[Context]
+        ) -> List[Message]:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        submit = self.batch.async_submit
+        from_grpc_message = self.wrap_request()
+        request_hooks = _async_hooks(_request_hooks(bp))
+        response_hooks = _async_hooks(_response_hooks(bp))
+
+        async def handle_batch(
+            requests: List[Message], contexts: List[Context]
+        ) -> List[Message]:
+            return await funcobj(bp, requests, contexts)
+
+        async def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> GeneratedProtocolMessageType:
+            current_request = from_grpc_message(message)
+            for hook, is_coroutine in request_hooks:
+                current_request = hook(current_request, context)
+                if is_coroutine:
+                    current_request = await current_request
+            response = await submit(current_request, context, handle_batch)
+            for hook, is_coroutine in response_hooks:
+                response = hook(response, context)
+                if is_coroutine:
+                    response = await response
+            return unwrap_response(response)
+
+        return call
+
+
+class AsyncUnaryStreamRpcMethod(AsyncRpcMethodMixin, UnaryStreamRpcMethod):  # type: ignore
+    with_exception_handler = staticmethod(_async_stream_response_with_exception_handler)
+    with_app_context = staticmethod(_async_stream_response_with_app_context)
+    with_metrics = staticmethod(_async_stream_response_with_metrics)
+    with_prefetch = staticmethod(_async_stream_response_with_prefetch)
+
+    if TYPE_CHECKING:  # pragma: no cover
+
+        @staticmethod
+        def funcobj(  # type: ignore
+            bp: "Blueprint", request: Message, contest: Context
+        ) -> AsyncIterator[Message]:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        from_grpc_message = self.wrap_request()
+        request_hooks = _async_hooks(_request_hooks(bp))
+
+        async def call(
+            message: GeneratedProtocolMessageType, context: Context
+        ) -> AsyncIterator[GeneratedProtocolMessageType]:
+            current_request = from_grpc_message(message)
+            for hook, is_coroutine in request_hooks:
+                current_request = hook(current_request, context)
+                if is_coroutine:
+                    current_request = await current_request
+            async for response in funcobj(bp, current_request, context):
+                yield unwrap_response(response)
+
+        return call
+
+
+class AsyncStreamUnaryRpcMethod(AsyncRpcMethodMixin, StreamUnaryRpcMethod):  # type: ignore
+    with_exception_handler = staticmethod(_async_unary_response_with_exception_handler)
+    with_app_context = staticmethod(_async_unary_response_with_app_context)
+    with_metrics = staticmethod(_async_unary_response_with_metrics)
+
+    if TYPE_CHECKING:  # pragma: no cover
+
+        @staticmethod
+        async def funcobj(  # type: ignore
+            bp: "Blueprint", request: AsyncIterator[Message], contest: Context
+        ) -> Message:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        request_iterator = self.request_iterator
+        response_hooks = _async_hooks(_response_hooks(bp))
+
+        async def call(
+            message: AsyncIterator[GeneratedProtocolMessageType], context: Context
+        ) -> GeneratedProtocolMessageType:
+            response = await funcobj(bp, request_iterator(message), context)
+            for hook, is_coroutine in response_hooks:
+                response = hook(response, context)
+                if is_coroutine:
+                    response = await response
+            return unwrap_response(response)
+
+        return call
+
+
+class AsyncStreamStreamRpcMethod(AsyncRpcMethodMixin, StreamStreamRpcMethod):  # type: ignore
+    with_exception_handler = staticmethod(_async_stream_response_with_exception_handler)
+    with_app_context = staticmethod(_async_stream_response_with_app_context)
+    with_metrics = staticmethod(_async_stream_response_with_metrics)
+    with_prefetch = staticmethod(_async_stream_response_with_prefetch)
+
+    if TYPE_CHECKING:  # pragma: no cover
+
+        @staticmethod
+        def funcobj(  # type: ignore
+            bp: "Blueprint", request: AsyncIterator[Message], contest: Context
+        ) -> AsyncIterator[Message]:
+            pass
+
+    def build_call(self, bp: "Blueprint") -> HandlerType:
+        funcobj = self.funcobj
+        unwrap_response = self.unwrap_response()
+        request_iterator = self.request_iterator
+
+        async def call(
+            message: AsyncIterator[GeneratedProtocolMessageType], context: Context
+        ) -> AsyncIterator[GeneratedProtocolMessageType]:
+            async for response in funcobj(bp, request_iterator(message), context):
+                yield unwrap_response(response)
+
+        return call
 
 
 RequestType = TypeVar("RequestType", bound=Message)
@@ -219,6 +1310,21 @@ class Blueprint:
 
     current_app: "Server"
 
+    #: Size of the thread pool dedicated to the gRPC methods of this blueprint,
+    #: they share the thread pool of the server if neither it nor
+    #: :attr:`max_queue_size` is set. Only supported by the synchronous
+    #: :class:`Server`, :class:`AsyncServer` raises :class:`InvalidRPCMethod`
+    #: for its synchronous gRPC methods.
+    #:
+    #: .. versionadded:: 0.8.0
+    max_workers: Optional[int] = None
+
+    #: Max number of RPCs waiting for a thread of the dedicated thread pool, the
+    #: exceeding ones are rejected with ``RESOURCE_EXHAUSTED``.
+    #:
+    #: .. versionadded:: 0.8.0
+    max_queue_size: Optional[int] = None
+
     @classmethod
     def access_service_name(cls) -> str:
         return cls.__name__
@@ -227,38 +1333,160 @@ class Blueprint:
     def access_file_name(cls) -> str:
         return cls.access_service_name().lower()
 
+    @default_hook
     def before_request(self, request: RequestType, context: Context) -> RequestType:
         """The code to be executed for each request before
         the gRPC method in this blueprint are called. Only in **UnaryUnary** and **UnarySteam** method
         """
         return request
 
+    @default_hook
     def after_request(self, response: ResponseType, context: Context) -> ResponseType:
         """The code to be executed for each response after
         the gRPC method in this blueprint are called. **UnaryUnary** and **StreamUnary** method
         """
         return response
 
+    @classmethod
+    def get_rpc_methods(cls) -> gRPCMethodsType:
+        """All the gRPC methods defined in this blueprint.
+
+        .. versionadded:: 0.8.0
+        """
+        rpc_methods: gRPCMethodsType = []
+        for method_str in dir(cls):
+            method = getattr(cls, method_str)
+            if getattr(method, "__grpcmethod__", False):
+                rpc_methods.append(method.__rpc_method__)
+        return rpc_methods
+
+    @classmethod
+    def check_rpc_methods(cls, rpc_methods: Dict[str, str]) -> gRPCMethodsType:
+        """Check the gRPC methods of this blueprint against their proto
+        definitions in the manifest written by ``grpcalchemy build``, and
+        return them.
+
+        :param rpc_methods: the proto definitions of the gRPC methods by name.
+        :raise RuntimeError: if a gRPC method is added, removed or changed
+            since the manifest was written.
+
+        .. versionadded:: 0.8.0
+        """
+        checked = cls.get_rpc_methods()
+        definitions = {
+            rpc_method.name: rpc_method.to_rpc_method() for rpc_method in checked
+        }
+        if definitions != rpc_methods:
+            changed = sorted(
+                name
+                for name in definitions.keys() | rpc_methods.keys()
+                if definitions.get(name) != rpc_methods.get(name)
+            )
+            raise RuntimeError(
+                f"{cls.access_service_name()}.{{{', '.join(changed)}}} differs "
+                "from the manifest, run `grpcalchemy build` again."
+            )
+        return checked
+
     @classmethod
     def as_view(cls) -> gRPCMethodsType:
         """Is there a necessary to implement this with Meta Programming"""
         file_name = cls.access_file_name()
         service_meta = ServiceMeta(name=cls.access_service_name(), rpcs=[])
         __meta__[file_name].services.append(service_meta)
-        for method_str in dir(cls):
-            method = getattr(cls, method_str)
-            if getattr(method, "__grpcmethod__", False):
-                service_meta.rpcs.append(method.__rpc_method__)
-                rpc_method: AbstractRpcMethod = method.__rpc_method__
-                request_cls = rpc_method.request_cls
-                response_cls = rpc_method.response_cls
-                if request_cls.__filename__ != file_name:
-                    __meta__[file_name].import_files.add(request_cls.__filename__)
-
-                if response_cls.__filename__ != file_name:
-                    __meta__[file_name].import_files.add(response_cls.__filename__)
+        for rpc_method in cls.get_rpc_methods():
+            service_meta.rpcs.append(rpc_method)
+            request_cls = rpc_method.request_cls
+            response_cls = rpc_method.response_cls
+            if request_cls.__filename__ != file_name:
+                __meta__[file_name].import_files.add(request_cls.__filename__)
+
+            if response_cls.__filename__ != file_name:
+                __meta__[file_name].import_files.add(response_cls.__filename__)
         return service_meta.rpcs
 
+    def build_rpc_handlers(self, rpc_methods: Optional[gRPCMethodsType] = None) -> None:
+        """Bind the handler specialized by :meth:`AbstractRpcMethod.build_handler`
+        to each gRPC method of this blueprint, which is called when the blueprint is
+        added to the server.
+
+        :param rpc_methods: the gRPC methods of this blueprint found on start,
+            which are looked for again if not given.
+
+        The handlers run in the thread pool dedicated to their gRPC method or
+        to this blueprint, if :attr:`max_workers` or :attr:`max_queue_size` is
+        set on either of them. If the adaptive limit is enabled, the RPCs of the
+        synchronous unary gRPC methods are submitted to the thread pool through
+        :class:`~grpcalchemy.executor.LimitedExecutor`.
+
+        :raise InvalidRPCMethod: if a dedicated thread pool is set for a
+            synchronous gRPC method of :class:`AsyncServer`, which would be ignored.
+
+        .. versionadded:: 0.8.0
+        """
+        service_name = self.access_service_name()
+        executor: Optional[BoundedThreadPoolExecutor] = None
+        method_executor: Optional[ThreadPoolExecutor]
+        if rpc_methods is None:
+            rpc_methods = self.get_rpc_methods()
+        for rpc_method in rpc_methods:
+            handler = rpc_method.build_handler(self)
+            # coroutines are not run in thread pools
+            if not isinstance(rpc_method, AsyncRpcMethodMixin):
+                if not self.current_app.dedicated_thread_pools and any(
+                    option is not None
+                    for option in (
+                        rpc_method.max_workers,
+                        rpc_method.max_queue_size,
+                        self.max_workers,
+                        self.max_queue_size,
+                    )
+                ):
+                    raise InvalidRPCMethod(
+                        f"{service_name}.{rpc_method.name}: dedicated thread pools "
+                        f"are not supported by {type(self.current_app).__name__}."
+                    )
+                method_executor = self.create_executor(
+                    rpc_method.max_workers,
+                    rpc_method.max_queue_size,
+                    f"{service_name}.{rpc_method.name}",
+                )
+                if method_executor is None:
+                    if executor is None:
+                        executor = self.create_executor(
+                            self.max_workers, self.max_queue_size, service_name
+                        )
+                    method_executor = executor
+                if rpc_method.limited_on_submit(self):
+                    method_executor = LimitedExecutor(
+                        method_executor or self.current_app.thread_pool,
+                        self.current_app.get_limiter(service_name, rpc_method.name),
+                    )
+                if method_executor is not None:
+                    handler.experimental_thread_pool = method_executor  # type: ignore
+            setattr(self, rpc_method.name, handler)
+
+    def create_executor(
+        self, max_workers: Optional[int], max_queue_size: Optional[int], name: str
+    ) -> Optional[BoundedThreadPoolExecutor]:
+        """Create the thread pool named ``name``, ``None`` if neither
+        ``max_workers`` nor ``max_queue_size`` is set.
+
+        .. versionadded:: 0.8.0
+        """
+        if max_workers is None and max_queue_size is None:
+            return None
+        executor = BoundedThreadPoolExecutor(
+            max_workers=max_workers or self.current_app.config.GRPC_SERVER_MAX_WORKERS,
+            max_queue_size=max_queue_size,
+            name=name,
+        )
+        self.current_app.executors.append(executor)
+        registry = getattr(self.current_app, "metrics", None)
+        if registry is not None:
+            registry.register_executor(executor)
+        return executor
+
 
 gRPCFunctionType = Callable[
     [Blueprint, Union[Message, Iterator[Message]], Context],
@@ -267,8 +1495,14 @@ gRPCFunctionType = Callable[
 F = TypeVar("F", bound=gRPCFunctionType)
 
 
+def _batch_item_type(annotation: Any) -> Any:
+    if getattr(annotation, "__origin__", None) is list:
+        return annotation.__args__[0]
+    return object
+
+
 def _validate_rpc_method(
-    funcobj: gRPCFunctionType,
+    funcobj: gRPCFunctionType, **options: Any
 ) -> AbstractRpcMethod:
     sig = signature(funcobj)
 
@@ -276,8 +1510,14 @@ def _validate_rpc_method(
         request_streaming = False
         response_streaming = False
 
-        request_type = getattr(sig.parameters.get("request"), "annotation")
-        response_type = sig.return_annotation
+        is_batch = options.get("batch") is not None
+        if is_batch:
+            # the batch gRPC method handles the lists of requests and contexts
+            request_type = _batch_item_type(list(sig.parameters.values())[1].annotation)
+            response_type = _batch_item_type(sig.return_annotation)
+        else:
+            request_type = getattr(sig.parameters.get("request"), "annotation")
+            response_type = sig.return_annotation
 
         request_origin = getattr(request_type, "__origin__", None)
         if request_origin:
@@ -290,43 +1530,49 @@ def _validate_rpc_method(
             if issubclass(response_origin, Streaming):
                 response_type = response_type.__args__[0]
                 response_streaming = True
+        is_async = iscoroutinefunction(funcobj) or isasyncgenfunction(funcobj)
         if all(
             [
                 Message not in [request_type, response_type],
                 issubclass(request_type, Message),
                 issubclass(response_type, Message),
+                not is_async or isasyncgenfunction(funcobj) == response_streaming,
             ]
         ):
+            rpc_method_cls: Type[AbstractRpcMethod]
             if request_streaming:
                 if response_streaming:
-                    return StreamStreamRpcMethod(
-                        name=funcobj.__name__,
-                        funcobj=funcobj,
-                        request_cls=request_type,
-                        response_cls=response_type,
+                    rpc_method_cls = (
+                        AsyncStreamStreamRpcMethod
+                        if is_async
+                        else StreamStreamRpcMethod
                     )
                 else:
-                    return StreamUnaryRpcMethod(
-                        name=funcobj.__name__,
-                        funcobj=funcobj,
-                        request_cls=request_type,
-                        response_cls=response_type,
+                    rpc_method_cls = (
+                        AsyncStreamUnaryRpcMethod if is_async else StreamUnaryRpcMethod
                     )
             else:
                 if response_streaming:
-                    return UnaryStreamRpcMethod(
-                        name=funcobj.__name__,
-                        funcobj=funcobj,
-                        request_cls=request_type,
-                        response_cls=response_type,
+                    rpc_method_cls = (
+                        AsyncUnaryStreamRpcMethod if is_async else UnaryStreamRpcMethod
+                    )
+                elif is_batch:
+                    rpc_method_cls = (
+                        AsyncBatchUnaryUnaryRpcMethod
+                        if is_async
+                        else BatchUnaryUnaryRpcMethod
                     )
                 else:
-                    return UnaryUnaryRpcMethod(
-                        name=funcobj.__name__,
-                        funcobj=funcobj,
-                        request_cls=request_type,
-                        response_cls=response_type,
+                    rpc_method_cls = (
+                        AsyncUnaryUnaryRpcMethod if is_async else UnaryUnaryRpcMethod
                     )
+            return rpc_method_cls(
+                name=funcobj.__name__,
+                funcobj=funcobj,
+                request_cls=request_type,
+                response_cls=response_type,
+                **options,
+            )
     raise InvalidRPCMethod(
         """\
 The RPC method is invalid.
@@ -343,7 +1589,38 @@ The correct signature is blow::
     )
 
 
-def grpcmethod(funcobj: F) -> F:
+@overload
+def grpcmethod(funcobj: F) -> F:  # pragma: no cover
+    ...
+
+
+@overload
+def grpcmethod(
+    *,
+    max_workers: Optional[int] = None,
+    max_queue_size: Optional[int] = None,
+    cache: Optional[ResponseCache] = None,
+    single_flight: Optional[SingleFlight] = None,
+    batch: Optional[Batcher] = None,
+    raw: bool = False,
+    lazy: bool = False,
+    prefetch: Optional[Prefetcher] = None,
+) -> Callable[[F], F]:  # pragma: no cover
+    ...
+
+
+def grpcmethod(
+    funcobj: Optional[F] = None,
+    *,
+    max_workers: Optional[int] = None,
+    max_queue_size: Optional[int] = None,
+    cache: Optional[ResponseCache] = None,
+    single_flight: Optional[SingleFlight] = None,
+    batch: Optional[Batcher] = None,
+    raw: bool = False,
+    lazy: bool = False,
+    prefetch: Optional[Prefetcher] = None,
+) -> Union[F, Callable[[F], F]]:
     """A decorator indicating gRPC methods.
 
 
@@ -353,6 +1630,9 @@ def grpcmethod(funcobj: F) -> F:
 
     Any gRPC method must define request and response's Message Type with `Type Hint`.
 
+    gRPC methods defined with ``async def`` (or as asynchronous generators for
+    ``Streaming`` responses) are served by :class:`AsyncServer`.
+
     Usage::
 
         class FooService(Blueprint):
@@ -360,17 +1640,120 @@ def grpcmethod(funcobj: F) -> F:
             def GetSomething(self, request: Message, context: Context) -> Message:
                 ...
 
+    The gRPC method can run in its own thread pool, sized independently of
+    the one of its blueprint::
+
+        class FooService(Blueprint):
+            @grpcmethod(max_workers=4, max_queue_size=16)
+            def GetReport(self, request: Message, context: Context) -> Message:
+                ...
+
+    With a :class:`~grpcalchemy.batch.Batcher`, the concurrent calls of a unary
+    gRPC method are grouped, and it handles the list of their requests::
+
+        class FooService(Blueprint):
+            @grpcmethod(batch=Batcher(max_batch_size=64, max_wait_us=2000))
+            def GetVectors(
+                self, requests: List[Message], contexts: List[Context]
+            ) -> List[Message]:
+                ...
+
+    In raw mode, the gRPC method handles the serialized requests and returns
+    the serialized responses as ``bytes`` or ``memoryview``, the types of its
+    signature only declare the schema of the service. The middleware hooks
+    also see the serialized messages, which can be parsed on demand with
+    :meth:`Message.from_bytes`::
+
+        class ProxyService(Blueprint):
+            @grpcmethod(raw=True)
+            def Forward(self, request: Message, context: Context) -> Message:
+                return upstream_stub.Forward(request)
+
     :param funcobj: gRPC Method
     :type funcobj: Callable[[Message, Context], Message]
+    :param max_workers: size of the thread pool dedicated to the gRPC method.
+    :param max_queue_size: max number of RPCs waiting for a thread of the
+        dedicated thread pool, the exceeding ones are rejected with
+        ``RESOURCE_EXHAUSTED``.
+    :param cache: the :class:`~grpcalchemy.cache.ResponseCache` of an idempotent
+        unary gRPC method, whose hits skip the handler and the serialization
+        of the response.
+    :param single_flight: the :class:`~grpcalchemy.cache.SingleFlight` of a
+        unary gRPC method, which coalesces its concurrent calls with identical
+        requests.
+    :param batch: the :class:`~grpcalchemy.batch.Batcher` of a batch gRPC
+        method.
+    :param raw: whether the gRPC method handles the serialized messages.
+    :param lazy: whether the requests are only parsed once the gRPC method
+        reads them, see :meth:`Message.from_lazy_bytes`.
+    :param prefetch: the :class:`~grpcalchemy.stream.Prefetcher` of a
+        response-streaming gRPC method, which produces the responses ahead of
+        sending them.
     :rtype: Callable[[Message, Context], Message]
+
+    .. versionchanged:: 0.8.0
+        Accept ``max_workers``, ``max_queue_size``, ``cache``, ``single_flight``,
+        ``batch``, ``raw``, ``lazy`` and ``prefetch``.
     """
-    rpc_method = _validate_rpc_method(funcobj)
+    if funcobj is None:
+        return partial(
+            grpcmethod,
+            max_workers=max_workers,
+            max_queue_size=max_queue_size,
+            cache=cache,
+            single_flight=single_flight,
+            batch=batch,
+            raw=raw,
+            lazy=lazy,
+            prefetch=prefetch,
+        )
+
+    rpc_method = _validate_rpc_method(
+        funcobj,
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+        cache=cache,
+        single_flight=single_flight,
+        batch=batch,
+        raw=raw,
+        lazy=lazy,
+        prefetch=prefetch,
+    )
 
-    @wraps(funcobj)
-    def wrapper(
-        self: Blueprint, origin_request: GeneratedProtocolMessageType, context: Context
-    ):
-        return rpc_method.handle_call(self, origin_request, context)
+    wrapper: Callable
+    if isinstance(rpc_method, AsyncRpcMethodMixin):
+        if isasyncgenfunction(funcobj):
+
+            @wraps(funcobj)
+            async def wrapper(
+                self: Blueprint,
+                origin_request: GeneratedProtocolMessageType,
+                context: Context,
+            ):
+                async for response in rpc_method.handle_call(
+                    self, origin_request, context
+                ):
+                    yield response
+
+        else:
+
+            @wraps(funcobj)
+            async def wrapper(
+                self: Blueprint,
+                origin_request: GeneratedProtocolMessageType,
+                context: Context,
+            ):
+                return await rpc_method.handle_call(self, origin_request, context)
+
+    else:
+
+        @wraps(funcobj)
+        def wrapper(
+            self: Blueprint,
+            origin_request: GeneratedProtocolMessageType,
+            context: Context,
+        ):
+            return rpc_method.handle_call(self, origin_request, context)
 
     wrapper.__grpcmethod__ = True  # type: ignore
     wrapper.__rpc_method__ = rpc_method  # type: ignore
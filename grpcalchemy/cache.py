@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from .orm import Message
+
+CacheKey = Tuple[Tuple[Optional[str], ...], bytes]
+
+
+def make_request_key(
+    request: Any,
+    metadata: Optional[Iterable[Tuple[str, Any]]],
+    key_metadata: Tuple[str, ...],
+) -> CacheKey:
+    if isinstance(request, Message):
+        # a lazy request is keyed by its received bytes to keep it unparsed
+        data = getattr(request, "__data__", None)
+        request = request.__message__ if data is None else data
+    if request.__class__ is bytes:
+        # the serialized request of a gRPC method in raw mode
+        serialized = request
+    else:
+        serialized = request.SerializeToString(deterministic=True)
+    values: Tuple[Optional[str], ...] = ()
+    if key_metadata:
+        metadata_dict: Dict[str, Any] = dict(metadata or ())
+        values = tuple(metadata_dict.get(key) for key in key_metadata)
+    return values, serialized
+
+
+class ResponseCache:
+    """Bounded LRU cache of the serialized responses of a unary gRPC method,
+    keyed by the deterministic serialization of the request and the values of
+    ``key_metadata`` in the invocation metadata.
+
+    Entries expire ``ttl`` seconds after they are stored, the least recently
+    used ones are evicted once there are more than ``max_entries`` of them or
+    they take more than ``max_bytes``.
+
+    The requests of a gRPC method in lazy mode are keyed by the bytes sent by
+    the clients, which are not canonical, e.g. the entries of map fields may
+    come in any order, so the same request serialized differently misses the
+    cache and is not removed by :meth:`invalidate`.
+
+    Usage::
+
+        user_cache = ResponseCache(ttl=30, key_metadata=("x-tenant",))
+
+        class UserService(Blueprint):
+            @grpcmethod(cache=user_cache)
+            def GetUser(self, request: UserRequest, context: Context) -> User:
+                ...
+
+        user_cache.invalidate(UserRequest(id=1), metadata=[("x-tenant", "foo")])
+
+    Each gRPC method needs its own cache, since the responses of different
+    methods to the same request would be mixed up otherwise.
+
+    :param max_entries: max number of cached responses.
+    :param max_bytes: max total size of the cached responses.
+    :param ttl: seconds a response is cached for, forever if it is ``None``.
+    :param key_metadata: keys of the invocation metadata which the responses
+        depend on, e.g. the tenant or the identity of the caller.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = 60.0,
+        key_metadata: Sequence[str] = (),
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.key_metadata = tuple(key_metadata)
+        #: full name of the gRPC method which the cache is bound to.
+        self.method: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        #: number of responses evicted by the limits of entries and bytes.
+        self.evictions = 0
+        #: total size of the cached responses.
+        self.bytes = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(
+        self,
+        request: Any,
+        metadata: Optional[Iterable[Tuple[str, Any]]] = None,
+    ) -> CacheKey:
+        """The key of ``request``, which is either a :class:`Message` or a
+        gRPC message, with the invocation ``metadata``.
+        """
+        return make_request_key(request, metadata, self.key_metadata)
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at >= monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, response: bytes) -> None:
+        size = len(response)
+        if size > self.max_bytes:
+            return
+        expires_at = float("inf") if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, response)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(
+        self,
+        request: Any,
+        metadata: Optional[Iterable[Tuple[str, Any]]] = None,
+    ) -> bool:
+        """Remove the cached response of ``request`` with ``metadata``, return
+        whether it was cached.
+        """
+        key = self.make_key(request, metadata)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        """Remove all the cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        _, response = self._entries.pop(key)
+        self.bytes -= len(response)
+
+
+class SingleFlight:
+    """Coalesce the concurrent calls of a unary gRPC method with identical
+    requests: the first one, the leader, runs the gRPC method while the
+    others wait for it and share its serialized response or status.
+
+    A waiting call stops waiting on its own cancellation or deadline, without
+    affecting the leader and the other waiting calls. In :class:`AsyncServer`,
+    if the leader is cancelled, the waiting calls elect a new one.
+
+    Usage::
+
+        class ProductService(Blueprint):
+            @grpcmethod(single_flight=SingleFlight(key_metadata=("x-tenant",)))
+            def GetProduct(self, request: ProductRequest, context: Context) -> Product:
+                ...
+
+    Each gRPC method needs its own single flight, since the calls of different
+    methods with the same request would be coalesced otherwise.
+
+    :param key_metadata: keys of the invocation metadata which the responses
+        depend on, the calls are only coalesced if they have the same values.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, key_metadata: Sequence[str] = ()):
+        self.key_metadata = tuple(key_metadata)
+        #: full name of the gRPC method which the single flight is bound to.
+        self.method: Optional[str] = None
+        #: number of the calls which ran the gRPC method.
+        self.executions = 0
+        #: number of the calls which shared the response of a leader.
+        self.coalesced = 0
+        self._flights: Dict[CacheKey, Any] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def make_key(
+        self,
+        request: Any,
+        metadata: Optional[Iterable[Tuple[str, Any]]] = None,
+    ) -> CacheKey:
+        return make_request_key(request, metadata, self.key_metadata)
+
+    def join(self, key: CacheKey, new_flight: Callable[[], Any]) -> Tuple[Any, bool]:
+        """The flight of ``key`` created by ``new_flight`` if there is none,
+        and whether the caller is the leader of it.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = new_flight()
+            self.executions += 1
+            return flight, True
+
+    def leave(self, key: CacheKey) -> None:
+        """Called by the leader once the gRPC method returned."""
+        with self._lock:
+            self._flights.pop(key, None)
+
+
+def serialize_or_pass(serialize: Any, message: Any) -> bytes:
+    """Serialize the gRPC ``message`` unless it is already serialized, e.g.
+    by a :class:`ResponseCache` or a :class:`SingleFlight`.
+
+    .. versionadded:: 0.8.0
+    """
+    if message.__class__ is bytes:
+        return message
+    return serialize(message)
@@ -0,0 +1,64 @@
+"""The ``grpcalchemy`` command line::
+
+    $ grpcalchemy build app:HelloService --config app:MyConfig
+
+.. versionadded:: 0.8.0
+"""
+import argparse
+import sys
+from importlib import import_module
+from typing import Any, List, Optional
+
+from .config import DefaultConfig
+
+
+def import_string(import_name: str) -> Any:
+    """Import the object named ``module:attribute``."""
+    module_name, _, attribute = import_name.partition(":")
+    if not attribute:
+        raise ValueError(f"{import_name} is not in the form of module:attribute.")
+    obj: Any = import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def build(app: str, config: Optional[str] = None) -> str:
+    """Generate the proto and pb files of the server ``app`` with the manifest
+    of its messages and services, and return the path of the manifest.
+
+    :param app: the server class as ``module:attribute``.
+    :param config: the config class or object as ``module:attribute``.
+    """
+    server_cls = import_string(app)
+    server_config: DefaultConfig = DefaultConfig()
+    if config is not None:
+        server_config = import_string(config)
+        if isinstance(server_config, type):
+            server_config = server_config()
+    return server_cls.build(server_config)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="grpcalchemy")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser(
+        "build",
+        help="generate the proto and pb files with the manifest of a server, "
+        "which is loaded if PROTO_FROM_MANIFEST is set.",
+    )
+    build_parser.add_argument("app", help="the server class, e.g. app:HelloService")
+    build_parser.add_argument(
+        "--config", help="the config class or object, e.g. app:MyConfig"
+    )
+    args = parser.parse_args(argv)
+
+    # the application is imported from the current directory
+    sys.path.insert(0, "")
+    manifest_path = build(args.app, args.config)
+    print(f"manifest is written to {manifest_path}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
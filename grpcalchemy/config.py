@@ -12,12 +12,30 @@ class DefaultConfig(BaseConfig):
     PROTO_TEMPLATE_PATH = "protos"
     #: If set to false, proto and pb file will not be generated on runtime automatically.
     PROTO_AUTO_GENERATED = True
+    #: If set to true, the descriptors and message classes are built in memory
+    #: from the declared messages and services, without protoc, Jinja and any
+    #: proto or pb file.
+    #:
+    #: .. versionadded:: 0.8.0
+    PROTO_IN_MEMORY = False
+    #: If set to true, the messages are loaded from the manifest and the pb
+    #: files written by ``grpcalchemy build``, without rendering or compiling
+    #: any proto file, and the gRPC methods are checked against the manifest.
+    #:
+    #: .. versionadded:: 0.8.0
+    PROTO_FROM_MANIFEST = False
 
     #: Max workers in service thread pool
     GRPC_SERVER_MAX_WORKERS = 8
     #: Multiple process support
     #: Prefer to use `multiprocessing.cpu_count()` in production.
     GRPC_SERVER_PROCESS_COUNT = 1
+    #: Seconds before respawning an exited worker process, doubled after each
+    #: consecutive exit up to ``GRPC_SERVER_RESPAWN_MAX_BACKOFF``.
+    #:
+    #: .. versionadded:: 0.8.0
+    GRPC_SERVER_RESPAWN_BACKOFF = 1.0
+    GRPC_SERVER_RESPAWN_MAX_BACKOFF = 30.0
 
     #: An optional list of key-value pairs (channel args in gRPC runtime)
     #: to configure the channel.
@@ -27,6 +45,31 @@ class DefaultConfig(BaseConfig):
     #: will service before returning RESOURCE_EXHAUSTED status, or None to
     #: indicate no limit.
     GRPC_SERVER_MAXIMUM_CONCURRENT_RPCS: Optional[int] = None
+    #: If set to true, the concurrent RPCs of every unary gRPC method are
+    #: limited by its own :class:`~grpcalchemy.limiter.AdaptiveLimiter`, which
+    #: adapts the limit to the observed latency between the min and max limits.
+    #: The exceeding RPCs are rejected with RESOURCE_EXHAUSTED status and the
+    #: ``grpc-retry-pushback-ms`` trailing metadata.
+    #:
+    #: .. versionadded:: 0.8.0
+    GRPC_SERVER_ADAPTIVE_LIMIT_ENABLE = False
+    GRPC_SERVER_ADAPTIVE_LIMIT_INITIAL = 20
+    GRPC_SERVER_ADAPTIVE_LIMIT_MIN = 1
+    GRPC_SERVER_ADAPTIVE_LIMIT_MAX = 1000
+    #: If set to true, the RPCs of unary gRPC methods whose remaining time before
+    #: the deadline is shorter than ``GRPC_SERVER_DEADLINE_SHEDDING_RATIO`` times
+    #: the typical latency of the method fail with DEADLINE_EXCEEDED status
+    #: without being handled.
+    #:
+    #: .. versionadded:: 0.8.0
+    GRPC_SERVER_DEADLINE_SHEDDING_ENABLE = False
+    GRPC_SERVER_DEADLINE_SHEDDING_RATIO = 1.0
+
+    #: Seconds which the active RPCs have to complete after the server begins to
+    #: stop gracefully, e.g. on ``SIGTERM``.
+    #:
+    #: .. versionadded:: 0.8.0
+    GRPC_SERVER_GRACE = 10.0
 
     #: If set `True` the server will be blocked after run
     GRPC_SERVER_RUN_WITH_BLOCK = True
@@ -43,6 +86,17 @@ class DefaultConfig(BaseConfig):
     GRPC_HEALTH_CHECKING_ENABLE = True
     GRPC_HEALTH_CHECKING_THREAD_POOL_NUM = 1
 
+    #: Latency histograms and counters of gRPC methods
+    #:
+    #: .. versionadded:: 0.8.0
+    GRPC_METRICS_ENABLE = False
+    #: If the port is set, the metrics are served as Prometheus text on
+    #: ``http://{GRPC_METRICS_HOST}:{GRPC_METRICS_PORT}/metrics``.
+    #: In multiple processor mode, the port of each worker process is offset by
+    #: its index.
+    GRPC_METRICS_HOST = "127.0.0.1"
+    GRPC_METRICS_PORT: Optional[int] = None
+
     #: Server Reflection
     GRPC_SEVER_REFLECTION_ENABLE = False
 
@@ -0,0 +1,147 @@
+from concurrent import futures
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Optional, Tuple
+
+from grpc import StatusCode
+from grpc._cython import cygrpc
+from grpc._server import _abort
+
+from .limiter import LIMIT_EXCEEDED_DETAILS, AdaptiveLimiter, is_overload
+
+#: Details of the status sent when an RPC is rejected by a full executor.
+REJECTED_DETAILS = b"Thread pool of the service is exhausted."
+
+
+def reject_rpc(
+    rpc_event: Any,
+    state: Any,
+    details: bytes,
+    trailing_metadata: Optional[Tuple[Tuple[str, str], ...]] = None,
+) -> futures.Future:
+    """Finish the RPC submitted to an executor with ``RESOURCE_EXHAUSTED``,
+    the ``state`` of the RPC is locked by the server when the behavior is
+    submitted.
+
+    .. versionadded:: 0.8.0
+    """
+    state.code = StatusCode.RESOURCE_EXHAUSTED
+    if trailing_metadata is not None:
+        state.trailing_metadata = trailing_metadata
+    _abort(state, rpc_event.call, cygrpc.StatusCode.resource_exhausted, details)
+    future: futures.Future = futures.Future()
+    future.set_result(None)
+    return future
+
+
+class BoundedThreadPoolExecutor(futures.ThreadPoolExecutor):
+    """Thread pool dedicated to the gRPC methods of a blueprint (or a single
+    gRPC method) which bounds the number of RPCs waiting for a thread.
+
+    The RPCs submitted while ``max_queue_size`` RPCs are already waiting are
+    rejected with ``RESOURCE_EXHAUSTED`` without reaching the gRPC method, so a
+    slow service can never take the threads of the others.
+
+    :param max_workers: number of threads of the pool.
+    :param max_queue_size: max number of RPCs waiting for a thread, unbounded
+        if it is ``None``.
+    :param name: name of the pool, used as the prefix of its threads and the
+        label of its metrics.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: Optional[int] = None,
+        name: str = "",
+    ):
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self.name = name
+        self.max_queue_size = max_queue_size
+        #: number of the rejected RPCs.
+        self.rejected = 0
+        # RPCs submitted and not finished yet
+        self._pending = 0
+        self._pending_lock = Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of RPCs waiting for a thread."""
+        return max(self._pending - self._max_workers, 0)
+
+    def submit(  # type: ignore
+        self, fn: Callable, *args: Any, **kwargs: Any
+    ) -> futures.Future:
+        # RPCs are submitted one by one from the polling thread of the server,
+        # the pending RPCs can only decrease between the check and the submission.
+        if (
+            self.max_queue_size is not None
+            and self._pending >= self._max_workers + self.max_queue_size
+        ):
+            self.rejected += 1
+            return self.reject(*args)
+        with self._pending_lock:
+            self._pending += 1
+        future = super().submit(fn, *args, **kwargs)
+        future.add_done_callback(self._finish)
+        return future
+
+    def _finish(self, future: futures.Future) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def reject(self, rpc_event: Any, state: Any, *args: Any) -> futures.Future:
+        """Finish the RPC with ``RESOURCE_EXHAUSTED``, see :func:`reject_rpc`."""
+        return reject_rpc(rpc_event, state, REJECTED_DETAILS)
+
+
+class LimitedExecutor(futures.ThreadPoolExecutor):
+    """Submit the RPCs of a gRPC method to ``executor`` within the concurrency
+    limit of ``limiter``.
+
+    The limit is taken once an RPC arrives, before it waits for a thread of
+    ``executor``, so the RPCs queued up behind busy threads count towards the
+    limit and their latency includes the time in the queue. The RPCs
+    exceeding the limit are rejected with ``RESOURCE_EXHAUSTED`` and the
+    pushback metadata of ``limiter``.
+
+    :param executor: the thread pool which the RPCs run in.
+    :param limiter: the adaptive limiter of the gRPC method.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, executor: futures.ThreadPoolExecutor, limiter: AdaptiveLimiter):
+        # no thread is started by this executor, it only submits to ``executor``
+        super().__init__(max_workers=1)
+        self.executor = executor
+        self.limiter = limiter
+
+    def submit(  # type: ignore
+        self, fn: Callable, *args: Any, **kwargs: Any
+    ) -> futures.Future:
+        rpc_event, state = args[0], args[1]
+        limiter = self.limiter
+        if not limiter.acquire():
+            return reject_rpc(
+                rpc_event,
+                state,
+                LIMIT_EXCEEDED_DETAILS.encode("utf-8"),
+                limiter.pushback_metadata(),
+            )
+        start = perf_counter()
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            limiter.release(perf_counter() - start)
+            raise
+        future.add_done_callback(
+            lambda _: limiter.release(perf_counter() - start, is_overload(state.code))
+        )
+        return future
@@ -0,0 +1,174 @@
+from math import sqrt
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+from .metrics import status_code_name
+
+#: Trailing metadata telling the clients how long to wait before retrying, see
+#: https://github.com/grpc/proposal/blob/master/A6-client-retries.md#pushback
+PUSHBACK_METADATA_KEY = "grpc-retry-pushback-ms"
+
+#: Details of the status sent when an RPC is rejected by a limiter.
+LIMIT_EXCEEDED_DETAILS = "Concurrency limit of the method is exceeded."
+
+#: Status codes of the RPCs failed by overload, which shrink the limit.
+OVERLOAD_CODES = frozenset(["RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED", "UNAVAILABLE"])
+
+
+def is_overload(code: Any) -> bool:
+    """Whether an RPC finished with the status ``code`` failed by overload."""
+    return code is not None and status_code_name(code) in OVERLOAD_CODES
+
+
+class AdaptiveLimiter:
+    """Concurrency limit of a gRPC method adapted to its latency with the
+    gradient algorithm.
+
+    The latency of each RPC is compared with the long term average one: while
+    it stays within ``tolerance`` times the average, the limit grows by about
+    its square root; once the RPCs start to queue up behind a saturated
+    resource and the latency grows, the limit shrinks in proportion. RPCs
+    failed by overload, e.g. ``DEADLINE_EXCEEDED``, shrink it by
+    ``backoff_ratio``.
+
+    :param initial_limit: the limit before any RPC is observed.
+    :param min_limit: the lower bound of the limit.
+    :param max_limit: the upper bound of the limit.
+    :param tolerance: the ratio of latency to the long term average one which
+        is tolerated before shrinking the limit.
+    :param smoothing: the weight of each update of the limit.
+    :param window: number of RPCs the long term average latency is over.
+    :param backoff_ratio: the ratio the limit is multiplied by after an RPC
+        failed by overload.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        window: int = 600,
+        backoff_ratio: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.window = window
+        self.backoff_ratio = backoff_ratio
+        #: number of RPCs being served.
+        self.inflight = 0
+        #: number of the rejected RPCs.
+        self.rejected = 0
+        #: long term average latency in seconds.
+        self.average_latency = 0.0
+        self._lock = Lock()
+
+    def acquire(self) -> bool:
+        """Take a slot for an RPC, ``False`` if the limit is reached."""
+        with self._lock:
+            if self.inflight >= int(self.limit):
+                self.rejected += 1
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        """Free the slot of an RPC which took ``latency`` seconds, ``dropped``
+        if it failed by overload.
+        """
+        with self._lock:
+            inflight = self.inflight
+            self.inflight -= 1
+            if dropped:
+                self.limit = max(self.limit * self.backoff_ratio, self.min_limit)
+                return
+            if self.average_latency == 0.0:
+                self.average_latency = latency
+            else:
+                self.average_latency += (latency - self.average_latency) / self.window
+            # the latency says nothing about the limit when most of it is unused
+            if inflight * 2 < self.limit or latency <= 0.0:
+                return
+            gradient = max(
+                0.5, min(1.0, self.tolerance * self.average_latency / latency)
+            )
+            new_limit = self.limit * gradient + sqrt(self.limit)
+            self.limit = min(
+                max(
+                    self.limit * (1 - self.smoothing) + new_limit * self.smoothing,
+                    self.min_limit,
+                ),
+                self.max_limit,
+            )
+
+    def pushback_metadata(self) -> Tuple[Tuple[str, str], ...]:
+        """The trailing metadata of a rejected RPC, the clients are asked to
+        retry after about the average latency.
+        """
+        return (
+            (PUSHBACK_METADATA_KEY, str(max(round(self.average_latency * 1000), 1))),
+        )
+
+
+#: Details of the status sent when an RPC is shed for its deadline.
+DEADLINE_SHED_DETAILS = "Deadline is shorter than the latency of the method."
+
+
+class DeadlineShedder:
+    """Shed the RPCs of a gRPC method whose remaining time before the deadline
+    is shorter than the typical latency of the method, since nobody would
+    read their responses.
+
+    The typical latency is the exponentially weighted moving average of the
+    latency of the handled RPCs, failed or not. Every ``probe_interval``-th
+    RPC which would be shed is handled anyway as a probe, so that the typical
+    latency keeps following the method once it is faster than the deadlines
+    again.
+
+    :param ratio: RPCs are shed if their remaining time is shorter than
+        ``ratio`` times the typical latency.
+    :param smoothing: the weight of each RPC in the moving average.
+    :param probe_interval: one in ``probe_interval`` RPCs which would be shed
+        is handled.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self, ratio: float = 1.0, smoothing: float = 0.1, probe_interval: int = 20
+    ):
+        self.ratio = ratio
+        self.smoothing = smoothing
+        self.probe_interval = probe_interval
+        #: typical latency in seconds.
+        self.latency = 0.0
+        #: number of the shed RPCs.
+        self.shed = 0
+        self._would_shed = 0
+        self._lock = Lock()
+
+    def should_shed(self, time_remaining: Optional[float]) -> bool:
+        """Whether to shed an RPC with ``time_remaining`` seconds before its
+        deadline, ``None`` if it has no deadline.
+        """
+        if time_remaining is None or time_remaining >= self.latency * self.ratio:
+            return False
+        with self._lock:
+            self._would_shed += 1
+            if self._would_shed % self.probe_interval == 0:
+                return False
+            self.shed += 1
+        return True
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            if self.latency == 0.0:
+                self.latency = latency
+            else:
+                self.latency += (latency - self.latency) * self.smoothing
@@ -0,0 +1,447 @@
+from bisect import bisect_left
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import grpc
+
+if TYPE_CHECKING:  # pragma: no cover
+    from http.server import ThreadingHTTPServer
+
+    from .batch import Batcher
+    from .cache import ResponseCache, SingleFlight
+    from .executor import BoundedThreadPoolExecutor
+    from .limiter import AdaptiveLimiter, DeadlineShedder
+    from .stream import Prefetcher
+
+#: Upper bounds of the latency histogram buckets in seconds.
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_STATUS_CODE_NAMES: Dict[int, str] = {
+    code.value[0]: code.name for code in grpc.StatusCode
+}
+
+_GRPC_TYPES: Dict[Tuple[bool, bool], str] = {
+    (False, False): "unary",
+    (False, True): "server_stream",
+    (True, False): "client_stream",
+    (True, True): "bidi_stream",
+}
+
+
+def status_code_name(code) -> str:
+    """Name of a status code, which is a :class:`grpc.StatusCode` in the
+    synchronous server and an integer in ``grpc.aio``.
+    """
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    return _STATUS_CODE_NAMES.get(code, "UNKNOWN")
+
+
+def to_status_code(code) -> grpc.StatusCode:
+    """The :class:`grpc.StatusCode` of a status code returned by
+    ``context.code()``, see :func:`status_code_name`.
+    """
+    if isinstance(code, grpc.StatusCode):
+        return code
+    return grpc.StatusCode[_STATUS_CODE_NAMES.get(code, "UNKNOWN")]
+
+
+class MethodMetrics:
+    """Latency histogram and counters of a gRPC method.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        service: str,
+        method: str,
+        grpc_type: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.service = service
+        self.method = method
+        self.grpc_type = grpc_type
+        self.buckets = tuple(buckets)
+        self.started = 0
+        #: handled RPCs by the name of status code
+        self.handled: Dict[str, int] = {}
+        self.messages_received = 0
+        self.messages_sent = 0
+        # the last one is the ``+Inf`` bucket
+        self.bucket_counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.latency_sum = 0.0
+        self._lock = Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def observe(
+        self,
+        code: str,
+        latency: float,
+        messages_received: int,
+        messages_sent: int,
+    ) -> None:
+        with self._lock:
+            self.handled[code] = self.handled.get(code, 0) + 1
+            self.messages_received += messages_received
+            self.messages_sent += messages_sent
+            self.bucket_counts[bisect_left(self.buckets, latency)] += 1
+            self.latency_sum += latency
+
+
+class MetricsRegistry:
+    """Metrics of all the gRPC methods served by a server, keyed by the name of
+    service and method, which can be rendered in the Prometheus text format.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.methods: Dict[Tuple[str, str], MethodMetrics] = {}
+        self.executors: Dict[str, "BoundedThreadPoolExecutor"] = {}
+        self.limiters: Dict[Tuple[str, str], "AdaptiveLimiter"] = {}
+        self.shedders: Dict[Tuple[str, str], "DeadlineShedder"] = {}
+        self.caches: Dict[Tuple[str, str], "ResponseCache"] = {}
+        self.single_flights: Dict[Tuple[str, str], "SingleFlight"] = {}
+        self.batchers: Dict[Tuple[str, str], "Batcher"] = {}
+        self.prefetchers: Dict[Tuple[str, str], "Prefetcher"] = {}
+
+    def register(
+        self,
+        service: str,
+        method: str,
+        request_streaming: bool = False,
+        response_streaming: bool = False,
+    ) -> MethodMetrics:
+        key = (service, method)
+        if key not in self.methods:
+            self.methods[key] = MethodMetrics(
+                service,
+                method,
+                _GRPC_TYPES[(request_streaming, response_streaming)],
+                self.buckets,
+            )
+        return self.methods[key]
+
+    def register_executor(self, executor: "BoundedThreadPoolExecutor") -> None:
+        """Render the queue depth of ``executor`` with the methods' metrics."""
+        self.executors[executor.name] = executor
+
+    def register_limiter(
+        self, service: str, method: str, limiter: "AdaptiveLimiter"
+    ) -> None:
+        """Render the limit of ``limiter`` with the methods' metrics."""
+        self.limiters[(service, method)] = limiter
+
+    def register_shedder(
+        self, service: str, method: str, shedder: "DeadlineShedder"
+    ) -> None:
+        """Render the shed RPCs of ``shedder`` with the methods' metrics."""
+        self.shedders[(service, method)] = shedder
+
+    def register_cache(self, service: str, method: str, cache: "ResponseCache") -> None:
+        """Render the stats of ``cache`` with the methods' metrics."""
+        self.caches[(service, method)] = cache
+
+    def register_single_flight(
+        self, service: str, method: str, single_flight: "SingleFlight"
+    ) -> None:
+        """Render the stats of ``single_flight`` with the methods' metrics."""
+        self.single_flights[(service, method)] = single_flight
+
+    def register_batcher(self, service: str, method: str, batcher: "Batcher") -> None:
+        """Render the stats of ``batcher`` with the methods' metrics."""
+        self.batchers[(service, method)] = batcher
+
+    def register_prefetcher(
+        self, service: str, method: str, prefetcher: "Prefetcher"
+    ) -> None:
+        """Render the stats of ``prefetcher`` with the methods' metrics."""
+        self.prefetchers[(service, method)] = prefetcher
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, metric_type: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        def labels(metrics: MethodMetrics, **extra: str) -> str:
+            pairs = [
+                ("grpc_type", metrics.grpc_type),
+                ("grpc_service", metrics.service),
+                ("grpc_method", metrics.method),
+                *extra.items(),
+            ]
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        def method_labels(key: Tuple[str, str]) -> str:
+            return f'{{grpc_service="{key[0]}",grpc_method="{key[1]}"}}'
+
+        methods = sorted(self.methods.values(), key=lambda m: (m.service, m.method))
+        family(
+            "grpc_server_started_total",
+            "counter",
+            "Total number of RPCs started on the server.",
+        )
+        for m in methods:
+            lines.append(f"grpc_server_started_total{labels(m)} {m.started}")
+        family(
+            "grpc_server_handled_total",
+            "counter",
+            "Total number of RPCs completed on the server, regardless of success or failure.",
+        )
+        for m in methods:
+            for code, handled in sorted(dict(m.handled).items()):
+                lines.append(
+                    f"grpc_server_handled_total{labels(m, grpc_code=code)} {handled}"
+                )
+        family(
+            "grpc_server_msg_received_total",
+            "counter",
+            "Total number of RPC stream messages received on the server.",
+        )
+        for m in methods:
+            lines.append(
+                f"grpc_server_msg_received_total{labels(m)} {m.messages_received}"
+            )
+        family(
+            "grpc_server_msg_sent_total",
+            "counter",
+            "Total number of gRPC stream messages sent by the server.",
+        )
+        for m in methods:
+            lines.append(f"grpc_server_msg_sent_total{labels(m)} {m.messages_sent}")
+        family(
+            "grpc_server_handling_seconds",
+            "histogram",
+            "Histogram of response latency (seconds) of gRPC that had been application-level handled by the server.",
+        )
+        for m in methods:
+            cumulative = 0
+            for bound, bucket_count in zip(
+                m.buckets + (float("inf"),), m.bucket_counts
+            ):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"grpc_server_handling_seconds_bucket{labels(m, le=le)} {cumulative}"
+                )
+            lines.append(f"grpc_server_handling_seconds_sum{labels(m)} {m.latency_sum}")
+            lines.append(f"grpc_server_handling_seconds_count{labels(m)} {cumulative}")
+        if self.executors:
+            executors = sorted(self.executors.items())
+            family(
+                "grpcalchemy_executor_queue_depth",
+                "gauge",
+                "Number of RPCs waiting for a thread of the executor.",
+            )
+            for name, executor in executors:
+                lines.append(
+                    f'grpcalchemy_executor_queue_depth{{executor="{name}"}} {executor.queue_depth}'
+                )
+            family(
+                "grpcalchemy_executor_max_workers",
+                "gauge",
+                "Number of threads of the executor.",
+            )
+            for name, executor in executors:
+                lines.append(
+                    f'grpcalchemy_executor_max_workers{{executor="{name}"}} {executor.max_workers}'
+                )
+            family(
+                "grpcalchemy_executor_rejected_total",
+                "counter",
+                "Total number of RPCs rejected by the full executor.",
+            )
+            for name, executor in executors:
+                lines.append(
+                    f'grpcalchemy_executor_rejected_total{{executor="{name}"}} {executor.rejected}'
+                )
+        if self.limiters:
+            limiters = sorted(self.limiters.items())
+            family(
+                "grpcalchemy_limiter_limit",
+                "gauge",
+                "Concurrency limit of the method adapted to its latency.",
+            )
+            for key, limiter in limiters:
+                lines.append(
+                    f"grpcalchemy_limiter_limit{method_labels(key)} {int(limiter.limit)}"
+                )
+            family(
+                "grpcalchemy_limiter_inflight",
+                "gauge",
+                "Number of RPCs of the method being served.",
+            )
+            for key, limiter in limiters:
+                lines.append(
+                    f"grpcalchemy_limiter_inflight{method_labels(key)} {limiter.inflight}"
+                )
+            family(
+                "grpcalchemy_limiter_rejected_total",
+                "counter",
+                "Total number of RPCs rejected by the limiter of the method.",
+            )
+            for key, limiter in limiters:
+                lines.append(
+                    f"grpcalchemy_limiter_rejected_total{method_labels(key)} {limiter.rejected}"
+                )
+        if self.shedders:
+            family(
+                "grpcalchemy_deadline_shed_total",
+                "counter",
+                "Total number of RPCs shed for a deadline shorter than the latency of the method.",
+            )
+            for key, shedder in sorted(self.shedders.items()):
+                lines.append(
+                    f"grpcalchemy_deadline_shed_total{method_labels(key)} {shedder.shed}"
+                )
+        if self.caches:
+            caches = sorted(self.caches.items())
+            for name, help_text, attr in (
+                (
+                    "grpcalchemy_cache_hits_total",
+                    "Total number of RPCs served from the response cache.",
+                    "hits",
+                ),
+                (
+                    "grpcalchemy_cache_misses_total",
+                    "Total number of RPCs missed in the response cache.",
+                    "misses",
+                ),
+                (
+                    "grpcalchemy_cache_evictions_total",
+                    "Total number of responses evicted from the full response cache.",
+                    "evictions",
+                ),
+            ):
+                family(name, "counter", help_text)
+                for key, cache in caches:
+                    lines.append(f"{name}{method_labels(key)} {getattr(cache, attr)}")
+            family(
+                "grpcalchemy_cache_bytes",
+                "gauge",
+                "Total size of the responses in the response cache.",
+            )
+            for key, cache in caches:
+                lines.append(
+                    f"grpcalchemy_cache_bytes{method_labels(key)} {cache.bytes}"
+                )
+        if self.single_flights:
+            single_flights = sorted(self.single_flights.items())
+            family(
+                "grpcalchemy_single_flight_executions_total",
+                "counter",
+                "Total number of RPCs which ran the method for the identical concurrent RPCs.",
+            )
+            for key, single_flight in single_flights:
+                lines.append(
+                    f"grpcalchemy_single_flight_executions_total{method_labels(key)} {single_flight.executions}"
+                )
+            family(
+                "grpcalchemy_single_flight_coalesced_total",
+                "counter",
+                "Total number of RPCs which shared the response of an identical concurrent RPC.",
+            )
+            for key, single_flight in single_flights:
+                lines.append(
+                    f"grpcalchemy_single_flight_coalesced_total{method_labels(key)} {single_flight.coalesced}"
+                )
+        if self.batchers:
+            batchers = sorted(self.batchers.items())
+            for name, attr, help_text in (
+                ("batches_total", "batches", "Total number of batches handled."),
+                (
+                    "batched_requests_total",
+                    "batched",
+                    "Total number of requests in the batches.",
+                ),
+                (
+                    "batch_expired_total",
+                    "expired",
+                    "Total number of requests expired before their batch.",
+                ),
+            ):
+                family(f"grpcalchemy_{name}", "counter", help_text)
+                for key, batcher in batchers:
+                    lines.append(
+                        f"grpcalchemy_{name}{method_labels(key)} {getattr(batcher, attr)}"
+                    )
+        if self.prefetchers:
+            prefetchers = sorted(self.prefetchers.items())
+            family(
+                "grpcalchemy_prefetch_queue_occupancy",
+                "gauge",
+                "Number of the streaming responses produced and not sent yet.",
+            )
+            for key, prefetcher in prefetchers:
+                lines.append(
+                    f"grpcalchemy_prefetch_queue_occupancy{method_labels(key)} {prefetcher.occupancy}"
+                )
+            family(
+                "grpcalchemy_prefetch_blocked_seconds_total",
+                "counter",
+                "Total seconds the method was blocked by the clients reading the responses.",
+            )
+            for key, prefetcher in prefetchers:
+                lines.append(
+                    f"grpcalchemy_prefetch_blocked_seconds_total{method_labels(key)} {prefetcher.blocked_seconds}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(
+    registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 0
+) -> "ThreadingHTTPServer":
+    """Serve the metrics of ``registry`` as Prometheus text on
+    ``http://{host}:{port}/metrics`` in a daemon thread.
+
+    .. versionadded:: 0.8.0
+    """
+    # only imported once the metrics are served
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_metrics_server(server: Optional["ThreadingHTTPServer"]) -> None:
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -1,6 +1,14 @@
+import json
+import sys
+from array import array
+from base64 import b64encode
 from itertools import chain
+from keyword import iskeyword
+from math import copysign
 from typing import (
+    Callable,
     Dict,
+    List,
     Iterator,
     Tuple,
     Type,
@@ -10,9 +18,15 @@ from typing import (
     Any,
     Iterable,
     Set,
+    Optional,
+    Sequence,
+    Union,
 )
 
-from google.protobuf.json_format import MessageToDict, MessageToJson
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.internal import api_implementation
+from google.protobuf.internal.type_checkers import ToShortestFloat
+from google.protobuf.json_format import MessageToDict
 from google.protobuf.message import Message as GeneratedProtocolMessageType
 
 from .meta import __meta__
@@ -26,6 +40,8 @@ _missing_factory = lambda: _missing
 class DeclarativeMeta(type):
     def __new__(cls, clsname: str, bases: Tuple, clsdict: dict):
         if bases:
+            # keep every wrapper a single-pointer object without ``__dict__``
+            clsdict.setdefault("__slots__", ())
             clsdict["__meta__"] = {}
             clsdict["__type_name__"] = clsname
 
@@ -59,6 +75,12 @@ class DeclarativeMeta(type):
                         )
                 clsdict["__meta__"][key] = field
                 clsdict[key] = field
+            if "__init__" not in clsdict and all(
+                _is_generated_init(getattr(base, "__init__"))
+                for base in bases
+                if isinstance(base, DeclarativeMeta)
+            ):
+                clsdict["__init__"] = _make_init(clsname, clsdict["__meta__"])
             MessageCls = super().__new__(cls, clsname, bases, clsdict)
             file_name = getattr(MessageCls, "__filename__", clsname.lower())
             setattr(MessageCls, "__filename__", file_name)
@@ -78,6 +100,7 @@ class _gRPCMessageClass(GeneratedProtocolMessageType):
 
 
 class Message(metaclass=DeclarativeMeta):
+    __slots__ = ("__message__",)
     __meta__: Dict[str, "BaseField"] = {}
 
     gRPCMessageClass: Type = _gRPCMessageClass
@@ -108,6 +131,152 @@ class Message(metaclass=DeclarativeMeta):
     def init_grpc_message(self, grpc_message: GeneratedProtocolMessageType):
         self.__message__ = grpc_message
 
+    @classmethod
+    def from_grpc_message(cls, grpc_message: GeneratedProtocolMessageType):
+        """Wrap the deserialized gRPC message directly, without constructing and
+        discarding an empty one in :meth:`__init__`.
+
+        #: .. versionadded:: 0.8.0
+        """
+        message = cls.__new__(cls)
+        message.__message__ = grpc_message
+        return message
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Parse the serialized message, e.g. the request of a gRPC method in
+        raw mode.
+
+        #: .. versionadded:: 0.8.0
+        """
+        return cls.from_grpc_message(cls.gRPCMessageClass.FromString(data))
+
+    @classmethod
+    def from_lazy_bytes(cls, data: bytes):
+        """Wrap the serialized message, which is only parsed on the first access
+        of its gRPC message, e.g. by reading a field. Until then,
+        :meth:`to_bytes` returns ``data`` as it is.
+
+        #: .. versionadded:: 0.8.0
+        """
+        lazy_cls = cls.__dict__.get("__lazy_class__")
+        if lazy_cls is None:
+            lazy_cls = _make_lazy_class(cls)
+        message = lazy_cls.__new__(lazy_cls)
+        message.__data__ = data
+        return message
+
+    def to_bytes(self) -> bytes:
+        """Serialize the message, e.g. the response of a gRPC method in raw mode.
+
+        #: .. versionadded:: 0.8.0
+        """
+        return self.__message__.SerializeToString()
+
+    def set_array(self, name: str, values: Any) -> None:
+        """Replace the values of the repeated numeric field ``name`` with
+        ``values`` in bulk, which is a NumPy array, an :class:`array.array` or
+        any sequence of numbers.
+
+        The values of float and double fields are copied into the gRPC message
+        as a single packed field, without converting each of them to a Python
+        object.
+
+        #: .. versionadded:: 0.8.0
+        """
+        descriptor = _get_array_field(self.__message__, name)
+        typecode, dtype, wire_type = _ARRAY_TYPES[descriptor.type]
+        field = getattr(self.__message__, name)
+        del field[:]
+        if wire_type == _WIRE_TYPE_VARINT or not _PACKED_MERGE:
+            field.extend(values.tolist() if hasattr(values, "tolist") else values)
+            return
+        data = _to_little_endian_bytes(values, typecode, dtype)
+        self.__message__.MergeFromString(
+            b"".join(
+                (
+                    _encode_varint(descriptor.number << 3 | _WIRE_TYPE_PACKED),
+                    _encode_varint(len(data)),
+                    data,
+                )
+            )
+        )
+
+    def get_array(self, name: str) -> array:
+        """The values of the repeated numeric field ``name`` as an
+        :class:`array.array`.
+
+        #: .. versionadded:: 0.8.0
+        """
+        descriptor = _get_array_field(self.__message__, name)
+        typecode, _, _ = _ARRAY_TYPES[descriptor.type]
+        data = _get_packed_data(self.__message__, descriptor)
+        if data is None:
+            return array(typecode, getattr(self.__message__, name))
+        values = array(typecode)
+        values.frombytes(data)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def get_ndarray(self, name: str) -> Any:
+        """The values of the repeated numeric field ``name`` as a NumPy array,
+        which requires NumPy to be installed.
+
+        #: .. versionadded:: 0.8.0
+        """
+        import numpy
+
+        descriptor = _get_array_field(self.__message__, name)
+        _, dtype, _ = _ARRAY_TYPES[descriptor.type]
+        data = _get_packed_data(self.__message__, descriptor)
+        if data is None:
+            field = getattr(self.__message__, name)
+            return numpy.fromiter(field, dtype, count=len(field))
+        return numpy.frombuffer(data, dtype)
+
+    def add_rows(
+        self,
+        name: str,
+        rows: Iterable[Sequence],
+        fields: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Append a message to the repeated message field ``name`` for each of
+        ``rows``, which are the values of ``fields``, or of all the fields of
+        the message in the order they are declared.
+
+        The messages are filled directly in the gRPC message, without a
+        :class:`Message` wrapping each of them.
+
+        #: .. versionadded:: 0.8.0
+        """
+        field = self.__meta__.get(name)
+        if not isinstance(field, RepeatedField) or not isinstance(
+            field.__key_type__, ReferenceField
+        ):
+            raise TypeError(f"{name} is not a repeated message field.")
+        message_cls = field.__key_type__.type
+        keys = tuple(message_cls.__meta__ if fields is None else fields)
+        if hasattr(rows, "tolist"):
+            # a two-dimensional NumPy array
+            rows = rows.tolist()  # type: ignore
+        _get_add_rows(message_cls, keys)(getattr(self.__message__, name).add, rows)
+
+    def add_columns(self, name: str, columns: Dict[str, Sequence]) -> None:
+        """Append a message to the repeated message field ``name`` for each
+        row of ``columns``, which map the names of fields to the sequences of
+        their values, e.g. lists or NumPy arrays.
+
+        #: .. versionadded:: 0.8.0
+        """
+        values = [
+            column.tolist() if hasattr(column, "tolist") else column
+            for column in columns.values()
+        ]
+        if len({len(column) for column in values}) > 1:
+            raise ValueError("The columns have different lengths.")
+        self.add_rows(name, zip(*values), tuple(columns))
+
     def message_to_dict(
         self,
         *,
@@ -133,13 +302,25 @@ class Message(metaclass=DeclarativeMeta):
           A dict representation of the protocol buffer message.
 
         #: .. versionadded:: 0.1.7
+
+        .. versionchanged:: 0.8.0
+            Converted by a function generated for the message class from its
+            fields, ``json_format`` is only used for the field types which the
+            ORM doesn't model.
         """
-        return MessageToDict(
-            self.__message__,
-            including_default_value_fields=including_default_value_fields,
-            preserving_proto_field_name=preserving_proto_field_name,
-            use_integers_for_enums=use_integers_for_enums,
+        to_dict = _get_to_dict(
+            self.__class__,
+            including_default_value_fields,
+            preserving_proto_field_name,
         )
+        if to_dict is None:
+            return MessageToDict(
+                self.__message__,
+                including_default_value_fields=including_default_value_fields,
+                preserving_proto_field_name=preserving_proto_field_name,
+                use_integers_for_enums=use_integers_for_enums,
+            )
+        return to_dict(self.__message__)
 
     def message_to_json(
         self,
@@ -170,13 +351,14 @@ class Message(metaclass=DeclarativeMeta):
 
         #: .. versionadded:: 0.1.7
         """
-        return MessageToJson(
-            self.__message__,
-            including_default_value_fields=including_default_value_fields,
-            preserving_proto_field_name=preserving_proto_field_name,
+        return json.dumps(
+            self.message_to_dict(
+                including_default_value_fields=including_default_value_fields,
+                preserving_proto_field_name=preserving_proto_field_name,
+                use_integers_for_enums=use_integers_for_enums,
+            ),
             indent=indent,
             sort_keys=sort_keys,
-            use_integers_for_enums=use_integers_for_enums,
         )
 
     @classmethod
@@ -186,6 +368,386 @@ class Message(metaclass=DeclarativeMeta):
 
 M = TypeVar("M", bound=Message)
 
+_message_slot: Any = Message.__dict__["__message__"]
+
+
+def _is_generated_init(init: Callable) -> bool:
+    return init is Message.__init__ or getattr(init, "__generated__", False)
+
+
+def _unwrap_expression(
+    field: "BaseField", value: str, i: int, namespace: Dict[str, Any]
+) -> Optional[str]:
+    """The expression unwrapping the messages of reference fields in the
+    ``value`` of ``field``, or ``None`` if the value is passed straight to the
+    gRPC message.
+    """
+    if isinstance(field, ReferenceField):
+        reference = field
+        unwrap = (
+            "{value}.__message__ if {value}.__class__ is _cls{i} else _to{i}({value})"
+        )
+    elif isinstance(field, RepeatedField) and isinstance(
+        field.__key_type__, ReferenceField
+    ):
+        reference = field.__key_type__
+        unwrap = (
+            "[v.__message__ if v.__class__ is _cls{i} else _to{i}(v) for v in {value}]"
+        )
+    elif isinstance(field, MapField) and isinstance(
+        field.__value_type__, ReferenceField
+    ):
+        reference = field.__value_type__
+        unwrap = "{{k: v.__message__ if v.__class__ is _cls{i} else _to{i}(v) for k, v in {value}.items()}}"
+    else:
+        return None
+    namespace[f"_cls{i}"] = reference.type
+    namespace[f"_to{i}"] = reference.to_message_field
+    return unwrap.format(value=value, i=i)
+
+
+def _make_init(clsname: str, meta: Dict[str, "BaseField"]) -> Callable:
+    """Generate the ``__init__`` of a message class: the values of scalar,
+    repeated scalar and map scalar fields are passed straight to the gRPC
+    message, and the messages of reference fields are unwrapped inline.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = ["def __init__(__message_self__, **kwargs):"]
+    for i, (key, field) in enumerate(meta.items()):
+        unwrap = _unwrap_expression(field, "value", i, namespace)
+        if unwrap is None:
+            continue
+        lines.append(f"    if {key!r} in kwargs:")
+        lines.append(f"        value = kwargs[{key!r}]")
+        lines.append(f"        kwargs[{key!r}] = {unwrap}")
+    lines.append(
+        "    __message_self__.__message__ = __message_self__.gRPCMessageClass(**kwargs)"
+    )
+    exec("\n".join(lines), namespace)
+    init = namespace["__init__"]
+    init.__qualname__ = f"{clsname}.__init__"
+    init.__generated__ = True
+    return init
+
+
+def _get_add_rows(cls: Type[Message], keys: Tuple[str, ...]) -> Callable:
+    add_rows_functions = cls.__dict__.get("__add_rows__")
+    if add_rows_functions is None:
+        add_rows_functions = {}
+        setattr(cls, "__add_rows__", add_rows_functions)
+    if keys not in add_rows_functions:
+        add_rows_functions[keys] = _make_add_rows(cls, keys)
+    return add_rows_functions[keys]
+
+
+def _make_add_rows(cls: Type[Message], keys: Tuple[str, ...]) -> Callable:
+    """Generate the function adding a gRPC message of a message class per row
+    of the values of ``keys`` to a repeated field: the values of scalar fields
+    are set as attributes unless they are ``None``, like the fields passed as
+    ``None`` to :meth:`Message.__init__`, and the others are passed to ``add``.
+    """
+    namespace: Dict[str, Any] = {}
+    targets = []
+    arguments = []
+    attributes = []
+    for i, key in enumerate(keys):
+        field = cls.__meta__.get(key)
+        if field is None:
+            raise ValueError(f"{key} is not a field of {cls.__name__}.")
+        value = f"_{i}"
+        targets.append(value)
+        if isinstance(field, (ReferenceField, RepeatedField, MapField)):
+            unwrap = _unwrap_expression(field, value, i, namespace) or value
+            if iskeyword(key):
+                arguments.append(f"**{{{key!r}: {unwrap}}}")
+            else:
+                arguments.append(f"{key}={unwrap}")
+        else:
+            if iskeyword(key):
+                setter = f"setattr(m, {key!r}, {value})"
+            else:
+                setter = f"m.{key} = {value}"
+            attributes.append(f"if {value} is not None: {setter}")
+    target = ", ".join(targets) + ("," if len(targets) == 1 else "")
+    lines = [
+        "def add_rows(add, rows):",
+        f"    for ({target}) in rows:",
+        f"        m = add({', '.join(arguments)})",
+    ]
+    lines.extend(f"        {attribute}" for attribute in attributes)
+    exec("\n".join(lines), namespace)
+    add_rows = namespace["add_rows"]
+    add_rows.__qualname__ = f"{cls.__qualname__}.add_rows"
+    return add_rows
+
+
+def _nonfinite_to_json(value: float) -> str:
+    if value != value:
+        return "NaN"
+    return "Infinity" if value > 0 else "-Infinity"
+
+
+def _float_to_json(value: float) -> Any:
+    if value - value == 0:
+        # the shortest float with the same value in 4 bytes
+        return ToShortestFloat(value)
+    return _nonfinite_to_json(value)
+
+
+# the JSON value of each scalar type, as in ``json_format``
+_JSON_SCALARS: Dict[str, str] = {
+    "string": "{0}",
+    "bytes": "_b64encode({0}).decode()",
+    "bool": "{0}",
+    "int32": "{0}",
+    "int64": "str({0})",
+    "float": "_float_to_json({0})",
+    "double": "{0} if {0} - {0} == 0 else _nonfinite_to_json({0})",
+}
+
+
+def _get_to_dict(
+    cls: Type[Message],
+    including_default_value_fields: bool,
+    preserving_proto_field_name: bool,
+) -> Optional[Callable]:
+    converters = cls.__dict__.get("__to_dict__")
+    if converters is None:
+        converters = {}
+        setattr(cls, "__to_dict__", converters)
+    options = (including_default_value_fields, preserving_proto_field_name)
+    if options not in converters:
+        converters[options] = _make_to_dict(cls, *options)
+    return converters[options]
+
+
+def _make_to_dict(
+    cls: Type[Message],
+    including_default_value_fields: bool,
+    preserving_proto_field_name: bool,
+) -> Optional[Callable]:
+    """Generate the function converting the gRPC message of a message class to
+    the dictionary of ``json_format``, or ``None`` if one of its fields has a
+    type not modeled by the ORM.
+    """
+    namespace: Dict[str, Any] = {
+        "_b64encode": b64encode,
+        "_copysign": copysign,
+        "_float_to_json": _float_to_json,
+        "_nonfinite_to_json": _nonfinite_to_json,
+    }
+
+    def to_json(field: BaseField, value: str, i: int) -> Optional[str]:
+        if isinstance(field, ReferenceField):
+            to_dict = _get_to_dict(
+                field.type, including_default_value_fields, preserving_proto_field_name
+            )
+            if to_dict is None:
+                return None
+            namespace[f"_to_dict{i}"] = to_dict
+            return f"_to_dict{i}({value})"
+        template = _JSON_SCALARS.get(field.__type_name__)
+        return None if template is None else template.format(value)
+
+    fields_by_name = cls.gRPCMessageClass.DESCRIPTOR.fields_by_name
+    lines = ["def to_dict(m):", "    d = {}"]
+    # the unset fields follow the set ones, as the keys of ``json_format``
+    defaults: List[str] = []
+    for i, (key, field) in enumerate(cls.__meta__.items()):
+        name = key if preserving_proto_field_name else fields_by_name[key].json_name
+        read = f"v = getattr(m, {key!r})" if iskeyword(key) else f"v = m.{key}"
+        lines.append(f"    {read}")
+        if isinstance(field, ReferenceField):
+            value = to_json(field, "v", i)
+            # singular message fields are only present once set
+            condition = f"m.HasField({key!r})"
+        elif isinstance(field, RepeatedField):
+            value = to_json(field.__key_type__, "x", i)
+            if value is not None:
+                value = "list(v)" if value == "x" else f"[{value} for x in v]"
+            condition = "v"
+        elif isinstance(field, MapField):
+            if field.__type_name__ == "bool":
+                map_key: Optional[str] = '"true" if k else "false"'
+            elif field.__type_name__ == "string":
+                map_key = "k"
+            else:
+                map_key = "str(k)" if field.__type_name__ in _JSON_SCALARS else None
+            value = to_json(field.__value_type__, "x", i)
+            if map_key is None or value is None:
+                value = None
+            elif map_key == "k" and value == "x":
+                value = "dict(v)"
+            else:
+                value = f"{{{map_key}: {value} for k, x in v.items()}}"
+            condition = "v"
+        else:
+            value = to_json(field, "v", i)
+            # negative zero is set, but falsy
+            condition = (
+                "v or _copysign(1.0, v) < 0"
+                if field.__type_name__ in ("float", "double")
+                else "v"
+            )
+        if value is None:
+            return None
+        lines.append(f"    if {condition}:")
+        lines.append(f"        d[{name!r}] = {value}")
+        if including_default_value_fields and not isinstance(field, ReferenceField):
+            defaults.append(f"    if {name!r} not in d:")
+            defaults.append(f"        {read}")
+            defaults.append(f"        d[{name!r}] = {value}")
+    lines.extend(defaults)
+    lines.append("    return d")
+    exec("\n".join(lines), namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    return to_dict
+
+
+def _get_lazy_message(self: Any) -> GeneratedProtocolMessageType:
+    try:
+        return _message_slot.__get__(self)
+    except AttributeError:
+        grpc_message = self.gRPCMessageClass.FromString(self.__data__)
+        _message_slot.__set__(self, grpc_message)
+        return grpc_message
+
+
+def _lazy_to_bytes(self: Any) -> bytes:
+    try:
+        grpc_message = _message_slot.__get__(self)
+    except AttributeError:
+        return self.__data__
+    return grpc_message.SerializeToString()
+
+
+def _make_lazy_class(cls: Type[Message]) -> Type[Message]:
+    """The subclass of ``cls`` whose gRPC message is parsed on demand, it is
+    created without :class:`DeclarativeMeta` so that it is not part of the
+    proto files.
+    """
+    lazy_cls: Type[Message] = type.__new__(  # type: ignore
+        DeclarativeMeta,
+        cls.__name__,
+        (cls,),
+        {
+            "__slots__": ("__data__",),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__message__": property(_get_lazy_message, _message_slot.__set__),
+            "to_bytes": _lazy_to_bytes,
+        },
+    )
+    setattr(cls, "__lazy_class__", lazy_cls)
+    return lazy_cls
+
+
+_WIRE_TYPE_VARINT = 0
+_WIRE_TYPE_FIXED64 = 1
+_WIRE_TYPE_PACKED = 2
+_WIRE_TYPE_FIXED32 = 5
+
+# typecode of array.array, dtype of NumPy and wire type of each numeric field
+_ARRAY_TYPES: Dict[int, Tuple[str, str, int]] = {
+    FieldDescriptor.TYPE_DOUBLE: ("d", "<f8", _WIRE_TYPE_FIXED64),
+    FieldDescriptor.TYPE_FLOAT: ("f", "<f4", _WIRE_TYPE_FIXED32),
+    FieldDescriptor.TYPE_INT32: ("i", "<i4", _WIRE_TYPE_VARINT),
+    FieldDescriptor.TYPE_INT64: ("q", "<i8", _WIRE_TYPE_VARINT),
+    FieldDescriptor.TYPE_BOOL: ("B", "?", _WIRE_TYPE_VARINT),
+}
+
+# merging serialized fields is only faster than extending the repeated fields
+# with the C implementations of protobuf
+_PACKED_MERGE = api_implementation.Type() != "python"
+
+
+def _get_array_field(
+    grpc_message: GeneratedProtocolMessageType, name: str
+) -> FieldDescriptor:
+    descriptor = grpc_message.DESCRIPTOR.fields_by_name.get(name)
+    if (
+        descriptor is None
+        or descriptor.label != FieldDescriptor.LABEL_REPEATED
+        or descriptor.type not in _ARRAY_TYPES
+    ):
+        raise TypeError(f"{name} is not a repeated numeric field.")
+    return descriptor
+
+
+def _encode_varint(value: int) -> bytes:
+    data = bytearray()
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _to_little_endian_bytes(values: Any, typecode: str, dtype: str) -> Any:
+    if hasattr(values, "astype"):
+        # a NumPy array, converted only if its dtype or layout differs
+        return memoryview(values.astype(dtype, order="C", copy=False)).cast("B")
+    try:
+        view: Optional[memoryview] = memoryview(values)
+    except TypeError:
+        view = None
+    if (
+        view is not None
+        and view.format in (typecode, "<" + typecode, "=" + typecode)
+        and view.c_contiguous
+        and sys.byteorder == "little"
+    ):
+        return view.cast("B")
+    converted = array(typecode, values)
+    if sys.byteorder != "little":
+        converted.byteswap()
+    return memoryview(converted).cast("B")
+
+
+def _get_packed_data(
+    grpc_message: GeneratedProtocolMessageType, descriptor: FieldDescriptor
+) -> Optional[Union[bytes, bytearray]]:
+    """The little-endian values of the float or double field from the
+    serialized ``grpc_message``, or ``None`` if they have to be read one by one.
+    """
+    if _ARRAY_TYPES[descriptor.type][2] == _WIRE_TYPE_VARINT or not _PACKED_MERGE:
+        return None
+    data = grpc_message.SerializeToString()
+    view = memoryview(data)
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        key, pos = _decode_varint(data, pos)
+        wire_type = key & 7
+        if wire_type == _WIRE_TYPE_VARINT:
+            _, pos = _decode_varint(data, pos)
+            continue
+        if wire_type == _WIRE_TYPE_PACKED:
+            size, pos = _decode_varint(data, pos)
+        elif wire_type == _WIRE_TYPE_FIXED64:
+            size = 8
+        elif wire_type == _WIRE_TYPE_FIXED32:
+            size = 4
+        else:
+            # groups of unknown fields
+            return None
+        if key >> 3 == descriptor.number:
+            chunks.append(view[pos : pos + size])
+        pos += size
+    return bytearray().join(chunks)
+
 
 class BaseField:
     __type_name__: str = ""
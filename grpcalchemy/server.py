@@ -1,13 +1,24 @@
+import asyncio
 import logging
 import multiprocessing
+import signal
 import socket
 import sys
-import time
 from concurrent import futures
-from threading import Event
-from typing import Callable, Dict, Optional, Tuple, Type, ContextManager, List
+from threading import Event, Thread, current_thread, main_thread
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    ContextManager,
+    List,
+    TYPE_CHECKING,
+)
 
 import grpc
+import grpc.aio
 from grpc import GenericRpcHandler
 from grpc import __version__ as GRPC_VERSION
 from grpc._cython import cygrpc
@@ -18,22 +29,46 @@ from grpc._server import (
     _stop,
     _validate_generic_rpc_handlers,
 )
-from grpc_health.v1 import health
-from grpc_health.v1 import health_pb2_grpc
-from grpc_reflection.v1alpha import reflection
 
-from grpcalchemy.blueprint import Blueprint, RequestType, ResponseType, Context
+from grpcalchemy.blueprint import (
+    Blueprint,
+    RequestType,
+    ResponseType,
+    Context,
+    default_hook,
+    gRPCMethodsType,
+)
 from grpcalchemy.config import DefaultConfig
+from grpcalchemy.executor import BoundedThreadPoolExecutor
+from grpcalchemy.limiter import AdaptiveLimiter, DeadlineShedder
+from grpcalchemy.metrics import (
+    MetricsRegistry,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from grpcalchemy.supervisor import WorkerSupervisor
 from grpcalchemy.utils import (
+    ProtoGenerationReport,
+    build_proto_in_memory,
     generate_proto_file,
+    in_memory_descriptor_pool,
+    load_proto_manifest,
+    write_proto_manifest,
     socket_bind_test,
     select_address_family,
     get_sockaddr,
     add_blueprint_to_server,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from http.server import ThreadingHTTPServer
+    from grpc_health.v1 import health_pb2_grpc
+
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 
+#: The signals which make a blocking server stop gracefully.
+GRACEFUL_STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
 
 class Server(Blueprint, grpc.Server):
     """The Server object implements a base application and acts as the central
@@ -55,6 +90,17 @@ class Server(Blueprint, grpc.Server):
     #: .. versionadded:: 0.6.0
     workers: List[multiprocessing.Process] = []
 
+    #: Supervisor of the worker processes, which respawns the exited ones.
+    #:
+    #: .. versionadded:: 0.8.0
+    supervisor: Optional[WorkerSupervisor] = None
+
+    #: Whether the synchronous gRPC methods can run in the thread pools
+    #: dedicated to them or their blueprints, see :attr:`Blueprint.max_workers`.
+    #:
+    #: .. versionadded:: 0.8.0
+    dedicated_thread_pools = True
+
     def __init__(self, config: DefaultConfig):
         self.config: DefaultConfig = config
 
@@ -66,8 +112,50 @@ class Server(Blueprint, grpc.Server):
         self.logger.setLevel(self.config.GRPC_ALCHEMY_LOGGER_LEVEL)
         self.logger.addHandler(handler)
 
+        self._init_server()
+
+        #: Health checking servicer, only set if ``GRPC_HEALTH_CHECKING_ENABLE``.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.health_servicer: Optional["health_pb2_grpc.HealthServicer"] = None
+
+        #: Metrics of the gRPC methods, only set if ``GRPC_METRICS_ENABLE``.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.metrics: Optional[MetricsRegistry] = (
+            MetricsRegistry() if self.config.GRPC_METRICS_ENABLE else None
+        )
+        self._metrics_server: Optional["ThreadingHTTPServer"] = None
+
+        #: the thread pools dedicated to blueprints or gRPC methods.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.executors: List[BoundedThreadPoolExecutor] = []
+
+        #: the adaptive limiters of gRPC methods by the name of service and method.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+
+        #: the deadline shedders of gRPC methods by the name of service and method.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.shedders: Dict[Tuple[str, str], DeadlineShedder] = {}
+
+        #: all the attached blueprints in a dictionary by name.
+        #:
+        #: .. versionadded:: 0.1.6
+        self.blueprints: Dict[str, Blueprint] = {self.access_service_name(): self}
+
+        super().__init__()
+        self.current_app = self
+
+    def _init_server(self) -> None:
         self.logger.info(f"workers number: {self.config.GRPC_SERVER_MAX_WORKERS}")
-        thread_pool = futures.ThreadPoolExecutor(
+        #: Thread pool of the gRPC methods without a dedicated one.
+        #:
+        #: .. versionadded:: 0.8.0
+        self.thread_pool = thread_pool = futures.ThreadPoolExecutor(
             max_workers=self.config.GRPC_SERVER_MAX_WORKERS
         )
         completion_queue = cygrpc.CompletionQueue()
@@ -92,14 +180,6 @@ class Server(Blueprint, grpc.Server):
             self.config.GRPC_SERVER_MAXIMUM_CONCURRENT_RPCS,
         )
 
-        #: all the attached blueprints in a dictionary by name.
-        #:
-        #: .. versionadded:: 0.1.6
-        self.blueprints: Dict[str, Blueprint] = {self.access_service_name(): self}
-
-        super().__init__()
-        self.current_app = self
-
     def register_blueprint(self, bp_cls: Type[Blueprint]) -> None:
         """
         all the gRPC service register in a dictionary by service name.
@@ -111,13 +191,76 @@ class Server(Blueprint, grpc.Server):
         self.blueprints[bp.access_service_name()] = bp
 
     @classmethod
-    def generate_proto_file(cls, config: DefaultConfig):
-        generate_proto_file(
+    def generate_proto_file(cls, config: DefaultConfig) -> ProtoGenerationReport:
+        """
+        .. versionchanged:: 0.8.0
+            Return the report of the regenerated proto files.
+            Build the proto files in memory if ``PROTO_IN_MEMORY`` is set.
+        """
+        if config.PROTO_IN_MEMORY:
+            report = build_proto_in_memory(template_path=config.PROTO_TEMPLATE_PATH)
+        else:
+            report = generate_proto_file(
+                template_path_root=config.PROTO_TEMPLATE_ROOT,
+                template_path=config.PROTO_TEMPLATE_PATH,
+                auto_generate=config.PROTO_AUTO_GENERATED,
+            )
+        logging.getLogger(__name__).debug(f"proto files: {report}")
+        return report
+
+    @classmethod
+    def build(cls, config: Optional[DefaultConfig] = None) -> str:
+        """Generate the proto and pb files of this application and its
+        blueprints, whatever ``PROTO_AUTO_GENERATED`` and ``PROTO_IN_MEMORY``
+        are, with the manifest of its messages and services, which are loaded
+        by :meth:`run` if ``PROTO_FROM_MANIFEST`` is set. Return the path of
+        the manifest.
+
+        It is called by ``grpcalchemy build``.
+
+        .. versionadded:: 0.8.0
+        """
+        if config is None:
+            config = DefaultConfig()
+        cls.as_view()
+        for bp_cls in cls.get_blueprints():
+            bp_cls.as_view()
+        report = generate_proto_file(
             template_path_root=config.PROTO_TEMPLATE_ROOT,
             template_path=config.PROTO_TEMPLATE_PATH,
-            auto_generate=config.PROTO_AUTO_GENERATED,
+        )
+        logging.getLogger(__name__).debug(f"proto files: {report}")
+        return write_proto_manifest(
+            config.PROTO_TEMPLATE_ROOT, config.PROTO_TEMPLATE_PATH
         )
 
+    @classmethod
+    def load_manifest(cls, config: DefaultConfig) -> Dict[str, gRPCMethodsType]:
+        """Load the messages of this application and its blueprints from the
+        manifest written by :meth:`build`, check their gRPC methods against it
+        and return them by service name.
+
+        :raise RuntimeError: if the manifest is missing or differs from them.
+
+        .. versionadded:: 0.8.0
+        """
+        manifest = load_proto_manifest(
+            config.PROTO_TEMPLATE_ROOT, config.PROTO_TEMPLATE_PATH
+        )
+        services: Dict[str, Dict[str, str]] = {}
+        for file_manifest in manifest["files"].values():
+            services.update(file_manifest["services"])
+        rpc_methods: Dict[str, gRPCMethodsType] = {}
+        for bp_cls in [cls, *cls.get_blueprints()]:
+            service_name = bp_cls.access_service_name()
+            if service_name not in services:
+                raise RuntimeError(
+                    f"{service_name} is not in the manifest, "
+                    "run `grpcalchemy build` again."
+                )
+            rpc_methods[service_name] = bp_cls.check_rpc_methods(services[service_name])
+        return rpc_methods
+
     @classmethod
     def run(
         cls,
@@ -134,11 +277,16 @@ class Server(Blueprint, grpc.Server):
 
         socket_bind_test(host, port)
 
-        cls.as_view()
-        for bp_cls in cls.get_blueprints():
-            bp_cls.as_view()
+        # the gRPC methods of each blueprint are only looked for once on start
+        if config.PROTO_FROM_MANIFEST:
+            rpc_methods = cls.load_manifest(config)
+        else:
+            rpc_methods = {
+                bp_cls.access_service_name(): bp_cls.as_view()
+                for bp_cls in [cls, *cls.get_blueprints()]
+            }
 
-        cls.generate_proto_file(config)
+            cls.generate_proto_file(config)
 
         if config.GRPC_SERVER_PROCESS_COUNT > 1:
             address_family = select_address_family(host)
@@ -149,30 +297,37 @@ class Server(Blueprint, grpc.Server):
                     raise RuntimeError("Failed to set SO_REUSEPORT.")
                 sock.bind(server_address)
                 config.GRPC_SERVER_OPTIONS.append(("grpc.so_reuseport", 1))
-                for _ in range(config.GRPC_SERVER_PROCESS_COUNT):
-                    # NOTE: It is imperative that the worker subprocesses be forked before
-                    # any gRPC servers start up. See
-                    # https://github.com/grpc/grpc/issues/16001 for more details.
-                    worker = multiprocessing.Process(
-                        target=cls._run,
-                        kwargs=dict(
-                            config=config,
-                            target=f"{host}:{port}",
-                            server_credentials=server_credentials,
-                            block=True,
-                        ),
-                    )
-                    worker.start()
-                    cls.workers.append(worker)
+                # NOTE: It is imperative that the worker subprocesses be forked before
+                # any gRPC servers start up. See
+                # https://github.com/grpc/grpc/issues/16001 for more details.
+                cls.supervisor = WorkerSupervisor(
+                    target=cls._run,
+                    kwargs=dict(
+                        config=config,
+                        target=f"{host}:{port}",
+                        server_credentials=server_credentials,
+                        block=True,
+                        rpc_methods=rpc_methods,
+                    ),
+                    process_count=config.GRPC_SERVER_PROCESS_COUNT,
+                    workers=cls.workers,
+                    backoff=config.GRPC_SERVER_RESPAWN_BACKOFF,
+                    max_backoff=config.GRPC_SERVER_RESPAWN_MAX_BACKOFF,
+                    logger=logging.getLogger(__name__),
+                )
+                cls.supervisor.start()
                 if block:
-                    for worker in cls.workers:
-                        worker.join()
+                    cls.supervisor.serve_forever()
+                else:
+                    # the caller stops the workers with ``cls.supervisor.stop()``
+                    cls.supervisor.supervise_in_background()
         else:
             return cls._run(
                 config=config,
                 target=f"{host}:{port}",
                 server_credentials=server_credentials,
                 block=block,
+                rpc_methods=rpc_methods,
             )
 
     @classmethod
@@ -182,30 +337,91 @@ class Server(Blueprint, grpc.Server):
         target: str,
         server_credentials: Optional[grpc.ServerCredentials] = None,
         block: Optional[bool] = None,
+        worker_index: int = 0,
+        rpc_methods: Optional[Dict[str, gRPCMethodsType]] = None,
     ):
         self = cls(config)
+        self._setup(
+            target=target,
+            server_credentials=server_credentials,
+            rpc_methods=rpc_methods,
+        )
+
+        if block is None:
+            block = self.config.GRPC_SERVER_RUN_WITH_BLOCK
 
+        self.start()
+        self._start_metrics_server(worker_index)
+
+        self.logger.info(f"gRPC server is running on {target}")
+
+        if block:  # pragma: no cover
+            try:
+                self._wait_for_stop_signal()
+            finally:
+                self.graceful_stop()
+        return self
+
+    def _wait_for_stop_signal(self) -> None:
+        stop_signal = Event()
+        # signal handlers can only be set in the main thread
+        if current_thread() is main_thread():
+            for signum in GRACEFUL_STOP_SIGNALS:
+                signal.signal(signum, lambda *_: stop_signal.set())
+        while not stop_signal.wait(_ONE_DAY_IN_SECONDS):
+            pass
+
+    def _start_metrics_server(self, worker_index: int = 0) -> None:
+        if self.metrics is not None and self.config.GRPC_METRICS_PORT is not None:
+            self._metrics_server = start_metrics_server(
+                self.metrics,
+                self.config.GRPC_METRICS_HOST,
+                self.config.GRPC_METRICS_PORT + worker_index,
+            )
+            self.logger.info(
+                "metrics are served on "
+                f"http://{self.config.GRPC_METRICS_HOST}:{self._metrics_server.server_port}/metrics"
+            )
+
+    def _setup(
+        self,
+        target: str,
+        server_credentials: Optional[grpc.ServerCredentials] = None,
+        rpc_methods: Optional[Dict[str, gRPCMethodsType]] = None,
+    ) -> None:
         for bp_cls in self.get_blueprints():
             self.register_blueprint(bp_cls)
 
-        services: Tuple[str, ...] = (reflection.SERVICE_NAME, health.SERVICE_NAME)
+        services: Tuple[str, ...] = ()
         for name, bp in self.blueprints.items():
-            services += add_blueprint_to_server(self.config, bp, self)
+            bp_rpc_methods = (rpc_methods or {}).get(name)
+            if bp_rpc_methods is None:
+                bp_rpc_methods = bp.get_rpc_methods()
+            bp.build_rpc_handlers(bp_rpc_methods)
+            services += add_blueprint_to_server(self.config, bp, self, bp_rpc_methods)
 
+        # health checking and reflection are only imported once enabled
         if self.config.GRPC_HEALTH_CHECKING_ENABLE:
-            health_service = health.HealthServicer(
-                experimental_non_blocking=True,
-                experimental_thread_pool=futures.ThreadPoolExecutor(
-                    max_workers=self.config.GRPC_HEALTH_CHECKING_THREAD_POOL_NUM
-                ),
-            )
-            health_pb2_grpc.add_HealthServicer_to_server(health_service, self)
+            from grpc_health.v1 import health_pb2_grpc
 
-        if self.config.GRPC_SEVER_REFLECTION_ENABLE:
-            reflection.enable_server_reflection(services, self)
+            self.health_servicer = self._create_health_servicer()
+            health_pb2_grpc.add_HealthServicer_to_server(self.health_servicer, self)
 
-        if block is None:
-            block = self.config.GRPC_SERVER_RUN_WITH_BLOCK
+        if self.config.GRPC_SEVER_REFLECTION_ENABLE:
+            from grpc_health.v1 import health, health_pb2
+            from grpc_reflection.v1alpha import reflection, reflection_pb2
+
+            pool = None
+            if self.config.PROTO_IN_MEMORY:
+                # the messages built in memory are in a descriptor pool of their own
+                pool = in_memory_descriptor_pool(
+                    health_pb2.DESCRIPTOR, reflection_pb2.DESCRIPTOR
+                )
+            reflection.enable_server_reflection(
+                (reflection.SERVICE_NAME, health.SERVICE_NAME) + services,
+                self,
+                pool=pool,
+            )
 
         self.before_server_start()
 
@@ -216,19 +432,15 @@ class Server(Blueprint, grpc.Server):
         else:
             self.add_insecure_port(target.encode("utf-8"))
 
-        self.start()
-
-        self.logger.info(f"gRPC server is running on {target}")
+    def _create_health_servicer(self) -> "health_pb2_grpc.HealthServicer":
+        from grpc_health.v1 import health
 
-        if block:  # pragma: no cover
-            try:
-                while True:
-                    time.sleep(_ONE_DAY_IN_SECONDS)
-            except:
-                pass
-            finally:
-                self.stop(0)
-        return self
+        return health.HealthServicer(
+            experimental_non_blocking=True,
+            experimental_thread_pool=futures.ThreadPoolExecutor(
+                max_workers=self.config.GRPC_HEALTH_CHECKING_THREAD_POOL_NUM
+            ),
+        )
 
     def before_server_start(self):
         pass
@@ -273,10 +485,76 @@ class Server(Blueprint, grpc.Server):
 
         .. versionadded:: 0.2.1
         """
-        event = _stop(self._state, grace)
+        event = self._stop_server(grace)
+        self._shutdown_executors()
+        stop_metrics_server(self._metrics_server)
         self.after_server_stop()
         return event
 
+    def _stop_server(self, grace: Optional[float]) -> Event:
+        return _stop(self._state, grace)
+
+    def get_limiter(self, service: str, method: str) -> AdaptiveLimiter:
+        """The adaptive limiter of a gRPC method, created on the first call.
+
+        .. versionadded:: 0.8.0
+        """
+        key = (service, method)
+        if key not in self.limiters:
+            limiter = self.limiters[key] = AdaptiveLimiter(
+                initial_limit=self.config.GRPC_SERVER_ADAPTIVE_LIMIT_INITIAL,
+                min_limit=self.config.GRPC_SERVER_ADAPTIVE_LIMIT_MIN,
+                max_limit=self.config.GRPC_SERVER_ADAPTIVE_LIMIT_MAX,
+            )
+            if self.metrics is not None:
+                self.metrics.register_limiter(service, method, limiter)
+        return self.limiters[key]
+
+    def get_shedder(self, service: str, method: str) -> DeadlineShedder:
+        """The deadline shedder of a gRPC method, created on the first call.
+
+        .. versionadded:: 0.8.0
+        """
+        key = (service, method)
+        if key not in self.shedders:
+            shedder = self.shedders[key] = DeadlineShedder(
+                ratio=self.config.GRPC_SERVER_DEADLINE_SHEDDING_RATIO
+            )
+            if self.metrics is not None:
+                self.metrics.register_shedder(service, method, shedder)
+        return self.shedders[key]
+
+    def _shutdown_executors(self) -> None:
+        # the RPCs already submitted still run to the end
+        for executor in self.executors:
+            executor.shutdown(wait=False)
+
+    def _enter_graceful_shutdown(self) -> None:
+        if self.health_servicer is not None:
+            self.health_servicer.enter_graceful_shutdown()
+
+    def graceful_stop(self, grace: Optional[float] = None) -> None:
+        """Stops this Server gracefully and blocks until it has completely stopped.
+
+        The status of all the services in health checking is set to
+        ``NOT_SERVING`` first. Then new RPCs are refused, while the active RPCs
+        have ``grace`` seconds to complete before being aborted. At last,
+        :meth:`after_server_stop` is called.
+
+        A blocking server stops in this way on ``SIGTERM`` or ``SIGINT``.
+
+        :param grace: A duration of time in seconds, ``GRPC_SERVER_GRACE`` by default.
+
+        .. versionadded:: 0.8.0
+        """
+        if grace is None:
+            grace = self.config.GRPC_SERVER_GRACE
+        self._enter_graceful_shutdown()
+        self._stop_server(grace).wait()
+        self._shutdown_executors()
+        stop_metrics_server(self._metrics_server)
+        self.after_server_stop()
+
     def add_generic_rpc_handlers(
         self, generic_rpc_handlers: Tuple[GenericRpcHandler]
     ) -> None:
@@ -310,12 +588,14 @@ class Server(Blueprint, grpc.Server):
                 address, server_credentials._credentials
             )
 
+    @default_hook
     def process_request(self, request: RequestType, context: Context) -> RequestType:
         """The code to be executed for each request before
         the gRPC method are called. Only in **UnaryUnary** and **UnarySteam** method
         """
         return request
 
+    @default_hook
     def process_response(
         self, response: ResponseType, context: Context
     ) -> ResponseType:
@@ -333,12 +613,15 @@ class Server(Blueprint, grpc.Server):
             # serving daemon thread (if it exists) to initiate shutdown.
             self._state.server_deallocated = True
 
+    @default_hook
     def __enter__(self):
         pass
 
+    @default_hook
     def __exit__(self, exc_type, exc_val, exc_tb):
         pass
 
+    @default_hook
     def app_context(
         self, current_service: Blueprint, current_method: Callable, context: Context
     ) -> ContextManager:
@@ -347,9 +630,160 @@ class Server(Blueprint, grpc.Server):
         #: .. versionchanged:: 0.5.0
         return self
 
+    @default_hook
     def handle_exception(self, e: Exception, context: Context) -> ResponseType:
         raise e
 
     @classmethod
     def get_blueprints(self) -> List[Type[Blueprint]]:
         return []
+
+
+class AsyncServer(Server):
+    """The Server object serving gRPC methods on an asyncio event loop with
+    ``grpc.aio``, so that thousands of concurrent I/O-bound calls do not need
+    thousands of threads::
+
+        from grpcalchemy import AsyncServer
+        class FooService(AsyncServer):
+            @grpcmethod
+            async def GetSomething(self, request: Message, context: Context) -> Message:
+                ...
+
+    gRPC methods, middleware hooks and :meth:`handle_exception` may be defined with
+    ``async def``, and :meth:`app_context` may return an asynchronous context
+    manager. Methods defined without ``async def`` are executed in a thread pool
+    with ``GRPC_SERVER_MAX_WORKERS`` workers, and they can only be used along with
+    synchronous hooks.
+
+    :meth:`start` and :meth:`stop` must not be called from the event loop.
+
+    .. versionadded:: 0.8.0
+    """
+
+    # ``grpc.aio`` runs all the synchronous gRPC methods in its migration thread pool
+    dedicated_thread_pools = False
+
+    def _init_server(self) -> None:
+        self.logger.info(f"server options: {self.config.GRPC_SERVER_OPTIONS}")
+        #: Event loop which the gRPC server is bound to, closed once the server
+        #: has stopped. It is not set as the event loop of the current thread.
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread: Optional[Thread] = None
+
+        async def create_server() -> grpc.aio.Server:
+            # the server is bound to the running event loop on creation
+            return grpc.aio.server(
+                migration_thread_pool=futures.ThreadPoolExecutor(
+                    max_workers=self.config.GRPC_SERVER_MAX_WORKERS
+                ),
+                options=self.config.GRPC_SERVER_OPTIONS,
+                maximum_concurrent_rpcs=self.config.GRPC_SERVER_MAXIMUM_CONCURRENT_RPCS,
+            )
+
+        self._server = self.loop.run_until_complete(create_server())
+
+    @classmethod
+    def _run(
+        cls,
+        config: DefaultConfig,
+        target: str,
+        server_credentials: Optional[grpc.ServerCredentials] = None,
+        block: Optional[bool] = None,
+        worker_index: int = 0,
+        rpc_methods: Optional[Dict[str, gRPCMethodsType]] = None,
+    ):
+        self = cls(config)
+        self._setup(
+            target=target,
+            server_credentials=server_credentials,
+            rpc_methods=rpc_methods,
+        )
+
+        if block is None:
+            block = self.config.GRPC_SERVER_RUN_WITH_BLOCK
+
+        self.start()
+        self._start_metrics_server(worker_index)
+
+        self.logger.info(f"gRPC server is running on {target}")
+
+        if block:  # pragma: no cover
+            try:
+                self.loop.run_until_complete(self._wait_for_stop_signal())
+            finally:
+                self.graceful_stop()
+        else:
+            self._loop_thread = Thread(target=self.loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return self
+
+    async def _wait_for_stop_signal(self) -> None:  # type: ignore
+        stop_signal = asyncio.Event()
+        if current_thread() is main_thread():
+            for signum in GRACEFUL_STOP_SIGNALS:
+                try:
+                    self.loop.add_signal_handler(signum, stop_signal.set)
+                except NotImplementedError:  # pragma: no cover
+                    # the event loops on Windows do not support signal handlers
+                    signal.signal(
+                        signum,
+                        lambda *_: self.loop.call_soon_threadsafe(stop_signal.set),
+                    )
+        await stop_signal.wait()
+
+    def _create_health_servicer(self) -> "health_pb2_grpc.HealthServicer":
+        from grpc_health.v1 import health
+
+        return health.aio.HealthServicer()
+
+    def _run_coroutine(self, coroutine):
+        if self.loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+        return self.loop.run_until_complete(coroutine)
+
+    def start(self) -> None:
+        """Starts this Server.
+
+        This method may only be called once. (i.e. it is not idempotent).
+        """
+        self.loop.run_until_complete(self._server.start())
+
+    def _stop_server(self, grace: Optional[float]) -> Event:
+        # the server has completely stopped once the coroutine is completed,
+        # then the event loop serving it in background is terminated and closed.
+        if not self.loop.is_closed():
+            self._run_coroutine(self._server.stop(grace))
+            if self.loop.is_running():
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                if self._loop_thread is not None:
+                    self._loop_thread.join()
+            self.loop.close()
+        event = Event()
+        event.set()
+        return event
+
+    def _enter_graceful_shutdown(self) -> None:
+        if self.health_servicer is not None:
+            self._run_coroutine(self.health_servicer.enter_graceful_shutdown())
+
+    def add_generic_rpc_handlers(
+        self, generic_rpc_handlers: Tuple[GenericRpcHandler]
+    ) -> None:
+        self._server.add_generic_rpc_handlers(generic_rpc_handlers)
+
+    def add_insecure_port(self, address: bytes):
+        return self._server.add_insecure_port(address.decode("utf-8"))
+
+    def add_secure_port(
+        self, address: bytes, server_credentials: grpc.ServerCredentials
+    ):
+        return self._server.add_secure_port(address.decode("utf-8"), server_credentials)
+
+    @default_hook
+    async def __aenter__(self):
+        pass
+
+    @default_hook
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -0,0 +1,352 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from inspect import iscoroutinefunction
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Semaphore, Thread
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+)
+
+# sentinel
+_DONE: Any = object()
+
+
+class _Failure:
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+class Prefetcher:
+    """Produce the responses of a response-streaming gRPC method ahead of
+    sending them, into a queue of at most ``depth`` responses per stream.
+
+    The gRPC method, with its middleware hooks and app context, runs in its
+    own thread (or task in :class:`AsyncServer`), so producing the next
+    response overlaps with sending the previous ones. Once the queue is full,
+    the gRPC method is blocked until the client reads the queued responses.
+
+    Usage::
+
+        class ExportService(Blueprint):
+            @grpcmethod(prefetch=Prefetcher(depth=16))
+            def Export(self, request: Query, context: Context) -> Streaming[Row]:
+                ...
+
+    Each gRPC method should have its own prefetcher.
+
+    :param depth: max number of responses queued per stream.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, depth: int = 8):
+        self.depth = depth
+        #: number of the streams.
+        self.streams = 0
+        #: total seconds the gRPC method was blocked by the full queues.
+        self.blocked_seconds = 0.0
+        self._queues: Set[Any] = set()
+        self._lock = Lock()
+
+    @property
+    def occupancy(self) -> int:
+        """Number of the responses queued in all the streams."""
+        return sum(queue.qsize() for queue in list(self._queues))
+
+    def _open(self, queue: Any) -> None:
+        with self._lock:
+            self.streams += 1
+            self._queues.add(queue)
+
+    def _block(self, seconds: float) -> None:
+        with self._lock:
+            self.blocked_seconds += seconds
+
+    def iterate(self, responses: Iterator) -> Iterator:
+        """Iterate ``responses`` produced in a helper thread."""
+        queue: Queue = Queue(self.depth)
+        stopped = Event()
+
+        def put(item: Any) -> bool:
+            try:
+                queue.put_nowait(item)
+                return True
+            except Full:
+                pass
+            start = perf_counter()
+            try:
+                while not stopped.is_set():
+                    try:
+                        queue.put(item, timeout=0.05)
+                        return True
+                    except Full:
+                        pass
+                return False
+            finally:
+                self._block(perf_counter() - start)
+
+        def produce() -> None:
+            end: Any = _DONE
+            try:
+                for response in responses:
+                    if not put(response):
+                        break
+            except BaseException as e:
+                end = _Failure(e)
+            finally:
+                try:
+                    close = getattr(responses, "close", None)
+                    if close is not None:
+                        close()
+                finally:
+                    # the end is always queued, so the consumer is never left waiting
+                    put(end)
+
+        self._open(queue)
+        Thread(target=copy_context().run, args=(produce,), daemon=True).start()
+        try:
+            while True:
+                item = queue.get()
+                if item is _DONE:
+                    return
+                if item.__class__ is _Failure:
+                    raise item.exception
+                yield item
+        finally:
+            # the stream is finished or cancelled, stop the producer
+            stopped.set()
+            self._queues.discard(queue)
+            try:
+                while True:
+                    queue.get_nowait()
+            except Empty:
+                pass
+
+    async def async_iterate(self, responses: AsyncIterator) -> AsyncIterator:
+        """Iterate ``responses`` produced in a helper task."""
+        queue: asyncio.Queue = asyncio.Queue(self.depth)
+
+        async def produce() -> None:
+            try:
+                async for response in responses:
+                    if queue.full():
+                        start = perf_counter()
+                        try:
+                            await queue.put(response)
+                        finally:
+                            self._block(perf_counter() - start)
+                    else:
+                        queue.put_nowait(response)
+                await queue.put(_DONE)
+            except Exception as e:
+                await queue.put(_Failure(e))
+            finally:
+                aclose = getattr(responses, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        self._open(queue)
+        task = asyncio.get_running_loop().create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                if item.__class__ is _Failure:
+                    raise item.exception
+                yield item
+        finally:
+            task.cancel()
+            self._queues.discard(queue)
+
+
+class _End:
+    __slots__ = ("count", "exception")
+
+    def __init__(self, count: int, exception: Optional[Exception] = None):
+        #: number of the submitted requests.
+        self.count = count
+        self.exception = exception
+
+
+class ParallelMap:
+    """Map the requests of a request-streaming gRPC method concurrently on a
+    pool of ``max_workers`` threads, at most ``window`` requests ahead of the
+    responses sent.
+
+    The responses are yielded in the order of the requests, or as soon as they
+    are ready if ``ordered`` is ``False``. The requests are read in their own
+    thread (or task in :class:`AsyncServer`), so that the clients waiting for a
+    response before sending the next request are never blocked.
+
+    An exception raised by ``fn`` or by reading the requests is raised in the
+    gRPC method, and once the stream is finished or cancelled, the requests
+    which are not processed yet are skipped.
+
+    Usage::
+
+        enrich = ParallelMap(max_workers=8, window=32)
+
+        class EnrichService(Blueprint):
+            @grpcmethod
+            def Enrich(
+                self, request: Streaming[Item], context: Context
+            ) -> Streaming[Item]:
+                yield from enrich.map(self.enrich_item, request)
+
+            @grpcmethod
+            async def AsyncEnrich(
+                self, request: Streaming[Item], context: Context
+            ) -> Streaming[Item]:
+                # coroutine functions run as tasks, and functions in the pool
+                async for response in enrich.async_map(self.score_item, request):
+                    yield response
+
+    :param max_workers: number of threads of the pool.
+    :param window: max number of requests processed and not yielded yet per
+        stream.
+    :param ordered: whether to yield the responses in the order of the
+        requests by default.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        window: int = 16,
+        ordered: bool = True,
+    ):
+        self.window = window
+        self.ordered = ordered
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ParallelMap"
+        )
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        requests: Iterable,
+        ordered: Optional[bool] = None,
+    ) -> Iterator:
+        """Yield ``fn(request)`` of each of ``requests``."""
+        if ordered is None:
+            ordered = self.ordered
+        window = Semaphore(self.window)
+        results: Queue = Queue()
+        stopped = Event()
+
+        def run(request: Any) -> Any:
+            if stopped.is_set():
+                return None
+            return fn(request)
+
+        def feed() -> None:
+            count = 0
+            exception = None
+            try:
+                for request in requests:
+                    while not window.acquire(timeout=0.05):
+                        if stopped.is_set():
+                            return
+                    if stopped.is_set():
+                        return
+                    future = self.executor.submit(run, request)
+                    count += 1
+                    if ordered:
+                        results.put(future)
+                    else:
+                        future.add_done_callback(results.put)
+            except Exception as e:
+                exception = e
+            finally:
+                results.put(_End(count, exception))
+
+        Thread(target=copy_context().run, args=(feed,), daemon=True).start()
+        yielded = 0
+        end: Optional[_End] = None
+        try:
+            while end is None or yielded < end.count:
+                item = results.get()
+                if item.__class__ is _End:
+                    end = item
+                    if end.exception is not None:
+                        raise end.exception
+                    continue
+                response = item.result()
+                yielded += 1
+                window.release()
+                yield response
+        finally:
+            stopped.set()
+
+    async def async_map(
+        self,
+        fn: Callable[[Any], Any],
+        requests: AsyncIterable,
+        ordered: Optional[bool] = None,
+    ) -> AsyncIterator:
+        """Yield ``fn(request)`` of each of ``requests``, ``fn`` may be a
+        coroutine function.
+        """
+        if ordered is None:
+            ordered = self.ordered
+        loop = asyncio.get_running_loop()
+        is_coroutine = iscoroutinefunction(fn)
+        window = asyncio.Semaphore(self.window)
+        results: asyncio.Queue = asyncio.Queue()
+        pending: Set[asyncio.Future] = set()
+
+        async def feed() -> None:
+            count = 0
+            exception = None
+            try:
+                async for request in requests:
+                    await window.acquire()
+                    future: asyncio.Future
+                    if is_coroutine:
+                        future = loop.create_task(fn(request))
+                    else:
+                        future = loop.run_in_executor(self.executor, fn, request)
+                    count += 1
+                    pending.add(future)
+                    future.add_done_callback(pending.discard)
+                    if ordered:
+                        results.put_nowait(future)
+                    else:
+                        future.add_done_callback(results.put_nowait)
+            except Exception as e:
+                exception = e
+            finally:
+                results.put_nowait(_End(count, exception))
+
+        feeder = loop.create_task(feed())
+        yielded = 0
+        end: Optional[_End] = None
+        try:
+            while end is None or yielded < end.count:
+                item = await results.get()
+                if item.__class__ is _End:
+                    end = item
+                    if end.exception is not None:
+                        raise end.exception
+                    continue
+                response = await item
+                yielded += 1
+                window.release()
+                yield response
+        finally:
+            feeder.cancel()
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,203 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional
+
+#: The signals forwarded to the workers by the supervisor.
+FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+def _run_worker(target: Callable, kwargs: Dict[str, Any], worker_index: int) -> None:
+    # workers respawned by the supervisor are forked after its signal handlers
+    # are installed, restore the default ones before serving.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    target(worker_index=worker_index, **kwargs)
+
+
+class WorkerStatus:
+    """The status of a worker process managed by :class:`WorkerSupervisor`.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        #: how many times the worker is respawned.
+        self.restarts = 0
+        #: exit code of the last exited process of this worker.
+        self.last_exitcode: Optional[int] = None
+        self.started_at = 0.0
+        #: when the exited worker will be respawned.
+        self.respawn_at: Optional[float] = None
+        self.consecutive_failures = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def __repr__(self) -> str:
+        return (
+            f"<Worker {self.index} pid={self.pid} alive={self.alive} "
+            f"restarts={self.restarts} last_exitcode={self.last_exitcode}>"
+        )
+
+
+class WorkerSupervisor:
+    """Start the worker processes, respawn the exited ones with an exponential
+    backoff and forward ``SIGTERM`` and ``SIGINT`` to them.
+
+    :param target: the function served in each worker process, the index of
+        the worker is passed to it as the keyword argument ``worker_index``.
+    :param kwargs: keyword arguments of ``target``.
+    :param process_count: number of worker processes.
+    :param workers: the list kept in sync with the current worker processes.
+    :param backoff: seconds before respawning a worker after its first exit,
+        doubled after each consecutive exit.
+    :param max_backoff: the upper bound of the backoff, a worker which served
+        longer than it is not considered crashing consecutively any more.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(
+        self,
+        target: Callable,
+        kwargs: Dict[str, Any],
+        process_count: int,
+        workers: Optional[List[multiprocessing.Process]] = None,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.target = target
+        self.kwargs = kwargs
+        self.workers: List[multiprocessing.Process] = [] if workers is None else workers
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.logger = logger or logging.getLogger(__name__)
+        self.status: List[WorkerStatus] = [
+            WorkerStatus(index) for index in range(process_count)
+        ]
+        self.stopping = False
+        # ``check`` and ``stop`` may run in the thread of ``supervise_in_background``
+        self._lock = threading.RLock()
+
+    def _spawn(self, status: WorkerStatus, now: float) -> None:
+        process = multiprocessing.Process(
+            target=_run_worker, args=(self.target, self.kwargs, status.index)
+        )
+        process.start()
+        if status.process in self.workers:
+            self.workers[self.workers.index(status.process)] = process
+        else:
+            self.workers.append(process)
+        status.process = process
+        status.started_at = now
+        status.respawn_at = None
+
+    def start(self) -> None:
+        now = time.monotonic()
+        for status in self.status:
+            self._spawn(status, now)
+
+    def check(self, now: Optional[float] = None) -> None:
+        """Record the exited workers and respawn the ones whose backoff is over."""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            self._check(now)
+
+    def _check(self, now: float) -> None:
+        for status in self.status:
+            if self.stopping or status.process is None or status.alive:
+                continue
+            if status.respawn_at is None:
+                status.last_exitcode = status.process.exitcode
+                if now - status.started_at >= self.max_backoff:
+                    status.consecutive_failures = 0
+                delay = min(
+                    self.backoff * 2**status.consecutive_failures, self.max_backoff
+                )
+                status.consecutive_failures += 1
+                status.respawn_at = now + delay
+                self.logger.warning(
+                    f"worker {status.index} (pid {status.pid}) exited with "
+                    f"{status.last_exitcode}, respawn in {delay:.1f}s"
+                )
+            if now >= status.respawn_at:
+                status.restarts += 1
+                self._spawn(status, now)
+                self.logger.info(f"worker {status.index} respawned: {status}")
+
+    def stop(self, signum: int = signal.SIGTERM) -> None:
+        """Stop respawning and forward ``signum`` to the alive workers."""
+        with self._lock:
+            self.stopping = True
+            for status in self.status:
+                if status.alive:
+                    try:
+                        os.kill(status.pid, signum)  # type: ignore
+                    except ProcessLookupError:  # pragma: no cover
+                        pass
+
+    def join(self) -> None:
+        for status in self.status:
+            if status.process is not None:
+                status.process.join()
+
+    def serve_forever(self, interval: float = 1.0) -> None:
+        """Supervise the workers until ``SIGTERM`` or ``SIGINT`` is received,
+        then wait for all of them to exit. Must be called in the main thread.
+        """
+
+        def forward_signal(signum, frame):
+            self.logger.info(f"forward signal {signum} to workers: {self.status}")
+            self.stop(signum)
+
+        previous_handlers = {
+            signum: signal.signal(signum, forward_signal)
+            for signum in FORWARDED_SIGNALS
+        }
+        try:
+            self._supervise(interval)
+            self.join()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def supervise_in_background(self, interval: float = 1.0) -> threading.Thread:
+        """Supervise the workers in a daemon thread until :meth:`stop` is called.
+
+        Unlike :meth:`serve_forever`, no signal handler is installed, so the
+        caller is responsible for calling :meth:`stop`.
+        """
+        thread = threading.Thread(
+            target=self._supervise,
+            args=(interval,),
+            name="grpcalchemy-supervisor",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _supervise(self, interval: float) -> None:
+        while not self.stopping:
+            wait(
+                [
+                    s.process.sentinel
+                    for s in self.status
+                    if s.process is not None and s.process.is_alive()
+                ],
+                timeout=interval,
+            )
+            self.check()
@@ -1,19 +1,22 @@
+import json
 import socket
 import sys
+from hashlib import sha256
 from importlib import import_module
 from os import walk, path, mkdir
 from os.path import abspath, dirname, exists, join
-from typing import Union, Optional, TYPE_CHECKING, Tuple
+from typing import Any, Callable, Dict, List, Set, Union, Optional, TYPE_CHECKING, Tuple
 
-import grpc_tools.protoc
-import pkg_resources
-from jinja2 import Environment, FileSystemLoader
+import grpc
+from google.protobuf import descriptor_pool
+from google.protobuf.descriptor_pb2 import DescriptorProto, FieldDescriptorProto
+from google.protobuf.descriptor_pb2 import FileDescriptorProto
 
 from grpcalchemy.config import DefaultConfig
 
 if TYPE_CHECKING:  # pragma: no cover
     from grpcalchemy.server import Server
-    from grpcalchemy.blueprint import Blueprint
+    from grpcalchemy.blueprint import Blueprint, gRPCMethodsType
 
 
 try:
@@ -21,7 +24,8 @@ try:
 except AttributeError:  # pragma: no cover
     af_unix = None  # type: ignore
 
-from .meta import __meta__
+from .meta import ProtoBuffMeta, __meta__
+from .orm import BaseField, MapField, ReferenceField, RepeatedField
 
 if sys.platform == "win32":
     FILE_SEPARATOR = "\\"
@@ -30,6 +34,14 @@ else:
 
 curdir = "."
 
+#: Hashes of the proto files compiled in the directory of proto files.
+PROTO_CACHE_FILE = ".grpcalchemy_cache.json"
+
+#: Messages and services of the compiled proto files, written by
+#: ``grpcalchemy build`` in the directory of proto files.
+PROTO_MANIFEST_FILE = "grpcalchemy_manifest.json"
+PROTO_MANIFEST_VERSION = 1
+
 
 def make_packages(name, mode=0o777, exist_ok=False):
     """make_packages(name [, mode=0o777][, exist_ok=False])
@@ -68,14 +80,81 @@ def make_packages(name, mode=0o777, exist_ok=False):
             open(init_file, "a").close()
 
 
+class ProtoGenerationReport:
+    """What :func:`generate_proto_file` has done with each proto file.
+
+    .. versionadded:: 0.8.0
+    """
+
+    def __init__(self):
+        #: proto files which are compiled again.
+        self.regenerated: List[str] = []
+        #: proto files whose schema and compiled artifacts are up to date.
+        self.unchanged: List[str] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProtoGenerationReport regenerated={self.regenerated} "
+            f"unchanged={self.unchanged}>"
+        )
+
+
+def _load_proto_cache(cache_path: str) -> Dict[str, str]:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _dump_proto_cache(cache_path: str, cache: Dict[str, str]) -> None:
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def _hash_proto_file(proto_path: str, tools_version: str) -> str:
+    digest = sha256(tools_version.encode("utf-8"))
+    with open(proto_path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _write_if_changed(file_path: str, content: str) -> None:
+    if exists(file_path):
+        with open(file_path, encoding="utf-8") as f:
+            if f.read() == content:
+                return
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
 def generate_proto_file(
     template_path_root: str = "",
     template_path: str = "protos",
     auto_generate: bool = True,
-):
+) -> ProtoGenerationReport:
+    """Render the proto files of all the messages and services, compile them with
+    protoc and populate ``gRPCMessageClass`` of each message.
+
+    A proto file is only compiled again when its content or the version of
+    grpcio-tools changed since its last compilation, or when its compiled
+    artifacts are missing.
+
+    :raise RuntimeError: if protoc fails, the proto files are compiled again
+        on the next call then.
+
+    .. versionchanged:: 0.8.0
+        Skip rewriting and compiling the unchanged proto files.
+        Compile all the changed proto files in a single protoc invocation.
+    """
     abs_template_path = join(template_path_root, template_path)
+    report = ProtoGenerationReport()
 
     if auto_generate:
+        import grpc_tools.protoc
+        import pkg_resources
+        from jinja2 import Environment, FileSystemLoader
+
         env = Environment(
             loader=FileSystemLoader(
                 searchpath=abspath(join(dirname(__file__), "templates"))
@@ -92,58 +171,355 @@ def generate_proto_file(
             )
         template = env.get_template("rpc.proto.tmpl")
         for filename, meta in __meta__.items():
-            template.stream(
-                file_path=template_path,
-                import_files=sorted(meta.import_files),
-                messages=meta.messages,
-                services=meta.services,
-            ).dump(join(abs_template_path, f"{filename}.proto"))
+            _write_if_changed(
+                join(abs_template_path, f"{filename}.proto"),
+                template.render(
+                    file_path=template_path,
+                    import_files=sorted(meta.import_files),
+                    messages=meta.messages,
+                    services=meta.services,
+                ),
+            )
 
         # copy from grpc_tools
         protoc_file = pkg_resources.resource_filename("grpc_tools", "protoc.py")
         proto_include = pkg_resources.resource_filename("grpc_tools", "_proto")
+        tools_version = pkg_resources.get_distribution("grpcio-tools").version
+        cache_path = join(template_path, PROTO_CACHE_FILE)
+        cache = _load_proto_cache(cache_path)
+        # digests of the proto files need to be compiled
+        stale_files: Dict[str, str] = {}
+        stale_proto_paths: List[str] = []
         for _, dirs, files in walk(f"{template_path}"):
             for file in files:
                 if file[-5:] == "proto":
-                    grpc_tools.protoc.main(
-                        [
-                            protoc_file,
-                            "-I.",
-                            "--python_out=.",
-                            "--grpc_python_out=.",
-                            f".{FILE_SEPARATOR}{template_path}{FILE_SEPARATOR}{file}",
-                        ]
-                        + ["-I{}".format(proto_include)]
+                    proto_path = (
+                        f".{FILE_SEPARATOR}{template_path}{FILE_SEPARATOR}{file}"
                     )
+                    digest = _hash_proto_file(proto_path, tools_version)
+                    if cache.get(file) == digest and all(
+                        exists(join(template_path, f"{file[:-6]}{suffix}.py"))
+                        for suffix in ("_pb2", "_pb2_grpc")
+                    ):
+                        report.unchanged.append(file)
+                    else:
+                        stale_files[file] = digest
+                        stale_proto_paths.append(proto_path)
+        if stale_files:
+            # compile all the stale files in one invocation,
+            # so that every imported file is only parsed once.
+            exit_code = grpc_tools.protoc.main(
+                [protoc_file, "-I.", "--python_out=.", "--grpc_python_out=."]
+                + stale_proto_paths
+                + ["-I{}".format(proto_include)]
+            )
+            if exit_code != 0:
+                raise RuntimeError(
+                    f"protoc failed to compile {', '.join(sorted(stale_files))} "
+                    f"with exit code {exit_code}."
+                )
+            cache.update(stale_files)
+            report.regenerated.extend(stale_files)
+        _dump_proto_cache(cache_path, cache)
     for meta in __meta__.values():
-        import_module(abs_template_path.split(FILE_SEPARATOR, 1)[0])
-        for messageCls in meta.messages:
-            # populated exact gRPCMessageClass from pb2 file
-            gpr_message_module = import_module(
-                f"{join(abs_template_path, messageCls.__filename__).replace(FILE_SEPARATOR, '.')}_pb2"
+        _populate_message_classes(abs_template_path, meta)
+    return report
+
+
+def _populate_message_classes(abs_template_path: str, meta: ProtoBuffMeta) -> None:
+    import_module(abs_template_path.split(FILE_SEPARATOR, 1)[0])
+    for messageCls in meta.messages:
+        # populated exact gRPCMessageClass from pb2 file
+        gpr_message_module = import_module(
+            f"{join(abs_template_path, messageCls.__filename__).replace(FILE_SEPARATOR, '.')}_pb2"
+        )
+        gRPCMessageClass = getattr(gpr_message_module, f"{messageCls.__type_name__}")
+        messageCls.gRPCMessageClass = gRPCMessageClass
+
+
+def build_proto_manifest() -> dict:
+    """The manifest of all the messages and services: the fields of each
+    message and the gRPC methods of each service, by proto file.
+
+    .. versionadded:: 0.8.0
+    """
+    return {
+        "version": PROTO_MANIFEST_VERSION,
+        "files": {
+            filename: {
+                "messages": {
+                    message_cls.__type_name__: [
+                        str(field) for field in message_cls.__meta__.values()
+                    ]
+                    for message_cls in meta.messages
+                },
+                "services": {
+                    service.name: {
+                        rpc.name: rpc.to_rpc_method() for rpc in service.rpcs
+                    }
+                    for service in meta.services
+                },
+            }
+            for filename, meta in __meta__.items()
+        },
+    }
+
+
+def write_proto_manifest(
+    template_path_root: str = "", template_path: str = "protos"
+) -> str:
+    """Write the manifest of all the messages and services into the directory
+    of proto files, and return its path.
+
+    .. versionadded:: 0.8.0
+    """
+    manifest_path = join(template_path_root, template_path, PROTO_MANIFEST_FILE)
+    _write_if_changed(
+        manifest_path, json.dumps(build_proto_manifest(), indent=2) + "\n"
+    )
+    return manifest_path
+
+
+def load_proto_manifest(
+    template_path_root: str = "", template_path: str = "protos"
+) -> dict:
+    """Load the manifest written by ``grpcalchemy build`` and populate
+    ``gRPCMessageClass`` of each message from the compiled pb2 files, without
+    rendering or compiling any proto file.
+
+    :raise RuntimeError: if the manifest is missing, or a message differs from
+        the one in the manifest.
+
+    .. versionadded:: 0.8.0
+    """
+    abs_template_path = join(template_path_root, template_path)
+    manifest_path = join(abs_template_path, PROTO_MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except OSError:
+        raise RuntimeError(
+            f"{manifest_path} is missing, run `grpcalchemy build` first."
+        ) from None
+    if manifest.get("version") != PROTO_MANIFEST_VERSION:
+        raise RuntimeError(
+            f"{manifest_path} is outdated, run `grpcalchemy build` again."
+        )
+    files = manifest["files"]
+    for filename, meta in __meta__.items():
+        messages = files.get(filename, {}).get("messages", {})
+        for message_cls in meta.messages:
+            if messages.get(message_cls.__type_name__) != [
+                str(field) for field in message_cls.__meta__.values()
+            ]:
+                raise RuntimeError(
+                    f"{message_cls.__type_name__} differs from {manifest_path}, "
+                    "run `grpcalchemy build` again."
+                )
+        _populate_message_classes(abs_template_path, meta)
+    return manifest
+
+
+_PROTO_FIELD_TYPES: Dict[str, int] = {
+    "string": FieldDescriptorProto.TYPE_STRING,
+    "int32": FieldDescriptorProto.TYPE_INT32,
+    "int64": FieldDescriptorProto.TYPE_INT64,
+    "float": FieldDescriptorProto.TYPE_FLOAT,
+    "double": FieldDescriptorProto.TYPE_DOUBLE,
+    "bool": FieldDescriptorProto.TYPE_BOOL,
+    "bytes": FieldDescriptorProto.TYPE_BYTES,
+}
+
+
+def _set_field_type(field_proto: FieldDescriptorProto, field: BaseField) -> None:
+    if isinstance(field, ReferenceField):
+        field_proto.type = FieldDescriptorProto.TYPE_MESSAGE
+        field_proto.type_name = f".{field.__type_name__}"
+    else:
+        field_proto.type = _PROTO_FIELD_TYPES[field.__type_name__]
+
+
+def _add_field(
+    message_proto: DescriptorProto, name: str, number: int, field: BaseField
+) -> None:
+    field_proto = message_proto.field.add(
+        name=name,
+        number=number,
+        label=FieldDescriptorProto.LABEL_OPTIONAL,
+    )
+    if isinstance(field, MapField):
+        # the same as protoc, e.g: ``map_field`` -> ``MapFieldEntry``
+        entry_proto = message_proto.nested_type.add(
+            name="".join(part[:1].upper() + part[1:] for part in name.split("_"))
+            + "Entry"
+        )
+        entry_proto.options.map_entry = True
+        _add_field(entry_proto, "key", 1, field.__key_type__)
+        _add_field(entry_proto, "value", 2, field.__value_type__)
+        field_proto.label = FieldDescriptorProto.LABEL_REPEATED
+        field_proto.type = FieldDescriptorProto.TYPE_MESSAGE
+        field_proto.type_name = f".{message_proto.name}.{entry_proto.name}"
+    elif isinstance(field, RepeatedField):
+        field_proto.label = FieldDescriptorProto.LABEL_REPEATED
+        _set_field_type(field_proto, field.__key_type__)
+    else:
+        _set_field_type(field_proto, field)
+
+
+def build_file_descriptor_proto(
+    filename: str, meta: ProtoBuffMeta, template_path: str = "protos"
+) -> FileDescriptorProto:
+    """Build the same ``FileDescriptorProto`` as protoc compiles from the proto
+    file rendered by :func:`generate_proto_file`.
+
+    .. versionadded:: 0.8.0
+    """
+    file_proto = FileDescriptorProto(
+        name=f"{template_path}/{filename}.proto",
+        syntax="proto3",
+        dependency=[
+            f"{template_path}/{file}.proto" for file in sorted(meta.import_files)
+        ],
+    )
+    for service in meta.services:
+        service_proto = file_proto.service.add(name=service.name)
+        for rpc in service.rpcs:
+            service_proto.method.add(
+                name=rpc.name,
+                input_type=f".{rpc.request_cls.__type_name__}",
+                output_type=f".{rpc.response_cls.__type_name__}",
+                client_streaming=rpc.request_streaming,
+                server_streaming=rpc.response_streaming,
             )
-            gRPCMessageClass = getattr(
-                gpr_message_module, f"{messageCls.__type_name__}"
+    for message_cls in meta.messages:
+        message_proto = file_proto.message_type.add(name=message_cls.__type_name__)
+        for number, (name, field) in enumerate(message_cls.__meta__.items(), start=1):
+            _add_field(message_proto, name, number, field)
+    return file_proto
+
+
+def build_proto_in_memory(template_path: str = "protos") -> ProtoGenerationReport:
+    """Build the descriptors of all the messages and services into a new
+    descriptor pool and populate ``gRPCMessageClass`` of each message with the
+    message factory, so neither protoc, Jinja nor a writable directory is needed.
+
+    The files of the default pool can not be replaced, so each build has a pool
+    of its own, which lets the changed messages be built again in the same
+    process.
+
+    .. versionadded:: 0.8.0
+    """
+    pool = descriptor_pool.DescriptorPool()
+    try:
+        from google.protobuf.message_factory import GetMessageClass
+    except ImportError:  # pragma: no cover
+        # protobuf < 4.22
+        from google.protobuf.message_factory import MessageFactory
+
+        GetMessageClass = MessageFactory(pool).GetPrototype
+
+    report = ProtoGenerationReport()
+    built: Set[str] = set()
+
+    def build(filename: str) -> None:
+        if filename in built:
+            return
+        built.add(filename)
+        meta = __meta__[filename]
+        # the dependencies must be in the pool before the file which imports them
+        for import_file in sorted(meta.import_files):
+            build(import_file)
+        pool.AddSerializedFile(
+            build_file_descriptor_proto(
+                filename, meta, template_path
+            ).SerializeToString()
+        )
+        report.regenerated.append(f"{filename}.proto")
+
+    for filename in list(__meta__):
+        build(filename)
+    for meta in __meta__.values():
+        for messageCls in meta.messages:
+            messageCls.gRPCMessageClass = GetMessageClass(
+                pool.FindMessageTypeByName(messageCls.__type_name__)
             )
-            messageCls.gRPCMessageClass = gRPCMessageClass
+    return report
+
+
+def in_memory_descriptor_pool(*extra_files: Any) -> Any:
+    """The descriptor pool which the messages are built into by
+    :func:`build_proto_in_memory`, with the descriptors of ``extra_files``
+    added, ``None`` if there is no message.
+
+    .. versionadded:: 0.8.0
+    """
+    for meta in __meta__.values():
+        for messageCls in meta.messages:
+            pool = messageCls.gRPCMessageClass.DESCRIPTOR.file.pool
+            for file in extra_files:
+                try:
+                    pool.FindFileByName(file.name)
+                except KeyError:
+                    pool.AddSerializedFile(file.serialized_pb)
+            return pool
+    return None
+
+
+_RPC_METHOD_HANDLERS: Dict[Tuple[bool, bool], Callable[..., grpc.RpcMethodHandler]] = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+def _add_blueprint_handlers(
+    bp: "Blueprint",
+    server: "Server",
+    service_name: str,
+    rpc_methods: "gRPCMethodsType",
+) -> None:
+    handlers = {
+        rpc_method.name: _RPC_METHOD_HANDLERS[
+            (rpc_method.request_streaming, rpc_method.response_streaming)
+        ](
+            getattr(bp, rpc_method.name),
+            request_deserializer=rpc_method.request_deserializer(),
+            response_serializer=rpc_method.response_serializer(),
+        )
+        for rpc_method in rpc_methods
+    }
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(service_name, handlers),)
+    )
 
 
 def add_blueprint_to_server(
-    config: DefaultConfig, bp: "Blueprint", server: "Server"
+    config: DefaultConfig,
+    bp: "Blueprint",
+    server: "Server",
+    rpc_methods: Optional["gRPCMethodsType"] = None,
 ) -> Tuple[str, ...]:
-    grpc_pb2_grpc_module = import_module(
-        f"{join(config.PROTO_TEMPLATE_ROOT, config.PROTO_TEMPLATE_PATH, bp.access_file_name()).replace(FILE_SEPARATOR, '.')}_pb2_grpc"
-    )
+    """
+    .. versionchanged:: 0.8.0
+        Add the handlers built in memory if ``PROTO_IN_MEMORY`` is set.
+        Register the handlers with the serializers of each gRPC method instead
+        of the generated ``add_XServicer_to_server``.
+        Take the gRPC methods of ``bp`` found on start as ``rpc_methods``.
+    """
+    if rpc_methods is None:
+        rpc_methods = bp.get_rpc_methods()
+    if config.PROTO_IN_MEMORY:
+        _add_blueprint_handlers(bp, server, bp.access_service_name(), rpc_methods)
+        return (bp.access_service_name(),)
     grpc_pb2_module = import_module(
         f"{join(config.PROTO_TEMPLATE_ROOT, config.PROTO_TEMPLATE_PATH, bp.access_file_name()).replace(FILE_SEPARATOR, '.')}_pb2"
     )
-    getattr(grpc_pb2_grpc_module, f"add_{bp.access_service_name()}Servicer_to_server")(
-        bp, server
-    )
-    return tuple(
-        service.full_name
-        for service in getattr(grpc_pb2_module, "DESCRIPTOR").services_by_name.values()
+    services = getattr(grpc_pb2_module, "DESCRIPTOR").services_by_name
+    _add_blueprint_handlers(
+        bp, server, services[bp.access_service_name()].full_name, rpc_methods
     )
+    return tuple(service.full_name for service in services.values())
 
 
 def select_address_family(host: str) -> int:
@@ -188,4 +564,8 @@ def socket_bind_test(host: str, port: Optional[int] = None):
     address_family = select_address_family(host)
     server_address = get_sockaddr(host, port, address_family)
     with socket.socket(address_family, socket.SOCK_STREAM) as s:
+        if sys.platform != "win32":
+            # the same as gRPC, the port left in TIME_WAIT by a gracefully
+            # stopped server can be bound again.
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         s.bind(server_address)
@@ -9,9 +9,9 @@ with open("HISTORY.rst", encoding="utf-8") as history_file:
     history = history_file.read()
 
 requirements = [
-    "grpcio>=1.29.0",
+    "grpcio>=1.32.0",
     "protobuf",
-    "grpcio-tools>=1.29.0",
+    "grpcio-tools>=1.32.0",
     "jinja2",
     "configalchemy",
     "grpcio-reflection",
@@ -31,12 +31,12 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
     ],
     description="The Python micro framework for building gPRC application.",
+    entry_points={"console_scripts": ["grpcalchemy=grpcalchemy.cli:main"]},
     install_requires=requirements,
     license="MIT license",
     long_description=readme + "\n\n" + history,
@@ -49,7 +49,7 @@ setup(
     test_suite="tests",
     tests_require=test_requirements,
     url="https://github.com/GuangTianLi/grpcalchemy",
-    python_requires=">=3.6.0",
+    python_requires=">=3.7.0",
     version="0.7.3",
     zip_safe=False,
 )
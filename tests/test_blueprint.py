@@ -1,14 +1,25 @@
-from typing import Iterator
+from typing import Iterator, List
+from unittest.mock import Mock
 
 from grpcalchemy.blueprint import (
     InvalidRPCMethod,
     Blueprint,
     grpcmethod,
     UnaryUnaryRpcMethod,
+    AsyncUnaryUnaryRpcMethod,
+    AsyncUnaryStreamRpcMethod,
+    AsyncStreamUnaryRpcMethod,
+    AsyncStreamStreamRpcMethod,
+    AsyncBatchUnaryUnaryRpcMethod,
+    BatchUnaryUnaryRpcMethod,
     UnaryStreamRpcMethod,
     StreamUnaryRpcMethod,
     StreamStreamRpcMethod,
+    is_default_hook,
 )
+from grpcalchemy.batch import Batcher
+from grpcalchemy.cache import ResponseCache, SingleFlight
+from grpcalchemy.server import Server
 from grpcalchemy.orm import Message, StringField
 from tests.test_grpcalchemy import TestGRPCAlchemy
 
@@ -31,6 +42,63 @@ class BlueprintTestCase(TestGRPCAlchemy):
         self.assertEqual("fooservice", test.access_file_name())
         self.assertEqual("FooService", test.access_service_name())
 
+    def test_build_rpc_handlers(self):
+        before_request = Mock(side_effect=lambda request, context: request)
+
+        class FooService(Blueprint):
+            @grpcmethod
+            def GetSomething(
+                self, request: TestBlueprintMessage, context
+            ) -> TestBlueprintMessage:
+                return request
+
+        class BarService(FooService):
+            def before_request(self, request, context):
+                return before_request(request, context)
+
+        self.assertTrue(is_default_hook(FooService().before_request))
+        self.assertFalse(is_default_hook(BarService().before_request))
+
+        app = Server(self.config)
+        for bp_cls, call_count in [(FooService, 0), (BarService, 1)]:
+            bp = bp_cls()
+            bp.current_app = app
+            bp.build_rpc_handlers()
+            message = TestBlueprintMessage(name="test").__message__
+            self.assertIs(message, bp.GetSomething(message, None))
+            self.assertEqual(call_count, before_request.call_count)
+
+    def test_shared_cache(self):
+        for feature, keyed in (
+            ("cache", ResponseCache()),
+            ("single_flight", SingleFlight()),
+        ):
+            with self.subTest(feature):
+
+                class FooService(Blueprint):
+                    @grpcmethod(**{feature: keyed})
+                    def GetSomething(
+                        self, request: TestBlueprintMessage, context
+                    ) -> TestBlueprintMessage:
+                        return request
+
+                class BarService(FooService):
+                    pass
+
+                app = Server(self.config)
+                for bp_cls in [FooService, FooService]:
+                    bp = bp_cls()
+                    bp.current_app = app
+                    bp.build_rpc_handlers()
+                self.assertEqual("/FooService/GetSomething", keyed.method)
+
+                bp = BarService()
+                bp.current_app = app
+                with self.assertRaisesRegex(
+                    InvalidRPCMethod, "already used by /FooService/GetSomething"
+                ):
+                    bp.build_rpc_handlers()
+
     def test_register_invalid_rpc_method(self):
         class TestMessage(Message):
             name = StringField()
@@ -71,6 +139,22 @@ class BlueprintTestCase(TestGRPCAlchemy):
             def test_message_two(self, request: int, context) -> int:
                 ...
 
+        with self.assertRaises(InvalidRPCMethod):
+
+            @grpcmethod(cache=ResponseCache())
+            def test_cache_stream(
+                self, request: TestMessage, context
+            ) -> Iterator[TestMessage]:
+                ...
+
+        with self.assertRaises(InvalidRPCMethod):
+
+            @grpcmethod(batch=Batcher())
+            def test_batch_without_list(
+                self, requests: TestMessage, contexts
+            ) -> TestMessage:
+                ...
+
     def test_unary_unary_grpcmethod(self):
         @grpcmethod
         def UnaryUnary(
@@ -80,6 +164,26 @@ class BlueprintTestCase(TestGRPCAlchemy):
 
         self.assertIsInstance(UnaryUnary.__rpc_method__, UnaryUnaryRpcMethod)
 
+    def test_batch_grpcmethod(self):
+        @grpcmethod(batch=Batcher())
+        def Batch(
+            self, requests: List[TestBlueprintMessage], contexts
+        ) -> List[TestBlueprintMessage]:
+            pass
+
+        @grpcmethod(batch=Batcher())
+        async def AsyncBatch(
+            self, requests: List[TestBlueprintMessage], contexts
+        ) -> List[TestBlueprintMessage]:
+            pass
+
+        self.assertIsInstance(Batch.__rpc_method__, BatchUnaryUnaryRpcMethod)
+        self.assertIsInstance(AsyncBatch.__rpc_method__, AsyncBatchUnaryUnaryRpcMethod)
+        self.assertEqual(
+            Batch.__rpc_method__.to_rpc_method(),
+            "rpc Batch (TestBlueprintMessage) returns (TestBlueprintMessage) {}",
+        )
+
     def test_unary_stream_grpcmethod(self):
         @grpcmethod
         def UnaryStream(
@@ -106,3 +210,41 @@ class BlueprintTestCase(TestGRPCAlchemy):
             pass
 
         self.assertIsInstance(StreamStream.__rpc_method__, StreamStreamRpcMethod)
+
+    def test_async_grpcmethod(self):
+        @grpcmethod
+        async def UnaryUnary(
+            self, request: TestBlueprintMessage, context
+        ) -> TestBlueprintMessage:
+            pass
+
+        @grpcmethod
+        async def UnaryStream(
+            self, request: TestBlueprintMessage, context
+        ) -> Iterator[TestBlueprintMessage]:
+            yield
+
+        @grpcmethod
+        async def StreamUnary(
+            self, request: Iterator[TestBlueprintMessage], context
+        ) -> TestBlueprintMessage:
+            pass
+
+        @grpcmethod
+        async def StreamStream(
+            self, request: Iterator[TestBlueprintMessage], context
+        ) -> Iterator[TestBlueprintMessage]:
+            yield
+
+        self.assertIsInstance(UnaryUnary.__rpc_method__, AsyncUnaryUnaryRpcMethod)
+        self.assertIsInstance(UnaryStream.__rpc_method__, AsyncUnaryStreamRpcMethod)
+        self.assertIsInstance(StreamUnary.__rpc_method__, AsyncStreamUnaryRpcMethod)
+        self.assertIsInstance(StreamStream.__rpc_method__, AsyncStreamStreamRpcMethod)
+
+        with self.assertRaises(InvalidRPCMethod):
+
+            @grpcmethod
+            async def InvalidUnaryStream(
+                self, request: TestBlueprintMessage, context
+            ) -> Iterator[TestBlueprintMessage]:
+                pass
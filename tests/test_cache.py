@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch
+
+from grpcalchemy.cache import ResponseCache, SingleFlight
+from grpcalchemy.orm import Message
+from grpcalchemy.types import Map
+from tests.test_grpcalchemy import TestGRPCAlchemy
+
+
+class ResponseCacheTestCase(TestGRPCAlchemy):
+    def setUp(self):
+        super().setUp()
+
+        class CacheMessage(Message):
+            name: str
+            tags: Map[str, str]
+
+        self.CacheMessage = CacheMessage
+        self.generate_proto_file()
+
+    def test_get_and_put(self):
+        cache = ResponseCache()
+        key = cache.make_key(self.CacheMessage(name="foo"))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"response")
+        self.assertEqual(cache.get(key), b"response")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.bytes, len(b"response"))
+
+    def test_deterministic_key(self):
+        cache = ResponseCache()
+        self.assertEqual(
+            cache.make_key(self.CacheMessage(tags={"a": "1", "b": "2"})),
+            cache.make_key(self.CacheMessage(tags={"b": "2", "a": "1"}).__message__),
+        )
+
+    def test_lazy_key(self):
+        cache = ResponseCache()
+        data = self.CacheMessage(name="foo").to_bytes()
+        with patch.object(
+            self.CacheMessage.gRPCMessageClass, "FromString", side_effect=AssertionError
+        ):
+            cache.put(cache.make_key(self.CacheMessage.from_lazy_bytes(data)), b"bar")
+            request = self.CacheMessage.from_lazy_bytes(data)
+            self.assertEqual(cache.get(cache.make_key(request)), b"bar")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual("foo", request.name)
+        # invalidated by the equal request as long as it is serialized in the same way
+        self.assertTrue(cache.invalidate(self.CacheMessage(name="foo")))
+
+    def test_key_metadata(self):
+        cache = ResponseCache(key_metadata=("x-tenant",))
+        request = self.CacheMessage(name="foo")
+        foo = cache.make_key(request, [("x-tenant", "foo"), ("x-trace", "1")])
+        self.assertEqual(foo, cache.make_key(request, [("x-tenant", "foo")]))
+        self.assertNotEqual(foo, cache.make_key(request, [("x-tenant", "bar")]))
+        self.assertNotEqual(foo, cache.make_key(request))
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl=10)
+        key = cache.make_key(self.CacheMessage(name="foo"))
+        with patch("grpcalchemy.cache.monotonic", return_value=100.0):
+            cache.put(key, b"response")
+        with patch("grpcalchemy.cache.monotonic", return_value=110.0):
+            self.assertEqual(cache.get(key), b"response")
+        with patch("grpcalchemy.cache.monotonic", return_value=110.1):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        keys = [cache.make_key(self.CacheMessage(name=str(i))) for i in range(3)]
+        cache.put(keys[0], b"0")
+        cache.put(keys[1], b"1")
+        cache.get(keys[0])
+        cache.put(keys[2], b"2")
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]), b"0")
+        self.assertEqual(cache.evictions, 1)
+
+        cache.put(keys[1], b"1234567890")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.bytes, 10)
+        cache.put(keys[0], b"too large response")
+        self.assertIsNone(cache.get(keys[0]))
+
+    def test_invalidate(self):
+        cache = ResponseCache(key_metadata=("x-tenant",))
+        request = self.CacheMessage(name="foo")
+        cache.put(cache.make_key(request, [("x-tenant", "foo")]), b"foo")
+        cache.put(cache.make_key(request, [("x-tenant", "bar")]), b"bar")
+        self.assertTrue(cache.invalidate(request, [("x-tenant", "foo")]))
+        self.assertFalse(cache.invalidate(request, [("x-tenant", "foo")]))
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual((len(cache), cache.bytes), (0, 0))
+
+
+class SingleFlightTestCase(TestGRPCAlchemy):
+    def setUp(self):
+        super().setUp()
+
+        class FlightMessage(Message):
+            name: str
+
+        self.FlightMessage = FlightMessage
+        self.generate_proto_file()
+
+    def test_join_and_leave(self):
+        single_flight = SingleFlight(key_metadata=("x-tenant",))
+        request = self.FlightMessage(name="foo")
+        key = single_flight.make_key(request, [("x-tenant", "foo")])
+        flight, leader = single_flight.join(key, object)
+        self.assertTrue(leader)
+        self.assertEqual(single_flight.join(key, object), (flight, False))
+        other = single_flight.make_key(request, [("x-tenant", "bar")])
+        self.assertTrue(single_flight.join(other, object)[1])
+        self.assertEqual(len(single_flight), 2)
+
+        single_flight.leave(key)
+        self.assertIsNot(single_flight.join(key, object)[0], flight)
+        self.assertEqual((single_flight.executions, single_flight.coalesced), (3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
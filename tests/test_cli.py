@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, exists, join
+
+from grpcalchemy.cli import import_string
+from grpcalchemy.config import DefaultConfig
+from grpcalchemy.utils import PROTO_MANIFEST_FILE
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+APP = """
+from grpcalchemy import Context, DefaultConfig, Server, grpcmethod
+from grpcalchemy.orm import Message
+
+
+class BuildMessage(Message):
+    name: str
+
+
+class BuildService(Server):
+    @grpcmethod
+    def Echo(self, request: BuildMessage, context: Context) -> BuildMessage:
+        return request
+
+
+class BuildConfig(DefaultConfig):
+    PROTO_TEMPLATE_PATH = "build_protos"
+"""
+
+#: Modules which are only imported once the features using them are enabled.
+LAZY_MODULES = [
+    "grpc_health.v1",
+    "grpc_reflection.v1alpha",
+    "grpc_tools.protoc",
+    "http.server",
+    "jinja2",
+    "numpy",
+    "pkg_resources",
+]
+
+
+def run_python(*args: str, cwd: str = ROOT) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+class CliTestCase(unittest.TestCase):
+    def test_import_string(self):
+        self.assertIs(DefaultConfig, import_string("grpcalchemy.config:DefaultConfig"))
+        self.assertIs(
+            DefaultConfig.__init__,
+            import_string("grpcalchemy.config:DefaultConfig.__init__"),
+        )
+        with self.assertRaises(ValueError):
+            import_string("grpcalchemy.config")
+
+    def test_build(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            with open(join(cwd, "app.py"), "w") as f:
+                f.write(APP)
+            result = run_python(
+                "-m",
+                "grpcalchemy.cli",
+                "build",
+                "app:BuildService",
+                "--config",
+                "app:BuildConfig",
+                cwd=cwd,
+            )
+            self.assertEqual(0, result.returncode, result.stderr)
+            manifest_path = join("build_protos", PROTO_MANIFEST_FILE)
+            self.assertIn(manifest_path, result.stdout)
+            for file in [
+                "buildservice.proto",
+                "buildservice_pb2.py",
+                "buildmessage_pb2.py",
+            ]:
+                self.assertTrue(exists(join(cwd, "build_protos", file)), file)
+            with open(join(cwd, manifest_path)) as f:
+                manifest = json.load(f)
+            self.assertEqual(
+                {"BuildMessage": ["string name"]},
+                manifest["files"]["buildmessage"]["messages"],
+            )
+            self.assertEqual(
+                {
+                    "BuildService": {
+                        "Echo": "rpc Echo (BuildMessage) returns (BuildMessage) {}"
+                    }
+                },
+                manifest["files"]["buildservice"]["services"],
+            )
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_lazy_imports(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            result = run_python(
+                "-c",
+                "import sys, grpcalchemy, grpcalchemy.cli;"
+                f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])",
+                cwd=cwd,
+            )
+            self.assertEqual(0, result.returncode, result.stderr)
+            self.assertEqual("[]", result.stdout.strip())
+            # no proto file is generated by importing
+            self.assertEqual([], os.listdir(cwd))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
 """Tests for `grpcalchemy` package."""
+import time
 import unittest
+from typing import Any, Callable, Dict, Iterable, Optional, Type
 
-from grpcalchemy import DefaultConfig
+from grpc import Channel, insecure_channel
+
+from grpcalchemy import DefaultConfig, Server
 from grpcalchemy.meta import __meta__
+from grpcalchemy.orm import Message
 from grpcalchemy.utils import generate_proto_file
 
 
@@ -29,3 +34,48 @@ class TestGRPCAlchemy(unittest.TestCase):
             template_path_root=cls.config.PROTO_TEMPLATE_ROOT,
             template_path=cls.config.PROTO_TEMPLATE_PATH,
         )
+
+
+class TestGRPCServer(TestGRPCAlchemy):
+    """Tests running the same checks against a sync and an async server."""
+
+    #: Options of :class:`TestConfig` with which the servers are run.
+    config_options: Dict[str, Any] = {}
+
+    def setUp(self):
+        super().setUp()
+        self.config = type("ServerTestConfig", (TestConfig,), self.config_options)()
+        #: The servers under test, declared by each test case.
+        self.services: Iterable[Type[Server]] = []
+
+    def run_services(
+        self,
+        check: Callable[[Server, Channel], None],
+        services: Optional[Iterable[Type[Server]]] = None,
+        config: Optional[DefaultConfig] = None,
+    ) -> None:
+        """Run each server in a sub test and call ``check`` with it and a
+        channel to it, the server is stopped afterwards."""
+        for service_cls in self.services if services is None else services:
+            with self.subTest(service_cls.__name__):
+                app = service_cls.run(config=config or self.config, block=False)
+                try:
+                    with insecure_channel("0.0.0.0:50051") as channel:
+                        check(app, channel)
+                finally:
+                    app.stop(0)
+
+    @staticmethod
+    def serializers(message_cls: Type[Message]) -> Dict[str, Callable]:
+        """The keyword arguments of a channel method to send and receive
+        ``message_cls``."""
+        return dict(
+            request_serializer=message_cls.gRPCMessageClass.SerializeToString,
+            response_deserializer=message_cls.gRPCMessageClass.FromString,
+        )
+
+    def wait_until(self, predicate: Callable[[], Any], timeout: float = 5) -> None:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
@@ -0,0 +1,101 @@
+import unittest
+
+from grpc import StatusCode
+
+from grpcalchemy.limiter import (
+    PUSHBACK_METADATA_KEY,
+    AdaptiveLimiter,
+    DeadlineShedder,
+    is_overload,
+)
+
+
+class AdaptiveLimiterTestCase(unittest.TestCase):
+    def test_acquire(self):
+        limiter = AdaptiveLimiter(initial_limit=2)
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        self.assertEqual(limiter.inflight, 2)
+        self.assertEqual(limiter.rejected, 1)
+
+        limiter.release(0.01)
+        self.assertEqual(limiter.inflight, 1)
+        self.assertTrue(limiter.acquire())
+
+    def test_limit_follows_latency(self):
+        limiter = AdaptiveLimiter(initial_limit=10, max_limit=50)
+        for _ in range(100):
+            for _ in range(int(limiter.limit)):
+                limiter.acquire()
+            for _ in range(limiter.inflight):
+                limiter.release(0.01)
+        self.assertEqual(limiter.limit, 50)
+
+        # the latency grows once the RPCs queue up behind a saturated resource
+        for _ in range(5):
+            for _ in range(int(limiter.limit)):
+                limiter.acquire()
+            for _ in range(limiter.inflight):
+                limiter.release(0.1)
+        self.assertLess(limiter.limit, 20)
+
+    def test_unused_limit_is_kept(self):
+        limiter = AdaptiveLimiter(initial_limit=10)
+        for _ in range(100):
+            limiter.acquire()
+            limiter.release(0.01)
+        self.assertEqual(limiter.limit, 10)
+
+    def test_dropped(self):
+        limiter = AdaptiveLimiter(initial_limit=10, min_limit=5, backoff_ratio=0.5)
+        limiter.acquire()
+        limiter.release(0.01, dropped=True)
+        self.assertEqual(limiter.limit, 5)
+        limiter.acquire()
+        limiter.release(0.01, dropped=True)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_is_overload(self):
+        self.assertTrue(is_overload(StatusCode.RESOURCE_EXHAUSTED))
+        self.assertTrue(is_overload(StatusCode.DEADLINE_EXCEEDED.value[0]))
+        self.assertFalse(is_overload(StatusCode.NOT_FOUND))
+        self.assertFalse(is_overload(None))
+
+    def test_pushback_metadata(self):
+        limiter = AdaptiveLimiter()
+        self.assertEqual(limiter.pushback_metadata(), ((PUSHBACK_METADATA_KEY, "1"),))
+        limiter.acquire()
+        limiter.release(0.25)
+        self.assertEqual(limiter.pushback_metadata(), ((PUSHBACK_METADATA_KEY, "250"),))
+
+
+class DeadlineShedderTestCase(unittest.TestCase):
+    def test_should_shed(self):
+        shedder = DeadlineShedder(ratio=1.0, smoothing=0.5)
+        self.assertFalse(shedder.should_shed(0.0))
+
+        shedder.observe(0.2)
+        shedder.observe(0.4)
+        self.assertAlmostEqual(shedder.latency, 0.3)
+        self.assertFalse(shedder.should_shed(None))
+        self.assertFalse(shedder.should_shed(0.5))
+        self.assertTrue(shedder.should_shed(0.1))
+        self.assertEqual(shedder.shed, 1)
+
+    def test_probe(self):
+        shedder = DeadlineShedder(smoothing=0.5, probe_interval=4)
+        shedder.observe(2.0)
+        shed = [shedder.should_shed(1.0) for _ in range(8)]
+        self.assertEqual(shed, [True, True, True, False] * 2)
+        self.assertEqual(shedder.shed, 6)
+
+        # the probes bring the typical latency back down
+        for _ in range(3):
+            shedder.observe(0.1)
+        self.assertLess(shedder.latency, 1.0)
+        self.assertFalse(shedder.should_shed(1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+from grpcalchemy.batch import Batcher
+from grpcalchemy.cache import ResponseCache, SingleFlight
+from grpcalchemy.limiter import AdaptiveLimiter, DeadlineShedder
+from grpcalchemy.metrics import MetricsRegistry
+from grpcalchemy.stream import Prefetcher
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+    def test_render(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics = registry.register("FooService", "Bar", False, True)
+        metrics.start()
+        metrics.observe("OK", 0.05, 1, 3)
+        metrics.start()
+        metrics.observe("NOT_FOUND", 0.5, 1, 0)
+
+        labels = 'grpc_type="server_stream",grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        for line in (
+            f"grpc_server_started_total{{{labels}}} 2",
+            f'grpc_server_handled_total{{{labels},grpc_code="NOT_FOUND"}} 1',
+            f'grpc_server_handled_total{{{labels},grpc_code="OK"}} 1',
+            f"grpc_server_msg_received_total{{{labels}}} 2",
+            f"grpc_server_msg_sent_total{{{labels}}} 3",
+            f'grpc_server_handling_seconds_bucket{{{labels},le="0.1"}} 1',
+            f'grpc_server_handling_seconds_bucket{{{labels},le="1.0"}} 2',
+            f'grpc_server_handling_seconds_bucket{{{labels},le="+Inf"}} 2',
+            f"grpc_server_handling_seconds_sum{{{labels}}} 0.55",
+            f"grpc_server_handling_seconds_count{{{labels}}} 2",
+        ):
+            self.assertIn(line, text.splitlines())
+
+    def test_render_limiters(self):
+        registry = MetricsRegistry()
+        limiter = AdaptiveLimiter(initial_limit=1)
+        registry.register_limiter("FooService", "Bar", limiter)
+        limiter.acquire()
+        limiter.acquire()
+
+        labels = 'grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        for line in (
+            f"grpcalchemy_limiter_limit{{{labels}}} 1",
+            f"grpcalchemy_limiter_inflight{{{labels}}} 1",
+            f"grpcalchemy_limiter_rejected_total{{{labels}}} 1",
+        ):
+            self.assertIn(line, text.splitlines())
+
+    def test_render_shedders(self):
+        registry = MetricsRegistry()
+        shedder = DeadlineShedder()
+        registry.register_shedder("FooService", "Bar", shedder)
+        shedder.observe(1.0)
+        shedder.should_shed(0.5)
+
+        self.assertIn(
+            'grpcalchemy_deadline_shed_total{grpc_service="FooService",grpc_method="Bar"} 1',
+            registry.render().splitlines(),
+        )
+
+    def test_render_caches(self):
+        registry = MetricsRegistry()
+        cache = ResponseCache(max_entries=1)
+        registry.register_cache("FooService", "Bar", cache)
+        cache.get(((), b"foo"))
+        cache.put(((), b"foo"), b"foo")
+        cache.put(((), b"bar"), b"bar")
+        cache.get(((), b"bar"))
+
+        labels = 'grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        for line in (
+            f"grpcalchemy_cache_hits_total{{{labels}}} 1",
+            f"grpcalchemy_cache_misses_total{{{labels}}} 1",
+            f"grpcalchemy_cache_evictions_total{{{labels}}} 1",
+            f"grpcalchemy_cache_bytes{{{labels}}} 3",
+        ):
+            self.assertIn(line, text.splitlines())
+
+    def test_render_single_flights(self):
+        registry = MetricsRegistry()
+        single_flight = SingleFlight()
+        registry.register_single_flight("FooService", "Bar", single_flight)
+        single_flight.join(((), b"foo"), object)
+        single_flight.join(((), b"foo"), object)
+
+        labels = 'grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        self.assertIn(
+            f"grpcalchemy_single_flight_executions_total{{{labels}}} 1",
+            text.splitlines(),
+        )
+        self.assertIn(
+            f"grpcalchemy_single_flight_coalesced_total{{{labels}}} 1",
+            text.splitlines(),
+        )
+
+    def test_render_batchers(self):
+        registry = MetricsRegistry()
+        batcher = Batcher()
+        registry.register_batcher("FooService", "Bar", batcher)
+        batcher.batches, batcher.batched, batcher.expired = 2, 5, 1
+
+        labels = 'grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        for line in (
+            f"grpcalchemy_batches_total{{{labels}}} 2",
+            f"grpcalchemy_batched_requests_total{{{labels}}} 5",
+            f"grpcalchemy_batch_expired_total{{{labels}}} 1",
+        ):
+            self.assertIn(line, text.splitlines())
+
+    def test_render_prefetchers(self):
+        registry = MetricsRegistry()
+        prefetcher = Prefetcher()
+        registry.register_prefetcher("FooService", "Bar", prefetcher)
+        prefetcher.blocked_seconds = 1.5
+
+        labels = 'grpc_service="FooService",grpc_method="Bar"'
+        text = registry.render()
+        for line in (
+            f"grpcalchemy_prefetch_queue_occupancy{{{labels}}} 0",
+            f"grpcalchemy_prefetch_blocked_seconds_total{{{labels}}} 1.5",
+        ):
+            self.assertIn(line, text.splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
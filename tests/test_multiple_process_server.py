@@ -1,4 +1,5 @@
 import multiprocessing
+import signal
 import sys
 import time
 import unittest
@@ -35,8 +36,8 @@ class MultipleProcessServerTestCase(TestGRPCAlchemy):
         unittest_self.app = TestService
 
     def tearDown(self) -> None:
-        for work in self.app.workers:
-            work.terminate()
+        self.app.supervisor.stop()
+        self.app.supervisor.join()
 
     def _send_request(self):
         from protos.testservice_pb2_grpc import TestServiceStub
@@ -61,6 +62,22 @@ class MultipleProcessServerTestCase(TestGRPCAlchemy):
         end = time.perf_counter()
         self.assertLess(end - start, 4)
 
+    def test_respawn_without_block(self):
+        status = self.app.supervisor.status[0]
+        first_worker = status.process
+        first_worker.terminate()
+        first_worker.join()
+        # respawned by the background supervisor after the default backoff
+        for _ in range(50):
+            if status.restarts and status.alive:
+                break
+            time.sleep(0.1)
+        self.assertEqual(1, status.restarts)
+        self.assertEqual(-signal.SIGTERM, status.last_exitcode)
+        self.assertIsNot(first_worker, status.process)
+        self.assertIn(status.process, self.app.workers)
+        self.assertTrue(status.alive)
+
 
 if __name__ == "__main__":
     unittest.main()
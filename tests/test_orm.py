@@ -1,8 +1,15 @@
+import importlib.util
 import json
+import unittest
+from array import array
+
+from google.protobuf.json_format import MessageToDict, MessageToJson
 
 from grpcalchemy.orm import (
+    BaseField,
     BooleanField,
     BytesField,
+    FloatField,
     Int32Field,
     Int64Field,
     RepeatedField,
@@ -11,9 +18,12 @@ from grpcalchemy.orm import (
     ReferenceField,
     StringField,
 )
+from grpcalchemy.meta import __meta__
 from grpcalchemy.types import Map, Repeated
 from tests.test_grpcalchemy import TestGRPCAlchemy
 
+numpy_spec = importlib.util.find_spec("numpy")
+
 
 class TestORMMessage(Message):
     __filename__ = "test_orm"
@@ -54,6 +64,63 @@ class CompositeMessageTyping(TestORMMessage):
     map_field: Map[str, SimpleMessage]
 
 
+class VectorMessage(TestORMMessage):
+    name: str
+    floats: Repeated[FloatField]
+    doubles: Repeated[float]
+    ints: Repeated[Int64Field]
+    flags: Repeated[bool]
+
+
+class PostRow(TestORMMessage):
+    title: str
+    score: float
+    author: SimpleMessage
+    tags: Repeated[str]
+    comments: Map[str, SimpleMessage]
+
+
+class PostTable(TestORMMessage):
+    name: str
+    posts: Repeated[PostRow]
+
+
+class UInt32Field(BaseField):
+    __type_name__ = "uint32"
+
+
+class JSONMessage(TestORMMessage):
+    title: str
+    raw_data: bytes
+    score: float
+    ratio = FloatField()
+    big_number = Int64Field()
+    ref_field: SimpleMessage
+    empty_ref_field: SimpleMessage
+    tags: Repeated[str]
+    ratios: Repeated[FloatField]
+    big_numbers: Repeated[Int64Field]
+    posts: Repeated[SimpleMessage]
+    counts: Map[str, int]
+    flags: Map[bool, Int64Field]
+    numbered_posts: Map[int, SimpleMessage]
+
+
+class UnmodeledMessage(TestORMMessage):
+    count = UInt32Field()
+    ref_field: JSONMessage
+
+
+class DictMessage(TestORMMessage):
+    __slots__ = ("__dict__",)
+
+    name: str
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = {}
+
+
 TestGRPCAlchemy.generate_proto_file()
 
 
@@ -133,3 +200,213 @@ class ORMTestCase(TestGRPCAlchemy):
             self.assertEqual(message.__message__, message_cls(**dict_test).__message__)
             self.assertDictEqual(dict_test, message.message_to_dict())
             self.assertDictEqual(dict_test, json.loads(message.message_to_json()))
+
+    def test_from_grpc_message(self):
+        grpc_message = SimpleMessage(name="Test").__message__
+        message = SimpleMessage.from_grpc_message(grpc_message)
+        self.assertIsInstance(message, SimpleMessage)
+        self.assertIs(grpc_message, message.__message__)
+        self.assertEqual("Test", message.name)
+
+    def test_bytes(self):
+        data = SimpleMessage(name="Test").to_bytes()
+        self.assertEqual(
+            data, SimpleMessage(name="Test").__message__.SerializeToString()
+        )
+        self.assertEqual("Test", SimpleMessage.from_bytes(data).name)
+
+    def test_lazy_bytes(self):
+        data = SimpleMessage(name="Test").to_bytes()
+        message = SimpleMessage.from_lazy_bytes(data)
+        self.assertIsInstance(message, SimpleMessage)
+        self.assertIs(data, message.to_bytes())
+        self.assertEqual("Test", message.name)
+        self.assertIs(message.__message__, message.__message__)
+        message.name = "Changed"
+        self.assertEqual(
+            SimpleMessage(name="Changed").to_bytes(),
+            message.to_bytes(),
+        )
+        self.assertIs(type(SimpleMessage.from_lazy_bytes(data)), type(message))
+        self.assertNotIn(type(message), __meta__[SimpleMessage.__filename__].messages)
+
+    def test_generated_init(self):
+        for message_cls in [CompositeMessage, CompositeMessageTyping]:
+            self.assertIsNot(message_cls.__init__, Message.__init__)
+            message = message_cls(
+                ref_field={"name": "ref"},
+                list_test_field=[SimpleMessage(name="1"), {"name": "2"}],
+                list_int_field=(i for i in range(3)),
+                map_field={"a": SimpleMessage(name="a"), "b": {"name": "b"}},
+            )
+            self.assertEqual("ref", message.ref_field.name)
+            self.assertEqual(["1", "2"], [m.name for m in message.list_test_field])
+            self.assertEqual([0, 1, 2], list(message.list_int_field))
+            self.assertEqual("b", message.map_field["b"].name)
+            self.assertEqual(
+                message.__message__,
+                message_cls.from_dict(message.message_to_dict()).__message__,
+            )
+
+        class CustomInitMessage(TestORMMessage):
+            name: str
+
+            def __init__(self, name: str):
+                super().__init__(name=name.upper())
+
+        class ChildMessage(CustomInitMessage):
+            ...
+
+        self.assertIs(ChildMessage.__init__, CustomInitMessage.__init__)
+
+    def test_add_rows(self):
+        rows = [
+            ("1", 0.5, SimpleMessage(name="a"), ["x"], {"c": SimpleMessage()}),
+            (None, 1.5, {"name": "b"}, [], {}),
+        ]
+        expected = PostTable(
+            posts=[
+                PostRow(
+                    title=title,
+                    score=score,
+                    author=author,
+                    tags=tags,
+                    comments=comments,
+                )
+                for title, score, author, tags, comments in rows
+            ]
+        )
+        table = PostTable(name="table")
+        table.add_rows("posts", rows)
+        self.assertEqual("table", table.name)
+        self.assertEqual(expected.__message__.posts, table.__message__.posts)
+
+        table = PostTable()
+        table.add_rows("posts", [("1", 0.5), ("2", 1.5)], fields=["title", "score"])
+        table.add_columns("posts", {"score": [2.5], "author": [{"name": "c"}]})
+        self.assertEqual(
+            [("1", 0.5, ""), ("2", 1.5, ""), ("", 2.5, "c")],
+            [(post.title, post.score, post.author.name) for post in table.posts],
+        )
+
+        with self.assertRaises(TypeError):
+            table.add_rows("name", [])
+        with self.assertRaises(ValueError):
+            table.add_rows("posts", [], fields=["undefined"])
+        with self.assertRaises(ValueError):
+            table.add_columns("posts", {"title": ["1"], "score": []})
+
+    @unittest.skipIf(numpy_spec is None, "NumPy is not installed")
+    def test_add_columns_ndarray(self):
+        import numpy
+
+        table = PostTable()
+        table.add_columns(
+            "posts",
+            {"title": numpy.array(["1", "2"]), "score": numpy.arange(2) / 2},
+        )
+        table.add_rows("posts", numpy.array([[3.0]]), fields=["score"])
+        self.assertEqual(
+            [("1", 0.0), ("2", 0.5), ("", 3.0)],
+            [(post.title, post.score) for post in table.posts],
+        )
+
+    def test_message_to_dict(self):
+        message = JSONMessage(
+            title="title",
+            raw_data=b"\x00\xff",
+            score=float("inf"),
+            ratio=0.1,
+            big_number=2**40,
+            ref_field=SimpleMessage(name="ref"),
+            tags=["a", "b"],
+            ratios=[0.1, float("nan"), float("-inf")],
+            big_numbers=[-1, 2**40],
+            posts=[SimpleMessage(name="post"), SimpleMessage()],
+            counts={"a": 1},
+            flags={True: 1, False: 2**40},
+            numbered_posts={1: SimpleMessage(name="1")},
+        )
+        messages = [
+            message,
+            JSONMessage(score=-0.0, ref_field=SimpleMessage()),
+            JSONMessage(),
+            UnmodeledMessage(count=1, ref_field=message),
+        ]
+        for message in messages:
+            for including_default_value_fields in [True, False]:
+                for preserving_proto_field_name in [True, False]:
+                    options = dict(
+                        including_default_value_fields=including_default_value_fields,
+                        preserving_proto_field_name=preserving_proto_field_name,
+                    )
+                    with self.subTest(message=message, **options):
+                        expected = MessageToDict(message.__message__, **options)
+                        self.assertEqual(expected, message.message_to_dict(**options))
+                        # the keys are in the order of json_format
+                        self.assertEqual(
+                            list(expected), list(message.message_to_dict(**options))
+                        )
+                        self.assertEqual(
+                            MessageToJson(message.__message__, **options),
+                            message.message_to_json(**options),
+                        )
+        self.assertEqual(
+            "JSONMessage.to_dict", JSONMessage.__to_dict__[True, True].__qualname__
+        )
+        self.assertIsNone(UnmodeledMessage.__to_dict__[True, True])
+
+    def test_array(self):
+        message = VectorMessage(name="vector", floats=[9.0])
+        message.set_array("floats", array("f", [0.5, 1.5, 2.5]))
+        message.set_array("doubles", [0.1, 0.2])
+        message.set_array("ints", array("q", [1, -2, 2**40]))
+        message.set_array("flags", array("B", [1, 0]))
+        self.assertEqual(array("f", [0.5, 1.5, 2.5]), message.get_array("floats"))
+        self.assertEqual(array("d", [0.1, 0.2]), message.get_array("doubles"))
+        self.assertEqual(array("q", [1, -2, 2**40]), message.get_array("ints"))
+        self.assertEqual(array("B", [1, 0]), message.get_array("flags"))
+        self.assertEqual([True, False], list(message.flags))
+        self.assertEqual("vector", message.name)
+
+        message = VectorMessage.from_bytes(message.to_bytes())
+        self.assertEqual([0.5, 1.5, 2.5], list(message.floats))
+        self.assertEqual(array("d", [0.1, 0.2]), message.get_array("doubles"))
+
+        message.set_array("floats", [])
+        self.assertEqual(array("f"), message.get_array("floats"))
+        for name in ["name", "undefined"]:
+            with self.assertRaises(TypeError):
+                message.get_array(name)
+
+    @unittest.skipIf(numpy_spec is None, "NumPy is not installed")
+    def test_ndarray(self):
+        import numpy
+
+        message = VectorMessage()
+        floats = numpy.arange(10000, dtype=numpy.float32)
+        message.set_array("floats", floats)
+        # converted from another dtype or a non-contiguous array
+        message.set_array("doubles", numpy.arange(10))
+        message.set_array("ints", numpy.arange(10)[::2])
+        message.set_array("flags", numpy.array([True, False]))
+        numpy.testing.assert_array_equal(floats, message.get_ndarray("floats"))
+        self.assertEqual(numpy.float32, message.get_ndarray("floats").dtype)
+        numpy.testing.assert_array_equal(
+            numpy.arange(10), message.get_ndarray("doubles")
+        )
+        numpy.testing.assert_array_equal([0, 2, 4, 6, 8], message.get_ndarray("ints"))
+        numpy.testing.assert_array_equal([True, False], message.get_ndarray("flags"))
+        self.assertEqual(10000, len(message.floats))
+
+    def test_message_without_instance_dict(self):
+        for message in [SimpleMessage(name="Test"), CompositeMessageTyping()]:
+            self.assertFalse(hasattr(message, "__dict__"))
+            with self.assertRaises(AttributeError):
+                message.undefined_field = "Test"
+
+    def test_message_with_instance_dict(self):
+        message = DictMessage(name="Test")
+        message.extra = 1
+        self.assertEqual({"cache": {}, "extra": 1}, message.__dict__)
+        self.assertEqual("Test", message.name)
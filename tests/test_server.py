@@ -1,17 +1,40 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
 from typing import Callable, ContextManager, List, Type
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from urllib.request import urlopen
 
 from google.protobuf.json_format import MessageToDict
-from grpc import insecure_channel
-from grpc_health.v1.health_pb2 import HealthCheckRequest
+from grpc import RpcError, StatusCode, channel_ready_future, insecure_channel
+from grpc_health.v1.health_pb2 import HealthCheckRequest, HealthCheckResponse
 from grpc_health.v1.health_pb2_grpc import HealthStub
 from grpc_reflection.v1alpha.reflection_pb2 import ServerReflectionRequest
 from grpc_reflection.v1alpha.reflection_pb2_grpc import ServerReflectionStub
 
-from grpcalchemy import Blueprint, Context, Server, grpcmethod, DefaultConfig, Streaming
+from grpcalchemy import (
+    AsyncServer,
+    Blueprint,
+    Context,
+    Server,
+    grpcmethod,
+    DefaultConfig,
+    Streaming,
+)
+from grpcalchemy.batch import Batcher
+from grpcalchemy.blueprint import InvalidRPCMethod
+from grpcalchemy.cache import ResponseCache, SingleFlight
+from grpcalchemy.executor import BoundedThreadPoolExecutor
+from grpcalchemy.limiter import DEADLINE_SHED_DETAILS
 from grpcalchemy.orm import Message
+from grpcalchemy.stream import Prefetcher
 from grpcalchemy.types import Map, Repeated
-from tests.test_grpcalchemy import TestGRPCAlchemy
+from tests.test_grpcalchemy import TestConfig, TestGRPCAlchemy, TestGRPCServer
 
 
 class ServerTestCase(TestGRPCAlchemy):
@@ -213,6 +236,326 @@ class ServerTestCase(TestGRPCAlchemy):
         self.assertEqual(4, self.enter_context.call_count)
 
 
+class AsyncServerTestCase(TestGRPCAlchemy):
+    def setUp(unittest_self):
+        super().setUp()
+
+        server_stop = Mock()
+        app_process_request = Mock()
+        blueprint_after_request = Mock()
+        enter_context = Mock()
+
+        class AsyncTestMessage(Message):
+            __filename__ = "test_async_server"
+            name: str
+            names: Repeated[str]
+
+        class AsyncAppContext:
+            async def __aenter__(self):
+                enter_context()
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                pass
+
+        class AsyncAppService(AsyncServer):
+            def after_server_stop(self):
+                server_stop()
+
+            async def process_request(
+                self, request: AsyncTestMessage, context: Context
+            ) -> AsyncTestMessage:
+                app_process_request()
+                return request
+
+            def app_context(
+                self,
+                current_service: Blueprint,
+                current_method: Callable,
+                context: Context,
+            ):
+                return AsyncAppContext()
+
+            @classmethod
+            def get_blueprints(cls) -> List[Type[Blueprint]]:
+                return [AsyncBlueprintService]
+
+        class AsyncBlueprintService(Blueprint):
+            @grpcmethod
+            async def UnaryUnary(
+                self, request: AsyncTestMessage, context: Context
+            ) -> AsyncTestMessage:
+                await asyncio.sleep(0)
+                return AsyncTestMessage(name=request.name)
+
+            @grpcmethod
+            async def UnaryStream(
+                self, request: AsyncTestMessage, context: Context
+            ) -> Streaming[AsyncTestMessage]:
+                for _ in range(2):
+                    yield AsyncTestMessage(name=request.name)
+
+            @grpcmethod
+            async def StreamUnary(
+                self, request: Streaming[AsyncTestMessage], context: Context
+            ) -> AsyncTestMessage:
+                return AsyncTestMessage(names=[r.name async for r in request])
+
+            @grpcmethod
+            async def StreamStream(
+                self, request: Streaming[AsyncTestMessage], context: Context
+            ) -> Streaming[AsyncTestMessage]:
+                async for r in request:
+                    yield AsyncTestMessage(name=r.name)
+
+            async def after_request(
+                self, response: AsyncTestMessage, context: Context
+            ) -> AsyncTestMessage:
+                blueprint_after_request()
+                return response
+
+        unittest_self.app = AsyncAppService.run(
+            config=unittest_self.config, block=False
+        )
+        unittest_self.server_stop = server_stop
+        unittest_self.app_process_request = app_process_request
+        unittest_self.blueprint_after_request = blueprint_after_request
+        unittest_self.enter_context = enter_context
+
+    def tearDown(self):
+        self.app.stop(0)
+        self.assertEqual(1, self.server_stop.call_count)
+        super().tearDown()
+
+    def test_async_server(self):
+        from protos.asyncblueprintservice_pb2_grpc import AsyncBlueprintServiceStub
+        from protos.test_async_server_pb2 import AsyncTestMessage
+
+        with insecure_channel("0.0.0.0:50051") as channel:
+            stub = AsyncBlueprintServiceStub(channel)
+            response = stub.UnaryUnary(AsyncTestMessage(name="unary_unary"))
+            self.assertEqual("unary_unary", response.name)
+            self.assertEqual(1, self.app_process_request.call_count)
+            self.assertEqual(1, self.blueprint_after_request.call_count)
+
+            responses = list(stub.UnaryStream(AsyncTestMessage(name="unary_stream")))
+            self.assertEqual(["unary_stream"] * 2, [r.name for r in responses])
+            self.assertEqual(2, self.app_process_request.call_count)
+
+            response = stub.StreamUnary(
+                iter([AsyncTestMessage(name="a"), AsyncTestMessage(name="b")])
+            )
+            self.assertEqual(["a", "b"], list(response.names))
+            self.assertEqual(2, self.blueprint_after_request.call_count)
+
+            responses = list(
+                stub.StreamStream(
+                    iter([AsyncTestMessage(name="a"), AsyncTestMessage(name="b")])
+                )
+            )
+            self.assertEqual(["a", "b"], [r.name for r in responses])
+
+            self.assertEqual(1, HealthStub(channel).Check(HealthCheckRequest()).status)
+
+        self.assertEqual(4, self.enter_context.call_count)
+
+
+class InMemoryProtoServerTestCase(TestGRPCAlchemy):
+    def setUp(self) -> None:
+        super().setUp()
+
+        class InMemoryNestedMessage(Message):
+            __filename__ = "in_memory_nested"
+            tags: Repeated[str]
+
+        class InMemoryMessage(Message):
+            __filename__ = "in_memory"
+            name: str
+            count: int
+            nested: InMemoryNestedMessage
+            map_field: Map[str, InMemoryNestedMessage]
+
+        class InMemoryService(Server):
+            @grpcmethod
+            def GetSomething(
+                self, request: InMemoryMessage, context: Context
+            ) -> InMemoryMessage:
+                return request
+
+            @grpcmethod
+            def ListSomething(
+                self, request: InMemoryMessage, context: Context
+            ) -> Streaming[InMemoryNestedMessage]:
+                for tag in request.nested.tags:
+                    yield InMemoryNestedMessage(tags=[tag])
+
+        class InMemoryConfig(TestConfig):
+            PROTO_IN_MEMORY = True
+            PROTO_TEMPLATE_PATH = "in_memory_protos"
+
+        self.message_cls = InMemoryMessage
+        self.nested_message_cls = InMemoryNestedMessage
+        self.app = InMemoryService.run(config=InMemoryConfig(), block=False)
+
+    def tearDown(self):
+        self.app.stop(0)
+        super().tearDown()
+
+    def test_server_with_in_memory_proto(self):
+        self.assertFalse(os.path.exists("in_memory_protos"))
+        request = self.message_cls(
+            name="test",
+            count=1,
+            nested={"tags": ["a", "b"]},
+            map_field={"key": {"tags": ["c"]}},
+        ).__message__
+        with insecure_channel("0.0.0.0:50051") as channel:
+            response = channel.unary_unary(
+                "/InMemoryService/GetSomething",
+                request_serializer=self.message_cls.gRPCMessageClass.SerializeToString,
+                response_deserializer=self.message_cls.gRPCMessageClass.FromString,
+            )(request)
+            self.assertEqual(request, response)
+            self.assertEqual(["c"], response.map_field["key"].tags)
+
+            responses = channel.unary_stream(
+                "/InMemoryService/ListSomething",
+                request_serializer=self.message_cls.gRPCMessageClass.SerializeToString,
+                response_deserializer=self.nested_message_cls.gRPCMessageClass.FromString,
+            )(request)
+            self.assertEqual([["a"], ["b"]], [r.tags for r in responses])
+
+            reflection_response = next(
+                ServerReflectionStub(channel).ServerReflectionInfo(
+                    iter(
+                        [
+                            ServerReflectionRequest(
+                                file_containing_symbol="InMemoryService"
+                            )
+                        ]
+                    )
+                )
+            )
+            self.assertTrue(
+                reflection_response.file_descriptor_response.file_descriptor_proto
+            )
+            reflection_response = next(
+                ServerReflectionStub(channel).ServerReflectionInfo(
+                    iter(
+                        [
+                            ServerReflectionRequest(
+                                file_containing_symbol="grpc.health.v1.Health"
+                            )
+                        ]
+                    )
+                )
+            )
+            self.assertTrue(
+                reflection_response.file_descriptor_response.file_descriptor_proto
+            )
+
+
+class GracefulStopServerTestCase(TestGRPCServer):
+    config_options = dict(PROTO_IN_MEMORY=True)
+
+    def setUp(unittest_self):
+        super().setUp()
+        unittest_self.events = []
+        unittest_self.started = threading.Event()
+
+        class GracefulMessage(Message):
+            name: str
+
+        class GracefulService(Server):
+            @grpcmethod
+            def Sleep(
+                self, request: GracefulMessage, context: Context
+            ) -> GracefulMessage:
+                unittest_self.started.set()
+                time.sleep(0.5)
+                unittest_self.events.append("rpc")
+                return request
+
+            def after_server_stop(self):
+                unittest_self.events.append("after_server_stop")
+
+        class AsyncGracefulService(AsyncServer):
+            @grpcmethod
+            async def Sleep(
+                self, request: GracefulMessage, context: Context
+            ) -> GracefulMessage:
+                unittest_self.started.set()
+                await asyncio.sleep(0.5)
+                unittest_self.events.append("rpc")
+                return request
+
+            def after_server_stop(self):
+                unittest_self.events.append("after_server_stop")
+
+        unittest_self.services = [GracefulService, AsyncGracefulService]
+
+    def test_graceful_stop(self):
+        def check(app, channel):
+            self.events.clear()
+            self.started.clear()
+            future = channel.unary_unary(f"/{type(app).__name__}/Sleep").future(b"")
+            self.assertTrue(self.started.wait(5))
+            app.graceful_stop(grace=5)
+            self.assertEqual(b"", future.result())
+            self.assertEqual(["rpc", "after_server_stop"], self.events)
+            response = app.health_servicer.Check(HealthCheckRequest(), None)
+            if isinstance(app, AsyncServer):
+                self.assertTrue(app.loop.is_closed())
+                response = asyncio.run(response)
+            self.assertEqual(HealthCheckResponse.NOT_SERVING, response.status)
+
+        self.run_services(check)
+
+    def test_graceful_stop_on_signal(self):
+        script = """
+import asyncio
+import time
+from grpcalchemy import AsyncServer, Context, DefaultConfig, Server, grpcmethod
+from grpcalchemy.orm import Message
+
+class GracefulMessage(Message):
+    name: str
+
+class GracefulService(Server):
+    @grpcmethod
+    def Sleep(self, request: GracefulMessage, context: Context) -> GracefulMessage:
+        time.sleep(0.5)
+        return request
+
+class AsyncGracefulService(AsyncServer):
+    @grpcmethod
+    async def Sleep(self, request: GracefulMessage, context: Context) -> GracefulMessage:
+        await asyncio.sleep(0.5)
+        return request
+
+class GracefulConfig(DefaultConfig):
+    PROTO_IN_MEMORY = True
+    GRPC_SERVER_PORT = 50052
+
+{service}.run(config=GracefulConfig(), block=True)
+"""
+        for service in ("GracefulService", "AsyncGracefulService"):
+            with self.subTest(service):
+                process = subprocess.Popen(
+                    [sys.executable, "-c", script.format(service=service)],
+                    stdout=subprocess.DEVNULL,
+                )
+                try:
+                    with insecure_channel("127.0.0.1:50052") as channel:
+                        channel_ready_future(channel).result(timeout=10)
+                        future = channel.unary_unary(f"/{service}/Sleep").future(b"")
+                        time.sleep(0.2)
+                        process.send_signal(signal.SIGTERM)
+                        self.assertEqual(b"", future.result(timeout=10))
+                    self.assertEqual(0, process.wait(10))
+                finally:
+                    process.kill()
+
+
 class InstalledProtoServerTestCase(TestGRPCAlchemy):
     def setUp(self) -> None:
         class SimpleAPIleMessage(Message):
@@ -247,3 +590,701 @@ class InstalledProtoServerTestCase(TestGRPCAlchemy):
             request = SimpleAPIleMessage(name="test")
             response = APIServiceStub(channel).GetSomething(request)
             self.assertEqual(request, response)
+
+
+class MetricsServerTestCase(TestGRPCServer):
+    config_options = dict(
+        PROTO_IN_MEMORY=True, GRPC_METRICS_ENABLE=True, GRPC_METRICS_PORT=50060
+    )
+
+    def setUp(self):
+        super().setUp()
+
+        class MetricsMessage(Message):
+            name: str
+
+        class MetricsService(Server):
+            @grpcmethod
+            def UnaryUnary(
+                self, request: MetricsMessage, context: Context
+            ) -> MetricsMessage:
+                return request
+
+            @grpcmethod
+            def StreamStream(
+                self, request: Streaming[MetricsMessage], context: Context
+            ) -> Streaming[MetricsMessage]:
+                for r in request:
+                    yield r
+
+            @grpcmethod
+            def Abort(
+                self, request: MetricsMessage, context: Context
+            ) -> MetricsMessage:
+                context.abort(StatusCode.NOT_FOUND, "not found")
+
+        class AsyncMetricsService(AsyncServer):
+            @grpcmethod
+            async def UnaryUnary(
+                self, request: MetricsMessage, context: Context
+            ) -> MetricsMessage:
+                return request
+
+            @grpcmethod
+            async def StreamStream(
+                self, request: Streaming[MetricsMessage], context: Context
+            ) -> Streaming[MetricsMessage]:
+                async for r in request:
+                    yield r
+
+            @grpcmethod
+            async def Abort(
+                self, request: MetricsMessage, context: Context
+            ) -> MetricsMessage:
+                await context.abort(StatusCode.NOT_FOUND, "not found")
+
+        self.services = [MetricsService, AsyncMetricsService]
+
+    def test_metrics(self):
+        def check(app, channel):
+            service = type(app).__name__
+            channel.unary_unary(f"/{service}/UnaryUnary")(b"")
+            list(channel.stream_stream(f"/{service}/StreamStream")(iter([b""] * 3)))
+            with self.assertRaises(RpcError):
+                channel.unary_unary(f"/{service}/Abort")(b"")
+
+            with urlopen("http://127.0.0.1:50060/metrics") as response:
+                text = response.read().decode("utf-8").splitlines()
+            unary = f'grpc_type="unary",grpc_service="{service}"'
+            bidi = f'grpc_type="bidi_stream",grpc_service="{service}"'
+            for line in (
+                f'grpc_server_handled_total{{{unary},grpc_method="UnaryUnary",grpc_code="OK"}} 1',
+                f'grpc_server_msg_sent_total{{{unary},grpc_method="UnaryUnary"}} 1',
+                f'grpc_server_handled_total{{{bidi},grpc_method="StreamStream",grpc_code="OK"}} 1',
+                f'grpc_server_msg_received_total{{{bidi},grpc_method="StreamStream"}} 3',
+                f'grpc_server_msg_sent_total{{{bidi},grpc_method="StreamStream"}} 3',
+                f'grpc_server_handled_total{{{unary},grpc_method="Abort",grpc_code="NOT_FOUND"}} 1',
+                f'grpc_server_handling_seconds_count{{{unary},grpc_method="Abort"}} 1',
+            ):
+                self.assertIn(line, text)
+
+        self.run_services(check)
+
+
+class ExecutorServerTestCase(TestGRPCServer):
+    config_options = dict(
+        PROTO_IN_MEMORY=True, GRPC_METRICS_ENABLE=True, GRPC_METRICS_PORT=50061
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        entered, release = self.entered, self.release
+
+        class ExecutorMessage(Message):
+            name: str
+
+        class SlowService(Blueprint):
+            max_workers = 1
+            max_queue_size = 0
+
+            @grpcmethod
+            def Slow(
+                self, request: ExecutorMessage, context: Context
+            ) -> ExecutorMessage:
+                entered.set()
+                release.wait(10)
+                return request
+
+            @grpcmethod(max_workers=2)
+            def Report(
+                self, request: ExecutorMessage, context: Context
+            ) -> ExecutorMessage:
+                return request
+
+        class FastService(Server):
+            @classmethod
+            def get_blueprints(cls):
+                return [SlowService]
+
+            @grpcmethod
+            def Fast(
+                self, request: ExecutorMessage, context: Context
+            ) -> ExecutorMessage:
+                return request
+
+        class AsyncFastService(AsyncServer):
+            @classmethod
+            def get_blueprints(cls):
+                return [SlowService]
+
+        self.async_service = AsyncFastService
+        self.app = FastService.run(config=self.config, block=False)
+
+    def tearDown(self):
+        self.release.set()
+        self.app.stop(0)
+        super().tearDown()
+
+    def test_bulkhead(self):
+        slow_bp = self.app.blueprints["SlowService"]
+        self.assertIsInstance(
+            slow_bp.Slow.experimental_thread_pool, BoundedThreadPoolExecutor
+        )
+        self.assertEqual(slow_bp.Slow.experimental_thread_pool.max_workers, 1)
+        self.assertEqual(slow_bp.Report.experimental_thread_pool.max_workers, 2)
+        self.assertFalse(hasattr(self.app.Fast, "experimental_thread_pool"))
+
+        with insecure_channel("0.0.0.0:50051") as channel:
+            slow = channel.unary_unary("/SlowService/Slow")
+            future = slow.future(b"")
+            self.assertTrue(self.entered.wait(5))
+
+            with self.assertRaises(RpcError) as cm:
+                slow(b"", timeout=5)
+            self.assertEqual(cm.exception.code(), StatusCode.RESOURCE_EXHAUSTED)
+
+            # the other services are not starved by the exhausted one
+            channel.unary_unary("/FastService/Fast")(b"", timeout=5)
+            channel.unary_unary("/SlowService/Report")(b"", timeout=5)
+
+            self.release.set()
+            future.result(timeout=5)
+
+        with urlopen("http://127.0.0.1:50061/metrics") as response:
+            text = response.read().decode("utf-8").splitlines()
+        for line in (
+            'grpcalchemy_executor_queue_depth{executor="SlowService"} 0',
+            'grpcalchemy_executor_max_workers{executor="SlowService"} 1',
+            'grpcalchemy_executor_max_workers{executor="SlowService.Report"} 2',
+            'grpcalchemy_executor_rejected_total{executor="SlowService"} 1',
+        ):
+            self.assertIn(line, text)
+
+    def test_async_server(self):
+        app = self.async_service(self.config)
+        app.register_blueprint(self.async_service.get_blueprints()[0])
+        with self.assertRaisesRegex(
+            InvalidRPCMethod, "not supported by AsyncFastService"
+        ):
+            app.blueprints["SlowService"].build_rpc_handlers()
+        app.stop(0)
+
+
+class AdaptiveLimitServerTestCase(TestGRPCServer):
+    config_options = dict(
+        PROTO_IN_MEMORY=True,
+        GRPC_SERVER_MAX_WORKERS=1,
+        GRPC_SERVER_ADAPTIVE_LIMIT_ENABLE=True,
+        GRPC_SERVER_ADAPTIVE_LIMIT_INITIAL=2,
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        entered, release = self.entered, self.release
+
+        class LimitMessage(Message):
+            name: str
+
+        class LimitService(Server):
+            @grpcmethod
+            def Slow(self, request: LimitMessage, context: Context) -> LimitMessage:
+                entered.set()
+                release.wait(10)
+                return request
+
+        class AsyncLimitService(AsyncServer):
+            @grpcmethod
+            async def Slow(
+                self, request: LimitMessage, context: Context
+            ) -> LimitMessage:
+                entered.set()
+                await asyncio.get_running_loop().run_in_executor(None, release.wait, 10)
+                return request
+
+        self.services = [LimitService, AsyncLimitService]
+
+    def test_adaptive_limit(self):
+        def check(app, channel):
+            self.entered.clear()
+            self.release.clear()
+            service = type(app).__name__
+            limiter = app.limiters[(service, "Slow")]
+            slow = channel.unary_unary(f"/{service}/Slow")
+            try:
+                futures = [slow.future(b""), slow.future(b"")]
+                self.assertTrue(self.entered.wait(5))
+                # the RPC waiting for the only thread counts towards the limit
+                self.wait_until(lambda: limiter.inflight == 2)
+
+                with self.assertRaises(RpcError) as cm:
+                    slow(b"", timeout=5)
+                self.assertEqual(cm.exception.code(), StatusCode.RESOURCE_EXHAUSTED)
+                self.assertIn(
+                    "grpc-retry-pushback-ms", dict(cm.exception.trailing_metadata())
+                )
+            finally:
+                self.release.set()
+            for future in futures:
+                future.result(timeout=5)
+            slow(b"", timeout=5)
+            self.assertEqual(limiter.rejected, 1)
+            # the slot is freed once the thread has finished the RPC
+            self.wait_until(lambda: limiter.inflight == 0)
+
+        self.run_services(check)
+
+
+class DeadlineSheddingServerTestCase(TestGRPCServer):
+    config_options = dict(
+        PROTO_IN_MEMORY=True, GRPC_SERVER_DEADLINE_SHEDDING_ENABLE=True
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.handled = handled = []
+
+        class SheddingMessage(Message):
+            name: str
+
+        class SheddingService(Server):
+            @grpcmethod
+            def Slow(
+                self, request: SheddingMessage, context: Context
+            ) -> SheddingMessage:
+                handled.append(request)
+                time.sleep(0.2)
+                return request
+
+        class AsyncSheddingService(AsyncServer):
+            @grpcmethod
+            async def Slow(
+                self, request: SheddingMessage, context: Context
+            ) -> SheddingMessage:
+                handled.append(request)
+                await asyncio.sleep(0.2)
+                return request
+
+        self.services = [SheddingService, AsyncSheddingService]
+
+    def test_deadline_shedding(self):
+        def check(app, channel):
+            self.handled.clear()
+            service = type(app).__name__
+            slow = channel.unary_unary(f"/{service}/Slow")
+            slow(b"", timeout=5)
+
+            with self.assertRaises(RpcError) as cm:
+                slow(b"", timeout=0.1)
+            self.assertEqual(cm.exception.code(), StatusCode.DEADLINE_EXCEEDED)
+            self.assertEqual(cm.exception.details(), DEADLINE_SHED_DETAILS)
+            self.assertEqual(len(self.handled), 1)
+            self.assertEqual(app.shedders[(service, "Slow")].shed, 1)
+
+        self.run_services(check)
+
+
+class ResponseCacheServerTestCase(TestGRPCServer):
+    def setUp(self):
+        super().setUp()
+        self.handled = handled = []
+        cache = ResponseCache(key_metadata=("x-tenant",))
+        async_cache = ResponseCache(key_metadata=("x-tenant",))
+
+        class CacheMessage(Message):
+            name: str
+
+        class CacheService(Server):
+            @grpcmethod(cache=cache)
+            def Get(self, request: CacheMessage, context: Context) -> CacheMessage:
+                handled.append(request.name)
+                return CacheMessage(name=f"hello {request.name}")
+
+        class AsyncCacheService(AsyncServer):
+            @grpcmethod(cache=async_cache)
+            async def Get(
+                self, request: CacheMessage, context: Context
+            ) -> CacheMessage:
+                handled.append(request.name)
+                return CacheMessage(name=f"hello {request.name}")
+
+        self.CacheMessage = CacheMessage
+        self.caches = {CacheService: cache, AsyncCacheService: async_cache}
+
+    def test_response_cache(self):
+        def check(app, channel):
+            self.handled.clear()
+            cache = self.caches[type(app)]
+            cache.clear()
+            get = channel.unary_unary(
+                f"/{type(app).__name__}/Get", **self.serializers(self.CacheMessage)
+            )
+            foo = self.CacheMessage(name="foo").__message__
+            for tenant in ("a", "a", "b", "a"):
+                response = get(foo, metadata=[("x-tenant", tenant)])
+                self.assertEqual(response.name, "hello foo")
+            self.assertEqual(self.handled, ["foo", "foo"])
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+            cache.invalidate(foo, [("x-tenant", "a")])
+            get(foo, metadata=[("x-tenant", "a")])
+            self.assertEqual(len(self.handled), 3)
+
+        class InMemoryConfig(TestConfig):
+            PROTO_IN_MEMORY = True
+
+        # the handlers are registered in the same way with the proto files
+        # or in memory
+        sync_service, async_service = self.caches
+        self.run_services(check, [sync_service])
+        self.run_services(check, [async_service], InMemoryConfig())
+
+
+class SingleFlightServerTestCase(TestGRPCServer):
+    def setUp(self):
+        super().setUp()
+        self.handled = handled = []
+        self.release = release = threading.Event()
+        single_flight = SingleFlight()
+        async_single_flight = SingleFlight()
+
+        class FlightMessage(Message):
+            name: str
+
+        class FlightService(Server):
+            @grpcmethod(single_flight=single_flight)
+            def Get(self, request: FlightMessage, context: Context) -> FlightMessage:
+                handled.append(request.name)
+                release.wait()
+                return FlightMessage(name=f"hello {request.name}")
+
+        class AsyncFlightService(AsyncServer):
+            @grpcmethod(single_flight=async_single_flight)
+            async def Get(
+                self, request: FlightMessage, context: Context
+            ) -> FlightMessage:
+                handled.append(request.name)
+                while not release.is_set():
+                    await asyncio.sleep(0.01)
+                return FlightMessage(name=f"hello {request.name}")
+
+        self.FlightMessage = FlightMessage
+        self.single_flights = {
+            FlightService: single_flight,
+            AsyncFlightService: async_single_flight,
+        }
+        self.services = list(self.single_flights)
+
+    def test_single_flight(self):
+        def check(app, channel):
+            self.handled.clear()
+            self.release.clear()
+            single_flight = self.single_flights[type(app)]
+            get = channel.unary_unary(
+                f"/{type(app).__name__}/Get", **self.serializers(self.FlightMessage)
+            )
+            foo = self.FlightMessage(name="foo").__message__
+            leader = get.future(foo)
+            self.wait_until(lambda: self.handled)
+            waiters = [get.future(foo) for _ in range(2)]
+            impatient = get.future(foo, timeout=0.2)
+            self.wait_until(lambda: single_flight.coalesced == 3)
+
+            with self.assertRaises(RpcError) as cm:
+                impatient.result()
+            self.assertEqual(cm.exception.code(), StatusCode.DEADLINE_EXCEEDED)
+
+            self.release.set()
+            for future in [leader, *waiters]:
+                self.assertEqual(future.result().name, "hello foo")
+            self.assertEqual(self.handled, ["foo"])
+            self.assertEqual(single_flight.executions, 1)
+            self.assertEqual(len(single_flight), 0)
+
+            # the calls are coalesced only while the leader runs
+            get(foo)
+            self.assertEqual(self.handled, ["foo", "foo"])
+
+        self.run_services(check)
+
+
+class BatchServerTestCase(TestGRPCServer):
+    def setUp(self):
+        super().setUp()
+        self.batches = batches = []
+        batcher = Batcher(max_batch_size=8, max_wait_us=300_000)
+        async_batcher = Batcher(max_batch_size=8, max_wait_us=300_000)
+
+        class BatchMessage(Message):
+            name: str
+
+        def handle(requests: List[BatchMessage]) -> list:
+            batches.append(sorted(request.name for request in requests))
+            return [
+                ValueError(request.name)
+                if request.name == "bad"
+                else BatchMessage(name=f"hello {request.name}")
+                for request in requests
+            ]
+
+        class BatchService(Server):
+            @grpcmethod(batch=batcher)
+            def Get(
+                self, requests: List[BatchMessage], contexts: List[Context]
+            ) -> List[BatchMessage]:
+                return handle(requests)
+
+        class AsyncBatchService(AsyncServer):
+            @grpcmethod(batch=async_batcher)
+            async def Get(
+                self, requests: List[BatchMessage], contexts: List[Context]
+            ) -> List[BatchMessage]:
+                return handle(requests)
+
+        self.BatchMessage = BatchMessage
+        self.batchers = {BatchService: batcher, AsyncBatchService: async_batcher}
+        self.services = list(self.batchers)
+
+    def test_batch(self):
+        def check(app, channel):
+            self.batches.clear()
+            batcher = self.batchers[type(app)]
+            get = channel.unary_unary(
+                f"/{type(app).__name__}/Get", **self.serializers(self.BatchMessage)
+            )
+
+            def call(name: str, **kwargs):
+                return get.future(self.BatchMessage(name=name).__message__, **kwargs)
+
+            first = call("a")
+            self.wait_until(lambda: batcher._batch is not None)
+            second, bad = call("b"), call("bad")
+            late = call("late", timeout=0.05)
+
+            self.assertEqual(first.result().name, "hello a")
+            self.assertEqual(second.result().name, "hello b")
+            with self.assertRaises(RpcError) as cm:
+                bad.result()
+            self.assertEqual(cm.exception.code(), StatusCode.UNKNOWN)
+            with self.assertRaises(RpcError) as cm:
+                late.result()
+            self.assertEqual(cm.exception.code(), StatusCode.DEADLINE_EXCEEDED)
+            self.assertEqual(self.batches, [["a", "b", "bad"]])
+            self.assertEqual(
+                (batcher.batches, batcher.batched, batcher.expired), (1, 3, 1)
+            )
+
+            futures = [call(str(i)) for i in range(8)]
+            for i, future in enumerate(futures):
+                self.assertEqual(future.result().name, f"hello {i}")
+            self.assertEqual(batcher.batched, 11)
+
+        self.run_services(check)
+
+
+class RawServerTestCase(TestGRPCServer):
+    def setUp(self):
+        super().setUp()
+        self.requests = requests = []
+
+        class RawMessage(Message):
+            name: str
+
+        class RawService(Server):
+            @grpcmethod(raw=True)
+            def Forward(self, request: RawMessage, context: Context) -> RawMessage:
+                requests.append(request)
+                return memoryview(request)
+
+            @grpcmethod(raw=True)
+            def Hello(
+                self, request: Streaming[RawMessage], context: Context
+            ) -> Streaming[RawMessage]:
+                for data in request:
+                    requests.append(data)
+                    name = RawMessage.from_bytes(data).name
+                    yield RawMessage(name=f"hello {name}").to_bytes()
+
+            @grpcmethod(lazy=True)
+            def Lazy(self, request: RawMessage, context: Context) -> RawMessage:
+                requests.append(request)
+                return RawMessage(name=f"hello {request.name}")
+
+        class AsyncRawService(AsyncServer):
+            @grpcmethod(raw=True)
+            async def Forward(
+                self, request: RawMessage, context: Context
+            ) -> RawMessage:
+                requests.append(request)
+                return RawMessage(name=f"hello {RawMessage.from_bytes(request).name}")
+
+            @grpcmethod(lazy=True)
+            async def Lazy(self, request: RawMessage, context: Context) -> RawMessage:
+                requests.append(request)
+                return RawMessage(name=f"hello {request.name}")
+
+        self.RawMessage = RawMessage
+        self.services = [RawService, AsyncRawService]
+
+    def test_raw(self):
+        def check(app, channel):
+            self.requests.clear()
+            service = type(app).__name__
+            foo = self.RawMessage(name="foo").to_bytes()
+            forward = channel.unary_unary(f"/{service}/Forward")
+            response = self.RawMessage.from_bytes(forward(foo))
+            self.assertEqual(self.requests, [foo])
+            if isinstance(app, AsyncServer):
+                self.assertEqual(response.name, "hello foo")
+            else:
+                self.assertEqual(response.name, "foo")
+                hello = channel.stream_stream(f"/{service}/Hello")
+                names = [
+                    self.RawMessage.from_bytes(data).name
+                    for data in hello(iter([foo, foo]))
+                ]
+                self.assertEqual(names, ["hello foo", "hello foo"])
+
+            self.requests.clear()
+            lazy = channel.unary_unary(f"/{service}/Lazy")
+            response = self.RawMessage.from_bytes(lazy(foo))
+            self.assertEqual(response.name, "hello foo")
+            (request,) = self.requests
+            self.assertIsInstance(request, self.RawMessage)
+            self.assertEqual(request.to_bytes(), foo)
+
+        self.run_services(check)
+
+
+class PrefetchServerTestCase(TestGRPCServer):
+    def setUp(self):
+        super().setUp()
+        self.threads = threads = []
+
+        class PrefetchMessage(Message):
+            name: str
+
+        class PrefetchService(Server):
+            @grpcmethod(prefetch=Prefetcher(depth=2))
+            def Export(
+                self, request: PrefetchMessage, context: Context
+            ) -> Streaming[PrefetchMessage]:
+                threads.append(threading.current_thread())
+                for i in range(10):
+                    yield PrefetchMessage(name=f"{request.name} {i}")
+                raise ValueError("end of export")
+
+        class AsyncPrefetchService(AsyncServer):
+            @grpcmethod(prefetch=Prefetcher(depth=2))
+            async def Export(
+                self, request: PrefetchMessage, context: Context
+            ) -> Streaming[PrefetchMessage]:
+                for i in range(10):
+                    yield PrefetchMessage(name=f"{request.name} {i}")
+                raise ValueError("end of export")
+
+        self.PrefetchMessage = PrefetchMessage
+        self.services = [PrefetchService, AsyncPrefetchService]
+
+    def test_prefetch(self):
+        def check(app, channel):
+            export = channel.unary_stream(
+                f"/{type(app).__name__}/Export",
+                **self.serializers(self.PrefetchMessage),
+            )
+            names = []
+            with self.assertRaises(RpcError) as cm:
+                for response in export(self.PrefetchMessage(name="row").__message__):
+                    names.append(response.name)
+            self.assertEqual(cm.exception.code(), StatusCode.UNKNOWN)
+            self.assertEqual(names, [f"row {i}" for i in range(10)])
+
+        self.run_services(check)
+        (thread,) = self.threads
+        self.assertNotIn("ThreadPoolExecutor", thread.name)
+
+
+class ManifestServerTestCase(TestGRPCServer):
+    config_options = dict(PROTO_AUTO_GENERATED=False, PROTO_FROM_MANIFEST=True)
+
+    def setUp(self):
+        super().setUp()
+
+        class ManifestMessage(Message):
+            name: str
+
+        class ManifestBlueprint(Blueprint):
+            @grpcmethod
+            def Hello(
+                self, request: ManifestMessage, context: Context
+            ) -> ManifestMessage:
+                return ManifestMessage(name=f"hello {request.name}")
+
+        class ManifestService(Server):
+            @grpcmethod
+            def Echo(
+                self, request: ManifestMessage, context: Context
+            ) -> ManifestMessage:
+                return request
+
+            @classmethod
+            def get_blueprints(cls) -> List[Type[Blueprint]]:
+                return [ManifestBlueprint]
+
+        class AsyncManifestService(AsyncServer):
+            @grpcmethod
+            async def Echo(
+                self, request: ManifestMessage, context: Context
+            ) -> ManifestMessage:
+                return request
+
+        self.ManifestMessage = ManifestMessage
+        self.ManifestBlueprint = ManifestBlueprint
+        self.services = [ManifestService, AsyncManifestService]
+
+    def test_manifest(self):
+        for service_cls in self.services:
+            manifest_path = service_cls.build(TestConfig())
+        self.assertTrue(os.path.exists(manifest_path))
+
+        def check(app, channel):
+            serializers = self.serializers(self.ManifestMessage)
+            foo = self.ManifestMessage(name="foo").__message__
+            echo = channel.unary_unary(f"/{type(app).__name__}/Echo", **serializers)
+            self.assertEqual(echo(foo).name, "foo")
+            if not isinstance(app, AsyncServer):
+                hello = channel.unary_unary("/ManifestBlueprint/Hello", **serializers)
+                self.assertEqual(hello(foo).name, "hello foo")
+
+        with patch.object(
+            self.ManifestBlueprint,
+            "get_rpc_methods",
+            wraps=self.ManifestBlueprint.get_rpc_methods,
+        ) as get_rpc_methods:
+            self.run_services(check)
+        # the gRPC methods are looked for once on start
+        self.assertEqual(1, get_rpc_methods.call_count)
+
+        # a gRPC method added after the build
+        ManifestMessage = self.ManifestMessage
+
+        def Bye(self, request: ManifestMessage, context: Context) -> ManifestMessage:
+            return request
+
+        self.ManifestBlueprint.Bye = grpcmethod(Bye)
+        with self.assertRaisesRegex(RuntimeError, r"ManifestBlueprint\.\{Bye\}"):
+            self.services[0].run(config=self.config, block=False)
+        del self.ManifestBlueprint.Bye
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest["files"]["manifestservice"]["services"]["ManifestService"][
+            "Echo"
+        ] = "rpc Echo (ManifestMessage) returns (stream ManifestMessage) {}"
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+        with self.assertRaisesRegex(RuntimeError, "grpcalchemy build"):
+            self.services[0].run(config=self.config, block=False)
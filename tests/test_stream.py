@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from grpcalchemy.stream import ParallelMap, Prefetcher
+
+
+class PrefetcherTestCase(unittest.TestCase):
+    def test_iterate(self):
+        prefetcher = Prefetcher(depth=2)
+        produced = []
+        closed = threading.Event()
+
+        def responses():
+            try:
+                for i in range(100):
+                    produced.append(threading.current_thread())
+                    yield i
+            finally:
+                closed.set()
+
+        iterator = prefetcher.iterate(responses())
+        self.assertEqual(next(iterator), 0)
+        time.sleep(0.1)
+        # one response sent, two queued and one waiting for the queue
+        self.assertLessEqual(len(produced), 4)
+        self.assertEqual(prefetcher.occupancy, 2)
+        self.assertGreater(prefetcher.blocked_seconds, 0)
+        self.assertIsNot(produced[0], threading.current_thread())
+
+        self.assertEqual(list(iterator), list(range(1, 100)))
+        self.assertTrue(closed.wait(1))
+        self.assertEqual((prefetcher.streams, prefetcher.occupancy), (1, 0))
+
+    def test_iterate_cancelled(self):
+        prefetcher = Prefetcher(depth=1)
+        closed = threading.Event()
+
+        def responses():
+            try:
+                while True:
+                    yield 0
+            finally:
+                closed.set()
+
+        iterator = prefetcher.iterate(responses())
+        next(iterator)
+        iterator.close()
+        self.assertTrue(closed.wait(1))
+
+    def test_iterate_error(self):
+        def responses():
+            yield 0
+            raise ValueError("test")
+
+        iterator = Prefetcher().iterate(responses())
+        self.assertEqual(next(iterator), 0)
+        with self.assertRaisesRegex(ValueError, "test"):
+            next(iterator)
+
+        def exiting_responses():
+            yield 0
+            raise SystemExit(1)
+
+        iterator = Prefetcher().iterate(exiting_responses())
+        self.assertEqual(next(iterator), 0)
+        with self.assertRaises(SystemExit):
+            next(iterator)
+
+    def test_async_iterate(self):
+        prefetcher = Prefetcher(depth=2)
+        produced = []
+
+        async def responses():
+            for i in range(10):
+                produced.append(i)
+                yield i
+            raise ValueError("test")
+
+        async def consume():
+            results = []
+            iterator = prefetcher.async_iterate(responses())
+            results.append(await iterator.__anext__())
+            await asyncio.sleep(0.05)
+            self.assertLessEqual(len(produced), 4)
+            self.assertEqual(prefetcher.occupancy, 2)
+            with self.assertRaisesRegex(ValueError, "test"):
+                async for response in iterator:
+                    results.append(response)
+            return results
+
+        self.assertEqual(asyncio.run(consume()), list(range(10)))
+        self.assertGreater(prefetcher.blocked_seconds, 0)
+
+
+class ParallelMapTestCase(unittest.TestCase):
+    def test_map(self):
+        parallel_map = ParallelMap(max_workers=8, window=4)
+        running = []
+        lock = threading.Lock()
+
+        def work(i: int) -> int:
+            with lock:
+                running.append(i)
+            time.sleep(0.05 * (i % 3))
+            self.assertLessEqual(len(running), 4)
+            with lock:
+                running.remove(i)
+            return i * 2
+
+        start = time.monotonic()
+        self.assertEqual(
+            list(parallel_map.map(work, range(12))), [i * 2 for i in range(12)]
+        )
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(
+            sorted(parallel_map.map(work, range(12), ordered=False)),
+            [i * 2 for i in range(12)],
+        )
+
+    def test_map_waiting_client(self):
+        # the client sends the next request after receiving the response
+        received = threading.Event()
+
+        def requests():
+            for i in range(3):
+                yield i
+                self.assertTrue(received.wait(1))
+                received.clear()
+
+        responses = []
+        for response in ParallelMap().map(lambda i: i, requests()):
+            responses.append(response)
+            received.set()
+        self.assertEqual(responses, [0, 1, 2])
+
+    def test_map_error(self):
+        def work(i: int) -> int:
+            if i == 2:
+                raise ValueError("test")
+            return i
+
+        def requests():
+            yield 0
+            raise KeyError("test")
+
+        parallel_map = ParallelMap()
+        iterator = parallel_map.map(work, range(10))
+        self.assertEqual([next(iterator), next(iterator)], [0, 1])
+        with self.assertRaisesRegex(ValueError, "test"):
+            next(iterator)
+        with self.assertRaises(KeyError):
+            list(parallel_map.map(work, requests()))
+
+    def test_async_map(self):
+        parallel_map = ParallelMap(window=4)
+
+        async def requests():
+            for i in range(12):
+                yield i
+
+        async def work(i: int) -> int:
+            await asyncio.sleep(0.05 * (i % 3))
+            return i * 2
+
+        async def collect(fn, ordered=None):
+            return [
+                response
+                async for response in parallel_map.async_map(
+                    fn, requests(), ordered=ordered
+                )
+            ]
+
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(collect(work)), [i * 2 for i in range(12)])
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(
+            sorted(asyncio.run(collect(work, ordered=False))),
+            [i * 2 for i in range(12)],
+        )
+        self.assertEqual(
+            asyncio.run(collect(lambda i: i + 1)), [i + 1 for i in range(12)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import signal
+import sys
+import time
+import unittest
+
+from grpcalchemy.supervisor import WorkerSupervisor
+
+
+def exit_worker(code: int, worker_index: int):
+    sys.exit(code)
+
+
+def sleep_worker(seconds: float, worker_index: int):
+    time.sleep(seconds)
+
+
+@unittest.skipIf(bool(sys.platform == "win32"), "Need fork and signals")
+class WorkerSupervisorTestCase(unittest.TestCase):
+    def test_respawn_with_backoff(self):
+        workers = []
+        supervisor = WorkerSupervisor(
+            target=exit_worker,
+            kwargs=dict(code=3),
+            process_count=2,
+            workers=workers,
+            backoff=1,
+            max_backoff=10,
+        )
+        supervisor.start()
+        first_workers = list(workers)
+        supervisor.join()
+
+        now = time.monotonic()
+        supervisor.check(now)
+        for status in supervisor.status:
+            self.assertEqual(3, status.last_exitcode)
+            self.assertEqual(0, status.restarts)
+            self.assertEqual(now + 1, status.respawn_at)
+
+        supervisor.check(now + 1)
+        self.assertEqual(2, len(workers))
+        for status in supervisor.status:
+            self.assertEqual(1, status.restarts)
+            self.assertIsNone(status.respawn_at)
+            self.assertIn(status.process, workers)
+            self.assertNotIn(status.process, first_workers)
+        supervisor.join()
+
+        # the backoff is doubled after a consecutive exit
+        supervisor.check(now + 2)
+        for status in supervisor.status:
+            self.assertEqual(now + 4, status.respawn_at)
+        supervisor.stop()
+
+    def test_supervise_in_background(self):
+        supervisor = WorkerSupervisor(
+            target=exit_worker, kwargs=dict(code=3), process_count=1, backoff=0.1
+        )
+        supervisor.start()
+        thread = supervisor.supervise_in_background(interval=0.1)
+        deadline = time.monotonic() + 5
+        while supervisor.status[0].restarts < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertGreaterEqual(supervisor.status[0].restarts, 2)
+        supervisor.stop()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        supervisor.join()
+        restarts = supervisor.status[0].restarts
+        supervisor.check(time.monotonic() + 100)
+        self.assertEqual(restarts, supervisor.status[0].restarts)
+
+    def test_stop_forwards_signal(self):
+        supervisor = WorkerSupervisor(
+            target=sleep_worker, kwargs=dict(seconds=10), process_count=2
+        )
+        supervisor.start()
+        supervisor.stop(signal.SIGTERM)
+        supervisor.join()
+        supervisor.check()
+        for status in supervisor.status:
+            self.assertEqual(-signal.SIGTERM, status.process.exitcode)
+            self.assertEqual(0, status.restarts)
+            self.assertIsNone(status.respawn_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,15 @@ import os.path
 import socket
 import unittest
 from shutil import rmtree
+from unittest.mock import patch
 
 from grpcalchemy.utils import (
     socket_bind_test,
     select_address_family,
     get_sockaddr,
     generate_proto_file,
+    build_file_descriptor_proto,
+    build_proto_in_memory,
 )
 from tests.test_grpcalchemy import TestGRPCAlchemy
 
@@ -64,6 +67,134 @@ class UtilsTestCase(TestGRPCAlchemy):
         self.assertTrue(os.path.exists(os.path.join(dir_name, "nested_pb2_grpc.py")))
         rmtree("nested")
 
+    def test_generate_proto_file_with_cache(self):
+        from grpcalchemy.orm import Message
+
+        class TestCachedMessage(Message):
+            __filename__ = "cached"
+            test: str
+
+        dir_name = "cached_protos"
+        if os.path.exists(dir_name):
+            rmtree(dir_name)
+        report = generate_proto_file(template_path=dir_name)
+        self.assertListEqual(["cached.proto"], report.regenerated)
+        self.assertListEqual([], report.unchanged)
+
+        report = generate_proto_file(template_path=dir_name)
+        self.assertListEqual([], report.regenerated)
+        self.assertListEqual(["cached.proto"], report.unchanged)
+
+        os.remove(os.path.join(dir_name, "cached_pb2_grpc.py"))
+        report = generate_proto_file(template_path=dir_name)
+        self.assertListEqual(["cached.proto"], report.regenerated)
+        self.assertTrue(os.path.exists(os.path.join(dir_name, "cached_pb2_grpc.py")))
+        rmtree(dir_name)
+
+    def test_generate_proto_file_with_protoc_error(self):
+        from grpcalchemy.orm import Message
+        from grpcalchemy.utils import PROTO_CACHE_FILE
+
+        class TestFailedMessage(Message):
+            __filename__ = "failed"
+            test: str
+
+        dir_name = "failed_protos"
+        if os.path.exists(dir_name):
+            rmtree(dir_name)
+        cache_path = os.path.join(dir_name, PROTO_CACHE_FILE)
+        with patch("grpc_tools.protoc.main", return_value=1):
+            with self.assertRaisesRegex(RuntimeError, "failed.proto with exit code 1"):
+                generate_proto_file(template_path=dir_name)
+        # the broken schema is not recorded as compiled
+        self.assertFalse(os.path.exists(cache_path))
+
+        report = generate_proto_file(template_path=dir_name)
+        self.assertListEqual(["failed.proto"], report.regenerated)
+        self.assertTrue(os.path.exists(cache_path))
+        rmtree(dir_name)
+
+    def test_generate_proto_file_in_single_invocation(self):
+        from grpcalchemy.orm import Message
+
+        class TestImportedMessage(Message):
+            __filename__ = "imported"
+            test: str
+
+        class TestImportingMessage(Message):
+            __filename__ = "importing"
+            imported: TestImportedMessage
+
+        dir_name = "single_invocation_protos"
+        if os.path.exists(dir_name):
+            rmtree(dir_name)
+        report = generate_proto_file(template_path=dir_name)
+        self.assertListEqual(
+            ["imported.proto", "importing.proto"], sorted(report.regenerated)
+        )
+        for file in ("imported", "importing"):
+            self.assertTrue(os.path.exists(os.path.join(dir_name, f"{file}_pb2.py")))
+        self.assertEqual(
+            "test",
+            TestImportingMessage(imported={"test": "test"}).imported.test,
+        )
+        rmtree(dir_name)
+
+    def test_build_file_descriptor_proto(self):
+        from google.protobuf.descriptor_pb2 import FileDescriptorProto
+
+        from grpcalchemy.meta import __meta__
+        from grpcalchemy.orm import Message
+        from grpcalchemy.types import Map, Repeated
+
+        class TestDescriptorReferenceMessage(Message):
+            __filename__ = "descriptor_reference"
+            test: str
+
+        class TestDescriptorMessage(Message):
+            __filename__ = "descriptor"
+            int_field: int
+            repeated_field: Repeated[bytes]
+            map_field: Map[str, TestDescriptorReferenceMessage]
+            reference_field: TestDescriptorReferenceMessage
+
+        dir_name = "descriptor_protos"
+        if os.path.exists(dir_name):
+            rmtree(dir_name)
+        generate_proto_file(template_path=dir_name)
+        from descriptor_protos import descriptor_pb2
+
+        self.assertEqual(
+            FileDescriptorProto.FromString(descriptor_pb2.DESCRIPTOR.serialized_pb),
+            build_file_descriptor_proto(
+                "descriptor", __meta__["descriptor"], template_path=dir_name
+            ),
+        )
+        rmtree(dir_name)
+
+    def test_build_proto_in_memory_again(self):
+        from grpcalchemy.meta import __meta__
+        from grpcalchemy.orm import Message
+
+        class TestRebuiltMessage(Message):
+            __filename__ = "rebuilt"
+            name: str
+
+        build_proto_in_memory()
+        self.assertEqual("test", TestRebuiltMessage(name="test").name)
+
+        # the changed messages are built again, e.g. on reload
+        __meta__.clear()
+
+        class TestRebuiltMessage(Message):  # type: ignore # noqa: F811
+            __filename__ = "rebuilt"
+            name: str
+            count: int
+
+        report = build_proto_in_memory()
+        self.assertEqual(["rebuilt.proto"], report.regenerated)
+        self.assertEqual(1, TestRebuiltMessage(name="test", count=1).count)
+
 
 if __name__ == "__main__":
     unittest.main()